@@ -3,16 +3,21 @@
    launch the desired drivers
 """
 
+import os
 import sys
+import functools
 from drivers import esdriver
 from drivers import thermodriver
 from drivers import ktpdriver
 from drivers import transdriver
 from lib.amech_io import parser
 from lib.amech_io import printer
+from lib.amech_io import writer
 from lib.reaction import direction as rxndirn
 from lib.filesys.build import prefix_fs
 from lib.submission import print_host_name
+from lib.submission import run_locked_procs
+from lib.submission import set_cache_path
 
 
 # Set runtime options based on user input
@@ -64,6 +69,18 @@ else:
     print('No Proper Run object specified')
     sys.exit()
 
+# Set the number of sub-PESs that may be run concurrently by each driver
+NPROCS = RUN_INP_DCT['nprocs']
+PES_LOCK_KEYS_LST = [
+    parser.mechanism.pes_spc_names(rxn_lst)
+    for rxn_lst in RUN_PES_DCT.values()]
+
+# Split the processes between the sub-PESs run at once, so the pools of
+# processes inside each driver stay within the nprocs budget in total
+PES_RUN_INP_DCT = dict(RUN_INP_DCT)
+PES_RUN_INP_DCT['nprocs'] = max(
+    1, NPROCS // max(1, min(NPROCS, len(PES_LOCK_KEYS_LST))))
+
 # Build a dictionary of submission scripts (to finish)
 # SUB_SCRIPT_DCT = build_sub_script_dct(JOB_PATH)
 
@@ -80,6 +97,9 @@ print('{}'.format(RUN_INP_DCT['run_prefix']))
 prefix_fs(RUN_INP_DCT['save_prefix'])
 print('{}'.format(RUN_INP_DCT['save_prefix']))
 
+# Set the cache for the outputs of ProjRot, MESSPF, ThermP, and PAC99
+set_cache_path(os.path.join(RUN_INP_DCT['run_prefix'], 'CACHE'))
+
 # Print messages describing drivers and tasks running
 print('\nDrivers and tasks user has requested to be run...')
 RUN_ES = bool('es' in RUN_JOBS_LST)
@@ -120,6 +140,7 @@ if RUN_ES:
 
     # Call ESDriver for spc in each PES or SPC
     if RUN_OBJ_DCT['pes']:
+        ES_ARGS_LST = []
         for (formula, pes_idx, sub_pes_idx), rxn_lst in RUN_PES_DCT.items():
 
             # Print PES form and SUB PES Channels
@@ -131,7 +152,7 @@ if RUN_ES:
                     '+'.join(rxn['reacs']),
                     '+'.join(rxn['prods'])))
 
-            esdriver.run(
+            ES_ARGS_LST.append((
                 pes_idx,
                 rxn_lst,
                 SPC_DCT,
@@ -139,7 +160,14 @@ if RUN_ES:
                 ES_TSK_LST,
                 THY_DCT,
                 RUN_INP_DCT
-            )
+            ))
+
+        if NPROCS > 1:
+            run_locked_procs(
+                esdriver.run, ES_ARGS_LST, PES_LOCK_KEYS_LST, nprocs=NPROCS)
+        else:
+            for es_args in ES_ARGS_LST:
+                esdriver.run(*es_args)
     else:
         PES_IDX = 0
         esdriver.run(
@@ -162,17 +190,39 @@ if WRITE_MESSPF or RUN_MESSPF or RUN_NASA:
 
     # Call ThermoDriver for spc in PES
     if RUN_OBJ_DCT['pes']:
+        THERMO_ARGS_LST = []
         for _, rxn_lst in RUN_PES_DCT.items():
-            thermodriver.run(
+            THERMO_ARGS_LST.append((
                 SPC_DCT,
                 PES_MODEL_DCT, SPC_MODEL_DCT,
                 THY_DCT,
                 rxn_lst,
-                RUN_INP_DCT,
-                write_messpf=WRITE_MESSPF,
-                run_messpf=RUN_MESSPF,
-                run_nasa=RUN_NASA,
-            )
+                PES_RUN_INP_DCT,
+                WRITE_MESSPF, RUN_MESSPF, RUN_NASA
+            ))
+
+        if NPROCS > 1:
+            # Each PES writes its NASA polynomials to a file of its own;
+            # all.ckin is then written from the last PES, as in serial runs
+            CKIN_NAMES = ['all_pes{}.ckin'.format(idx+1)
+                          for idx in range(len(THERMO_ARGS_LST))]
+            run_locked_procs(
+                thermodriver.run,
+                [thermo_args + (ckin_name,)
+                 for thermo_args, ckin_name in zip(
+                     THERMO_ARGS_LST, CKIN_NAMES)],
+                PES_LOCK_KEYS_LST,
+                nprocs=NPROCS)
+            CKIN_PATH = os.path.join(os.getcwd(), 'ckin')
+            if RUN_NASA and CKIN_NAMES:
+                CKIN_FILE = os.path.join(CKIN_PATH, CKIN_NAMES[-1])
+                if os.path.exists(CKIN_FILE):
+                    with open(CKIN_FILE, 'r') as ckin_file:
+                        writer.ckin.write_nasa_file(
+                            ckin_file.read(), CKIN_PATH)
+        else:
+            for thermo_args in THERMO_ARGS_LST:
+                thermodriver.run(*thermo_args)
     else:
         for spc in RUN_SPC_LST_DCT:
             print('\nCalculating Thermochem for species: {}'.format(spc))
@@ -201,14 +251,23 @@ if RUN_TRANS:
 
     # Call ThermoDriver for spc in PES
     if RUN_OBJ_DCT['pes']:
+        TRANS_ARGS_LST = []
         for _, rxn_lst in RUN_PES_DCT.items():
-            transdriver.run(
+            TRANS_ARGS_LST.append((
                 SPC_DCT,
                 THY_DCT,
                 rxn_lst,
                 TRANS_TSK_LST,
                 RUN_INP_DCT
-            )
+            ))
+
+        if NPROCS > 1:
+            run_locked_procs(
+                transdriver.run, TRANS_ARGS_LST, PES_LOCK_KEYS_LST,
+                nprocs=NPROCS)
+        else:
+            for trans_args in TRANS_ARGS_LST:
+                transdriver.run(*trans_args)
     else:
         for spc in RUN_SPC_LST_DCT:
             print('\nCalculating Transport for species: {}'.format(spc))
@@ -227,6 +286,12 @@ if WRITE_MESSRATE or RUN_MESSRATE or RUN_FITS:
 
     # Call kTPDriver for each SUB PES
     if RUN_OBJ_DCT['pes']:
+        KTP_DRIVER = functools.partial(
+            ktpdriver.run,
+            write_messrate=WRITE_MESSRATE,
+            run_messrate=RUN_MESSRATE,
+            run_fits=RUN_FITS)
+        KTP_ARGS_LST = []
         for (formula, pes_idx, sub_pes_idx), rxn_lst in RUN_PES_DCT.items():
 
             # Print PES form and SUB PES Channels
@@ -238,18 +303,22 @@ if WRITE_MESSRATE or RUN_MESSRATE or RUN_FITS:
                     '+'.join(rxn['reacs']),
                     '+'.join(rxn['prods'])))
 
-            ktpdriver.run(
+            KTP_ARGS_LST.append((
                 formula, pes_idx, sub_pes_idx,
                 SPC_DCT,
                 CLA_DCT,
                 THY_DCT,
                 rxn_lst,
                 PES_MODEL_DCT, SPC_MODEL_DCT,
-                RUN_INP_DCT,
-                write_messrate=WRITE_MESSRATE,
-                run_messrate=RUN_MESSRATE,
-                run_fits=RUN_FITS
-            )
+                PES_RUN_INP_DCT
+            ))
+
+        if NPROCS > 1:
+            run_locked_procs(
+                KTP_DRIVER, KTP_ARGS_LST, PES_LOCK_KEYS_LST, nprocs=NPROCS)
+        else:
+            for ktp_args in KTP_ARGS_LST:
+                KTP_DRIVER(*ktp_args)
     else:
         print("Can't run kTPDriver without a PES being specified")
 
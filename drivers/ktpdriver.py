@@ -101,7 +101,7 @@ def run(pes_formula, pes_idx, sub_pes_idx,
         chan_str, dats, p_enes, cnlst = ktproutines.rates.make_pes_mess_str(
             spc_dct, rxn_lst, pes_idx,
             run_prefix, save_prefix, label_dct,
-            spc_model_dct, thy_dct)
+            spc_model_dct, thy_dct, nprocs=run_inp_dct['nprocs'])
 
         # Combine strings together
         mess_inp_str = ktproutines.rates.make_messrate_str(
@@ -137,5 +137,5 @@ def run(pes_formula, pes_idx, sub_pes_idx,
             pes_formula, label_dct,
             es_info, pf_model,
             mess_path, fit_method, pdep_fit,
-            arrfit_thresh)
+            arrfit_thresh, nprocs=run_inp_dct['nprocs'])
         writer.ckin.write_rxn_file(ckin_str_dct, pes_formula, ckin_path)
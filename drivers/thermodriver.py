@@ -21,8 +21,10 @@ def run(spc_dct,
         run_inp_dct,
         write_messpf=True,
         run_messpf=True,
-        run_nasa=True):
-    """ main driver for thermo run
+        run_nasa=True,
+        ckin_name='all.ckin'):
+    """ main driver for thermo run; the NASA polynomials are written
+        to ckin/ckin_name
     """
 
     # Pull stuff from dcts for now
@@ -95,27 +97,26 @@ def run(spc_dct,
                '--------------------------------------'))
         print('\nRunning MESSPF calculations for all species')
 
+        # Run all of the MESSPF jobs at once in a pool of processes
+        pfrunner.run_pfs(
+            [thm_paths[idx][spc_model][0]
+             for idx, (_, (_, spc_models, _, _)) in enumerate(spc_queue)
+             for spc_model in spc_models],
+            nprocs=run_inp_dct['nprocs'])
+
+        # Read the partition functions and combine the models of all species
+        pfs_lst, coeffs_lst, operators_lst = [], [], []
         for idx, (spc_name, (pes_model, spc_models, coeffs, operators)) in enumerate(spc_queue):
+            pfs_lst.append([pfrunner.mess.read_messpf(thm_paths[idx][spc_model][0])
+                            for spc_model in spc_models])
+            coeffs_lst.append(coeffs)
+            operators_lst.append(operators)
+        final_pfs = thmroutines.pfcomb.combine_all_pfs(
+            pfs_lst, coeffs_lst, operators_lst)
+
+        for idx, (spc_name, (pes_model, spc_models, _, _)) in enumerate(spc_queue):
             print('\n{}'.format(spc_name))
-            for midx, spc_model in enumerate(spc_models):
-                pfrunner.run_pf(thm_paths[idx][spc_model][0])
-                temps, logq, dq_dt, d2q_dt2 = pfrunner.mess.read_messpf(
-                    thm_paths[idx][spc_model][0])
-                if midx == 0:
-                    coeff = coeffs[midx]
-                    final_pf = [temps, logq, dq_dt, d2q_dt2]
-                else:
-                    pf2 = temps, logq, dq_dt, d2q_dt2
-                    coeff = coeffs[midx]
-                    operator = operators[midx-1]
-                    if coeff < 0:
-                        coeff = abs(coeff)
-                        if operator == 'multiply':
-                            operator = 'divide'
-                    if operator == 'divide':
-                        pfrunner.mess.divide_pfs(final_pf, pf2, coeff)
-                    elif operator == 'multiply':
-                        pfrunner.mess.multiply_pfs(final_pf, pf2, coeff)
+            final_pf = final_pfs[idx]
             thm_paths[idx]['final'] = pfrunner.thermo_paths(
                 spc_dct[spc_name], run_prefix, len(spc_models))
             pfrunner.mess.write_mess_output(
@@ -132,6 +133,21 @@ def run(spc_dct,
 
         chn_basis_ene_dct = {}
 
+        # Determine info about the basis species used in thermochem calcs
+        # for all of the species of each model at once
+        basis_dcts, uniref_dcts = {}, {}
+        for spc_model in sorted(set(
+                spc_models[0] for _, (_, spc_models, _, _) in spc_queue)):
+            ref_scheme = spc_model_dct[spc_model]['options']['ref_scheme']
+            mod_queue = [[spc_name, None]
+                         for spc_name, (_, spc_models, _, _) in spc_queue
+                         if spc_models[0] == spc_model]
+            basis_dcts[spc_model], uniref_dcts[spc_model] = (
+                thmroutines.basis.prepare_refs(
+                    ref_scheme, spc_dct, mod_queue,
+                    parallel=run_inp_dct['nprocs'] > 1,
+                    nprocs=run_inp_dct['nprocs']))
+
         for idx, (spc_name, (pes_model, spc_models, _, _)) in enumerate(spc_queue):
             print('\n{}'.format(spc_name))
             spc_model = spc_models[0]
@@ -140,10 +156,8 @@ def run(spc_dct,
             # Get the reference scheme and energies
             ref_scheme = spc_model_dct[spc_model]['options']['ref_scheme']
             ref_enes = spc_model_dct[spc_model]['options']['ref_enes']
-
-            # Determine info about the basis species used in thermochem calcs
-            basis_dct, uniref_dct = thmroutines.basis.prepare_refs(
-                ref_scheme, spc_dct, [[spc_name, None]])
+            basis_dct = basis_dcts[spc_model]
+            uniref_dct = uniref_dcts[spc_model]
 
             # Get the basis info for the spc of interest
             spc_basis, coeff_basis = basis_dct[spc_name]
@@ -180,8 +194,8 @@ def run(spc_dct,
             spc_dct[spc_name]['Hfs'] = [hf0k]
 
         # Write the NASA polynomials in CHEMKIN format
-        ckin_nasa_str = ''
         ckin_path = os.path.join(starting_path, 'ckin')
+        header_strs, poly_args_lst, nasa_paths = [], [], []
         for idx, (spc_name, (pes_model, spc_models, _, _)) in enumerate(spc_queue):
 
             print("\n\nStarting NASA polynomials calculation for ", spc_name)
@@ -192,15 +206,31 @@ def run(spc_dct,
 
             # Write the NASA polynomial in CHEMKIN-format string
             ref_scheme = spc_model_dct[spc_model]['options']['ref_scheme']
+            header_str = ''
             for spc_model in spc_models:
-                ckin_nasa_str += writer.ckin.model_header(
+                header_str += writer.ckin.model_header(
                     pf_levels[spc_model], pf_models[spc_model], refscheme=ref_scheme)
-
-            # Build POLY
-            ckin_nasa_str += thmroutines.nasapoly.build_polynomial(
-                spc_name, spc_dct, temps,
-                thm_paths[idx]['final'][0], thm_paths[idx]['final'][1], starting_path)
+            header_strs.append(header_str)
+
+            # Set a NASA path of its own for each species
+            nasa_path = thm_paths[idx]['final'][1]
+            if nasa_path in nasa_paths:
+                nasa_path = os.path.join(nasa_path, spc_name)
+            nasa_paths.append(nasa_path)
+            poly_args_lst.append(
+                (spc_name, {spc_name: spc_dct[spc_name]}, temps,
+                 thm_paths[idx]['final'][0], nasa_path))
+
+        # Build POLY for all species, then combine them in queue order
+        poly_strs = thmroutines.nasapoly.build_polynomials(
+            poly_args_lst, nprocs=run_inp_dct['nprocs'],
+            fitter=run_inp_dct['nasa_fit'])
+        ckin_nasa_str = ''
+        for header_str, poly_str in zip(header_strs, poly_strs):
+            ckin_nasa_str += header_str
+            ckin_nasa_str += poly_str
             ckin_nasa_str += '\n\n'
 
         # Write all of the NASA polynomial strings
-        writer.ckin.write_nasa_file(ckin_nasa_str, ckin_path)
+        writer.ckin.write_nasa_file(
+            ckin_nasa_str, ckin_path, filename=ckin_name)
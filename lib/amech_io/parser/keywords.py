@@ -12,12 +12,15 @@ RUN_INP_SUPPORTED_KEYWORDS = [
     'spc',
     'run_prefix',
     'save_prefix',
-    'print_mech'
+    'print_mech',
+    'nprocs',
+    'nasa_fit'
 ]
 RUN_INP_KEY_DCT = {
     'mech': ['chemkin'],
     'spc': ['csv'],
-    'print_mech': [True, False]
+    'print_mech': [True, False],
+    'nasa_fit': ['pac99', 'native']
 }
 RUN_SUPPORTED_KEYWORDS = [
     'es',
@@ -90,46 +93,69 @@ ES_TSK_KEYWORDS_SUPPORTED_DCT = {
     'init_geom': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
     'find_ts': ['runlvl', 'inplvl', 'rxndirn',
                 'var_splvl1', 'var_splvl2', 'var_scnlvl',
-                'nobarrier', 'retryfail', 'overwrite'],
+                'nobarrier', 'retryfail', 'overwrite',
+                'ts_grid', 'ts_grid_ethresh', 'ts_opt',
+                'ncores', 'mem'],
     'find_sadpt': ['runlvl', 'inplvl', 'rxndirn',
-                   'nobarrier', 'retryfail', 'overwrite'],
+                   'nobarrier', 'retryfail', 'overwrite',
+                   'ts_grid', 'ts_grid_ethresh', 'ts_opt',
+                   'ncores', 'mem'],
     'find_molrad_vtst': ['runlvl', 'inplvl', 'rxndirn',
                          'var_splvl1', 'var_splvl2', 'var_scnlvl',
-                         'nobarrier', 'retryfail', 'overwrite'],
+                         'nobarrier', 'retryfail', 'overwrite',
+                         'ts_grid', 'ts_grid_ethresh', 'ts_opt',
+                         'ncores', 'mem'],
     'find_radrad_vtst': ['runlvl', 'inplvl', 'rxndirn',
                          'var_splvl1', 'var_splvl2', 'var_scnlvl',
                          'nobarrier', 'pot_thresh',
-                         'retryfail', 'overwrite'],
+                         'retryfail', 'overwrite',
+                         'ts_grid', 'ts_grid_ethresh', 'ts_opt',
+                         'ncores', 'mem'],
     'find_vrctst': ['runlvl', 'inplvl', 'rxndirn',
                     'var_splvl1', 'var_splvl2', 'var_scnlvl',
-                    'nobarrier', 'retryfail', 'overwrite'],
-    'conf_samp': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite'],
-    'conf_energy': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite'],
-    'conf_grad': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite'],
-    'conf_hess': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite'],
-    'conf_vpt2': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite'],
-    'conf_prop': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite'],
+                    'nobarrier', 'retryfail', 'overwrite',
+                    'ts_grid', 'ts_grid_ethresh', 'ts_opt',
+                    'ncores', 'mem'],
+    'conf_samp': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite',
+                  'ncores', 'mem'],
+    'conf_energy': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite',
+                    'ncores', 'mem'],
+    'conf_grad': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite',
+                  'ncores', 'mem'],
+    'conf_hess': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite',
+                  'ncores', 'mem'],
+    'conf_vpt2': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite',
+                  'ncores', 'mem'],
+    'conf_prop': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite',
+                  'ncores', 'mem'],
     'conf_opt': ['runlvl', 'inplvl', 'cnf_range', 'retryfail', 'overwrite'],
     'hr_scan': ['runlvl', 'inplvl', 'tors_model', 'resamp_min',
-                'retryfail', 'overwrite'],
+                'retryfail', 'overwrite', 'ncores', 'mem', 'scan_mode'],
     'hr_grad': ['runlvl', 'inplvl', 'tors_model',
-                'retryfail', 'overwrite'],
+                'retryfail', 'overwrite', 'ncores', 'mem'],
     'hr_hess': ['runlvl', 'inplvl', 'tors_model',
-                'retryfail', 'overwrite'],
+                'retryfail', 'overwrite', 'ncores', 'mem'],
     'hr_energy': ['runlvl', 'inplvl', 'tors_model',
-                  'retryfail', 'overwrite'],
+                  'retryfail', 'overwrite', 'ncores', 'mem'],
     'hr_vpt2': ['runlvl', 'inplvl', 'tors_model',
-                'retryfail', 'overwrite'],
+                'retryfail', 'overwrite', 'ncores', 'mem'],
     'hr_reopt': ['runlvl', 'inplvl', 'tors_model',
                  'retryfail', 'overwrite', 'hrthresh'],
-    'tau_samp': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
-    'tau_energy': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
-    'tau_grad': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
-    'tau_hess': ['runlvl', 'inplvl', 'hessmax', 'retryfail', 'overwrite'],
+    'tau_samp': ['runlvl', 'inplvl', 'retryfail', 'overwrite',
+                 'ncores', 'mem'],
+    'tau_energy': ['runlvl', 'inplvl', 'retryfail', 'overwrite',
+                   'ncores', 'mem'],
+    'tau_grad': ['runlvl', 'inplvl', 'retryfail', 'overwrite',
+                 'ncores', 'mem'],
+    'tau_hess': ['runlvl', 'inplvl', 'hessmax', 'retryfail', 'overwrite',
+                 'ncores', 'mem'],
     'irc_scan': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
-    'irc_energy': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
-    'irc_grad': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
-    'irc_hess': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
+    'irc_energy': ['runlvl', 'inplvl', 'retryfail', 'overwrite',
+                   'ncores', 'mem'],
+    'irc_grad': ['runlvl', 'inplvl', 'retryfail', 'overwrite',
+                 'ncores', 'mem'],
+    'irc_hess': ['runlvl', 'inplvl', 'retryfail', 'overwrite',
+                 'ncores', 'mem'],
     'drp_scan': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
     'drp_energy': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
     'drp_grad': ['runlvl', 'inplvl', 'retryfail', 'overwrite'],
@@ -142,7 +168,10 @@ ES_TSK_KEYWORDS_VAL_SUPPORTED_DCT = {
     'retryfail': [True, False],
     'overwrite': [True, False],
     'rxndirn': ['forw', 'back', 'exo'],
-    'resamp_min': [True, False]
+    'resamp_min': [True, False],
+    'scan_mode': ['wavefront', 'independent'],
+    'ts_grid': ['full', 'adaptive'],
+    'ts_opt': ['sequential', 'race']
 }
 ES_TSK_KEYWORDS_DEFAULT_DCT = {
     'runlvl': None,
@@ -158,7 +187,13 @@ ES_TSK_KEYWORDS_DEFAULT_DCT = {
     'rxndirn': 'forw',
     'hessmax': 1000,
     'hrthresh': -0.5,
-    'pot_thresh': 0.3
+    'pot_thresh': 0.3,
+    'ncores': 1,
+    'mem': None,
+    'scan_mode': 'wavefront',
+    'ts_grid': 'full',
+    'ts_grid_ethresh': 0.1,
+    'ts_opt': 'sequential'
 }
 
 # Species keywords
@@ -153,6 +153,17 @@ def pes_dct_w_rxn_lsts(pes_dct, idx_dct, form_dct,
     return run_pes_dct
 
 
+def pes_spc_names(rxn_lst):
+    """ Get the names of all the species on the channels of a PES,
+        used to keep concurrent drivers off the same species filesystems
+    """
+    spc_names = set()
+    for rxn in rxn_lst:
+        spc_names.update(rxn['species'])
+
+    return spc_names
+
+
 def format_run_rxn_lst(rct_names_lst, prd_names_lst,
                        rxn_model_lst, rxn_chn_idxs):
     """ Get the lst of reactions to be run
@@ -31,6 +31,10 @@ def build_run_inp_dct(job_path):
         keyword_dct['spc'] = 'csv'
     if 'print_mech' not in keyword_dct:
         keyword_dct['print_mech'] = False
+    if 'nprocs' not in keyword_dct:
+        keyword_dct['nprocs'] = 1
+    if 'nasa_fit' not in keyword_dct:
+        keyword_dct['nasa_fit'] = 'pac99'
 
     # Check if section specified fully and supported
     check_run_keyword_dct(keyword_dct)
@@ -76,6 +80,12 @@ def check_run_keyword_dct(dct):
     if dct['spc'] not in RUN_INP_KEY_DCT['spc']:
         print('*ERROR: Unallowed value for spc keyword')
         sys.exit()
+    if not isinstance(dct['nprocs'], int) or dct['nprocs'] < 1:
+        print('*ERROR: nprocs keyword must be a positive integer')
+        sys.exit()
+    if dct['nasa_fit'] not in RUN_INP_KEY_DCT['nasa_fit']:
+        print('*ERROR: Unallowed value for nasa_fit keyword')
+        sys.exit()
 
 
 # PARSE THE OBJ SECTION OF THE FILE #
@@ -207,13 +207,19 @@ def check_es_tsks_supported(es_tsks, thy_dct):
                         #         print('*ERROR: mr theory level only avail',
                         #               'for molpro')
                         #         sys.exit()
-                elif key == 'hessmax':
+                elif key in ('hessmax', 'ncores'):
                     if not isinstance(val, int):
                         print('{} must be set to an integer'.format(key))
+                elif key == 'mem':
+                    if val is not None and not isinstance(val, (int, float)):
+                        print('{} must be set to a number'.format(key))
                 elif key == 'pot_thresh':
                     print(key, val, type(val))
                     if not isinstance(val, float):
                         print('{} must be set to an float'.format(key))
+                elif key == 'ts_grid_ethresh':
+                    if not isinstance(val, float):
+                        print('{} must be set to an float'.format(key))
                 elif key == 'cnf_range':
                     if 'n' in val or 'e' in val:
                         val2 = val[1:]
@@ -99,12 +99,11 @@ def nasa_polynomial(hform0, hform298, ckin_poly_str):
     return hf_str + ckin_poly_str
 
 
-def write_nasa_file(ckin_nasa_str, ckin_path):
+def write_nasa_file(ckin_nasa_str, ckin_path, filename='all.ckin'):
     """ write out the nasa polynomials
     """
-    if not os.path.exists(ckin_path):
-        os.makedirs(ckin_path)
-    fpath = os.path.join(ckin_path, 'all.ckin')
+    os.makedirs(ckin_path, exist_ok=True)
+    fpath = os.path.join(ckin_path, filename)
     with open(fpath, 'w') as nasa_file:
         nasa_file.write(ckin_nasa_str)
 
@@ -113,8 +112,7 @@ def write_nasa_file(ckin_nasa_str, ckin_path):
 def write_transport_file(ckin_trans_str, ckin_path):
     """ write out the transport file
     """
-    if not os.path.exists(ckin_path):
-        os.makedirs(ckin_path)
+    os.makedirs(ckin_path, exist_ok=True)
     fpath = os.path.join(ckin_path, 'trans.ckin')
     with open(fpath, 'w') as nasa_file:
         nasa_file.write(ckin_trans_str)
@@ -3,6 +3,7 @@ Moldriver libs
 """
 
 from lib.filesys import build
+from lib.filesys import index
 from lib.filesys import inf
 from lib.filesys import mincnf
 from lib.filesys import models
@@ -12,6 +13,7 @@ from lib.filesys._save import _read as read_zma_geo
 
 __all__ = [
     'build',
+    'index',
     'inf',
     'mincnf',
     'models',
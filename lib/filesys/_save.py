@@ -6,6 +6,8 @@ import automol
 import elstruct
 import autofile
 from routines.es import runner as es_runner
+from lib.filesys import index
+from lib.filesys import mincnf
 
 
 def save_struct(run_fs, save_fs, locs, job, mod_thy_info,
@@ -33,8 +35,8 @@ def save_struct(run_fs, save_fs, locs, job, mod_thy_info,
         save_fs[-1].create(locs)
         save_fs[-1].file.geometry_info.write(inf_obj, locs)
         save_fs[-1].file.geometry_input.write(inp_str, locs)
-        save_fs[-1].file.geometry.write(geo, locs)
-        save_fs[-1].file.energy.write(ene, locs)
+        index.write(save_fs[-1].file.geometry, geo, locs)
+        index.write(save_fs[-1].file.energy, ene, locs)
 
         # Save zma information seperately, if required
         if not in_zma_fs:
@@ -52,7 +54,8 @@ def save_struct(run_fs, save_fs, locs, job, mod_thy_info,
         sp_save_fs[-1].create(mod_thy_info[1:4])
         sp_save_fs[-1].file.input.write(inp_str, mod_thy_info[1:4])
         sp_save_fs[-1].file.info.write(inf_obj, mod_thy_info[1:4])
-        sp_save_fs[-1].file.energy.write(ene, mod_thy_info[1:4])
+        index.write(sp_save_fs[-1].file.energy, ene, mod_thy_info[1:4])
+        mincnf.clear_ladders(save_path)
 
         saved = True
 
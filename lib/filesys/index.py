@@ -0,0 +1,112 @@
+"""
+  Process-wide in-memory index of the save filesystem
+
+  The locators found by existing() and the data read from the files of an
+  autofile filesystem are stored in memory, keyed by their paths, so that
+  repeated reads of the same parts of the save filesystem (conformer
+  locators, single-point energies, geometries, ...) do not walk the
+  directories and parse the files again.
+
+  Each entry holds the modification times of the directories or file it was
+  built from; a single stat of these is enough to tell whether the entry is
+  still valid, so anything written to the filesystem, by this process or
+  another, is picked up on the next read. Writes done through write()
+  update the index directly.
+"""
+
+import os
+
+
+# Locators of existing leaves, keyed by the path of the root of the series
+_EXISTING = {}
+# Data read from the files, keyed by the path of the file
+_FILES = {}
+
+
+def existing(series, root_locs=()):
+    """ locators of the existing leaves of a series in the filesystem,
+        e.g. existing(cnf_save_fs[-1]) in place of cnf_save_fs[-1].existing()
+    """
+
+    root_path = series.root.path(root_locs)
+    entry = _EXISTING.get(root_path)
+    if entry is not None and _valid(entry[1]):
+        locs_lst = entry[0]
+    else:
+        locs_lst = tuple(series.existing(root_locs))
+        dir_paths = set(os.path.dirname(series.path(locs))
+                        for locs in locs_lst)
+        dir_paths.add(root_path)
+        _EXISTING[root_path] = (locs_lst, _mtimes(dir_paths))
+
+    return list(locs_lst)
+
+
+def exists(series_file, locs=()):
+    """ check if a file of the filesystem exists,
+        e.g. exists(sp_fs[-1].file.energy, thy_locs)
+    """
+    path = series_file.path(locs)
+    entry = _FILES.get(path)
+    if entry is not None and _valid(entry[1]):
+        ret = True
+    else:
+        ret = series_file.exists(locs)
+
+    return ret
+
+
+def read(series_file, locs=()):
+    """ read the data of a file of the filesystem,
+        e.g. read(sp_fs[-1].file.energy, thy_locs)
+    """
+
+    path = series_file.path(locs)
+    entry = _FILES.get(path)
+    if entry is not None and _valid(entry[1]):
+        dat = entry[0]
+    else:
+        dat = series_file.read(locs)
+        _FILES[path] = (dat, _mtimes((path,)))
+
+    return dat
+
+
+def write(series_file, dat, locs=()):
+    """ write the data to a file of the filesystem and the index
+    """
+    series_file.write(dat, locs)
+    path = series_file.path(locs)
+    _FILES[path] = (dat, _mtimes((path,)))
+
+
+def clear(prefix=None):
+    """ drop everything under the prefix, or the whole index, from memory
+    """
+    if prefix is None:
+        _EXISTING.clear()
+        _FILES.clear()
+    else:
+        prefix = os.path.abspath(prefix)
+        for dct in (_EXISTING, _FILES):
+            for path in [path for path in dct if path.startswith(prefix)]:
+                dct.pop(path)
+
+
+def _mtimes(paths):
+    """ modification times of a set of paths (None if a path is missing)
+    """
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append((path, os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            mtimes.append((path, None))
+
+    return tuple(mtimes)
+
+
+def _valid(mtimes):
+    """ check the modification times of an index entry are still current
+    """
+    return _mtimes(path for path, _ in mtimes) == mtimes
@@ -2,10 +2,17 @@
   Functions to read the filesystem and pull objects from it
 """
 
+import os
 import sys
 import automol
 import autofile
 from phydat import phycon
+from lib.filesys import index
+
+
+# Energy-sorted conformer locs and energies, keyed by the path of the
+# conformer save filesystem and the theory level of the energies
+_LADDERS = {}
 
 
 def get_zma_geo(filesys, locs):
@@ -45,14 +52,11 @@ def conformer_locators(cnf_save_fs, mod_thy_info, cnf_range='min'):
     """ locators for minimum energy conformer
     """
 
-    cnf_locs_lst = cnf_save_fs[-1].existing()
+    cnf_locs_lst, cnf_enes_lst = conformer_ladder(cnf_save_fs, mod_thy_info)
     fin_locs_lst, fin_paths_lst = [], []
 
     if cnf_locs_lst:
 
-        cnf_locs_lst, cnf_enes_lst = _sorted_cnf_lsts(
-            cnf_locs_lst, cnf_save_fs, mod_thy_info)
-
         if cnf_range == 'min':
             fin_locs_lst = [cnf_locs_lst[0]]
         elif cnf_range == 'all':
@@ -68,6 +72,46 @@ def conformer_locators(cnf_save_fs, mod_thy_info, cnf_range='min'):
     return fin_locs_lst, fin_paths_lst
 
 
+def conformer_ladder(cnf_save_fs, mod_thy_info):
+    """ conformer locs and energies sorted by energy; the ladder is built
+        once and kept in memory until a conformer is added to the
+        filesystem or clear_ladders is called for its path
+    """
+
+    cnf_path = cnf_save_fs[0].path()
+    key = (cnf_path, tuple(mod_thy_info[1:4]))
+    try:
+        mtime = os.stat(cnf_path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    if key in _LADDERS and _LADDERS[key][0] == mtime:
+        ladder = _LADDERS[key][1]
+    else:
+        cnf_locs_lst = index.existing(cnf_save_fs[-1])
+        if cnf_locs_lst:
+            ladder = _sorted_cnf_lsts(
+                cnf_locs_lst, cnf_save_fs, mod_thy_info)
+            _LADDERS[key] = (mtime, ladder)
+        else:
+            ladder = ((), ())
+
+    return ladder
+
+
+def clear_ladders(path=None):
+    """ drop the conformer ladders that a save at the path may change,
+        or all of them if no path is given
+    """
+    if path is None:
+        _LADDERS.clear()
+    else:
+        path = os.path.abspath(path)
+        for key in list(_LADDERS):
+            if path.startswith(key[0]) or key[0].startswith(path):
+                _LADDERS.pop(key)
+
+
 def _sorted_cnf_lsts(cnf_locs_lst, cnf_save_fs, mod_thy_info):
     """ Get a list of conformer locs and energies, sorted by energies
     """
@@ -79,7 +123,8 @@ def _sorted_cnf_lsts(cnf_locs_lst, cnf_save_fs, mod_thy_info):
         for locs in cnf_locs_lst:
             cnf_path = cnf_save_fs[-1].path(locs)
             sp_fs = autofile.fs.single_point(cnf_path)
-            cnf_enes_lst.append(sp_fs[-1].file.energy.read(mod_thy_info[1:4]))
+            cnf_enes_lst.append(
+                index.read(sp_fs[-1].file.energy, mod_thy_info[1:4]))
 
     # Sort the cnf locs and cnf enes
     cnf_enes_lst, cnf_locs_lst = zip(*sorted(zip(cnf_enes_lst, cnf_locs_lst)))
@@ -120,11 +165,11 @@ def _nrange_locs(cnf_locs, nthresh):
 
 def min_dist_conformer_zma(dist_name, cnf_save_fs):
     """ locators for minimum energy conformer """
-    cnf_locs_lst = cnf_save_fs[-1].existing()
+    cnf_locs_lst = index.existing(cnf_save_fs[-1])
     cnf_zmas = []
     for locs in cnf_locs_lst:
         zma_fs = autofile.fs.zmatrix(cnf_save_fs[-1].path(locs))
-        cnf_zmas.append(zma_fs[-1].file.zmatrix.read([0]))
+        cnf_zmas.append(index.read(zma_fs[-1].file.zmatrix, [0]))
     min_dist = 100.
     min_zma = []
     for zma in cnf_zmas:
@@ -138,11 +183,11 @@ def min_dist_conformer_zma(dist_name, cnf_save_fs):
 
 def min_dist_conformer_zma_geo(dist_coords, cnf_save_fs):
     """ locators for minimum energy conformer """
-    cnf_locs_lst = cnf_save_fs[-1].existing()
+    cnf_locs_lst = index.existing(cnf_save_fs[-1])
     cnf_zmas = []
     for locs in cnf_locs_lst:
         zma_fs = autofile.fs.zmatrix(cnf_save_fs[-1].path(locs))
-        cnf_zmas.append(zma_fs[-1].file.zmatrix.read([0]))
+        cnf_zmas.append(index.read(zma_fs[-1].file.zmatrix, [0]))
     min_dist = 100.
     min_zma = []
     for zma in cnf_zmas:
@@ -160,9 +205,9 @@ def min_dist_conformer_zma_geo(dist_coords, cnf_save_fs):
 def locs_sort(save_fs):
     """ sort trajectory file according to energies
     """
-    locs_lst = save_fs[-1].existing()
+    locs_lst = index.existing(save_fs[-1])
     if locs_lst:
-        enes = [save_fs[-1].file.energy.read(locs)
+        enes = [index.read(save_fs[-1].file.energy, locs)
                 for locs in locs_lst]
         sorted_locs = []
         for _, loc in sorted(zip(enes, locs_lst), key=lambda x: x[0]):
@@ -173,17 +218,17 @@ def locs_sort(save_fs):
 def traj_sort(save_fs, mod_thy_info):
     """ sort trajectory file according to energies
     """
-    locs_lst = save_fs[-1].existing()
+    locs_lst = index.existing(save_fs[-1])
     if locs_lst:
         enes = []
         for locs in locs_lst:
             cnf_path = save_fs[-1].path(locs)
             sp_fs = autofile.fs.single_point(cnf_path)
             enes.append(
-                sp_fs[-1].file.energy.read(mod_thy_info[1:4]))
+                index.read(sp_fs[-1].file.energy, mod_thy_info[1:4]))
         # enes = [save_fs[-1].file.energy.read(locs)
         #         for locs in locs_lst]
-        geos = [save_fs[-1].file.geometry.read(locs)
+        geos = [index.read(save_fs[-1].file.geometry, locs)
                 for locs in locs_lst]
         traj = []
         traj_sort_data = sorted(zip(enes, geos, locs_lst), key=lambda x: x[0])
@@ -5,6 +5,7 @@
 import autofile
 from lib.filesys import inf as finf
 from lib.filesys import mincnf
+from lib.filesys import index
 
 
 def pf_filesys(spc_dct_i, pf_levels,
@@ -145,7 +146,7 @@ def get_rxn_scn_coords(ts_path, coord_name, zma_locs=(0,)):
 
     # Read the values of the reaction coord
     scn_save_fs = autofile.fs.scan(zma_path)
-    scn_locs = scn_save_fs[-1].existing([[coord_name]])
+    scn_locs = index.existing(scn_save_fs[-1], [[coord_name]])
     scn_grids = [locs[1][0] for locs in scn_locs
                  if locs[1][0] != 1000.0]
 
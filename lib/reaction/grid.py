@@ -9,6 +9,7 @@ import automol
 import autofile
 from phydat import phycon
 from phydat import bnd
+from lib import filesys
 
 
 # Functions for locating maxima
@@ -17,29 +18,19 @@ def find_max_1d(typ, grid, ts_zma, dist_name, scn_save_fs,
     """ Find the maxmimum of the grid along one dimension
     """
 
-    # Find the maximum along the scan
-    locs_list = []
-    locs_lst = []
-    enes = []
-    for grid_val_i in grid:
-        if constraint_dct is None:
-            locs_list.append([[dist_name], [grid_val_i]])
-        else:
-            locs_list.append([constraint_dct, [dist_name], [grid_val_i]])
-    for locs in locs_list:
-        if scn_save_fs[-1].exists(locs):
-            scn_path = scn_save_fs[-1].path(locs)
-            sp_save_fs = autofile.fs.single_point(scn_path)
-            enes.append(sp_save_fs[-1].file.energy.read(mod_thy_info[1:4]))
-            locs_lst.append(locs)
-    max_ene = max(enes)
-    max_idx = enes.index(max_ene)
+    # Read the energies along the scan and find the maximum
+    enes = scan_surface(
+        [dist_name], [grid], scn_save_fs, mod_thy_info, constraint_dct)
+    if not enes.count():
+        print('No energies found along the scan to locate the maximum')
+        return []
+    max_idx = int(numpy.ma.argmax(enes))
 
     # Build lst of guess zmas
     guess_zmas = []
 
     # Get zma at maximum
-    max_locs = locs_lst[max_idx]
+    max_locs = scan_locs([dist_name], [grid], (max_idx,), constraint_dct)
     print(scn_save_fs[-1].path(max_locs))
     max_zma = scn_save_fs[-1].file.zmatrix.read(max_locs)
     guess_zmas.append(max_zma)
@@ -55,67 +46,181 @@ def find_max_1d(typ, grid, ts_zma, dist_name, scn_save_fs,
 
 
 def find_max_2d(grid1, grid2, dist_name, brk_name, scn_save_fs,
-                mod_thy_info, constraint_dct):
+                mod_thy_info, constraint_dct, smooth=False):
     """ Find the maxmimum of the grid along two dimensions
     """
-    enes_lst = []
-    locs_lst_lst = []
-    for grid_val_j in grid2:
-        locs_list = []
-        for grid_val_i in grid1:
-            if constraint_dct is None:
-                locs_list.append([[dist_name, brk_name],
-                                  [grid_val_i, grid_val_j]])
-            else:
-                locs_list.append([constraint_dct, [dist_name, brk_name],
-                                  [grid_val_i, grid_val_j]])
-        enes = []
-        locs_lst = []
-        for locs in locs_list:
-            print('locs', locs)
-            if scn_save_fs[-1].exists(locs):
-                scn_path = scn_save_fs[-1].path(locs)
-                sp_save_fs = autofile.fs.single_point(scn_path)
-                enes.append(sp_save_fs[-1].file.energy.read(mod_thy_info[1:4]))
-                locs_lst.append(locs)
-        locs_lst_lst.append(locs_lst)
-        if enes:
-            enes_lst.append(enes)
-        print('enes_lst', enes_lst)
-    max_enes = []
-    max_locs = []
-    for idx_j, enes in enumerate(enes_lst):
-        max_ene = -10000.
-        max_loc = ''
-        for idx_i, ene in enumerate(enes):
-            print('ene max_ene', ene, max_ene)
-            if ene > max_ene:
-                max_ene = ene
-                max_loc = locs_lst_lst[idx_j][idx_i]
-                print('new max', max_ene, max_loc)
-        max_enes.append(max_ene)
-        max_locs.append(max_loc)
-    print('max enes', max_enes)
-    min_ene = 10000.
-    locs = []
-    for idx_j, ene in enumerate(max_enes):
-        print('ene min_ene', ene, min_ene)
-        if ene < min_ene:
-            min_ene = ene
-            locs = max_locs[idx_j]
-            print('locs', locs)
-    max_locs = locs
-    max_ene = min_ene
-    print('min max loc', max_ene, max_locs)
+
+    # Read the surface and find its minimax point
+    coord_names, coord_grids = [dist_name, brk_name], [grid1, grid2]
+    enes = scan_surface(
+        coord_names, coord_grids, scn_save_fs, mod_thy_info, constraint_dct)
+    path, sadpt_idxs, _ = minimax_2d(enes, smooth=smooth)
+    if not sadpt_idxs:
+        print('No energies found on the scan to locate the maximum')
+        return None
+    print('Maximum along {} for each {} grid point:'.format(
+        dist_name, brk_name))
+    for idx_i, idx_j in path:
+        print('  {:.3f} {:.3f} {:.8f}'.format(
+            grid1[idx_i], grid2[idx_j], enes[idx_i, idx_j]))
+
+    max_locs = scan_locs(
+        coord_names, coord_grids, sadpt_idxs[0], constraint_dct)
+    print('min max loc', enes[sadpt_idxs[0]], max_locs)
     print('min max loc', scn_save_fs[-1].path(max_locs))
     max_zma = scn_save_fs[-1].file.zmatrix.read(max_locs)
 
-    # print('geometry for maximum along scan:', max_zma)
-    # print('energy for maximum along scan:', max_ene)
-
     return max_zma
 
 
+# Functions to read scan surfaces
+def scan_surface(coord_names, coord_grids, scn_save_fs,
+                 mod_thy_info, constraint_dct):
+    """ Read the energies of a 1D or 2D scan from the save filesys in one
+        pass into a masked array with one axis per coordinate, with the
+        grid points without an energy masked
+    """
+
+    shape = tuple(len(grid) for grid in coord_grids)
+    enes = numpy.ma.masked_all(shape, dtype=float)
+    for idxs in numpy.ndindex(*shape):
+        locs = scan_locs(coord_names, coord_grids, idxs, constraint_dct)
+        if scn_save_fs[-1].exists(locs):
+            sp_save_fs = autofile.fs.single_point(scn_save_fs[-1].path(locs))
+            ene_file = sp_save_fs[-1].file.energy
+            if filesys.index.exists(ene_file, mod_thy_info[1:4]):
+                enes[idxs] = filesys.index.read(ene_file, mod_thy_info[1:4])
+
+    return enes
+
+
+def scan_locs(coord_names, coord_grids, idxs, constraint_dct):
+    """ locs of the point of a scan at a set of grid indices
+    """
+    vals = [grid[idx] for grid, idx in zip(coord_grids, idxs)]
+    locs = [coord_names, vals]
+    if constraint_dct is not None:
+        locs = [constraint_dct] + locs
+    return locs
+
+
+def minimax_2d(enes, smooth=False):
+    """ Minimax path of a 2D scan surface, enes[i, j] with i along the
+        forming and j along the breaking coordinate: the maximum along i
+        for each j with energies. The local minima of the energies along
+        the path are the saddle point candidates, lowest first.
+
+        :param enes: masked array of the surface from scan_surface
+        :param smooth: use the surface averaged with its nearest neighbors
+        :returns: path, candidates, surface used (all as grid indices)
+    """
+
+    if smooth:
+        enes = smooth_surface(enes)
+
+    # Maximum along the first axis for each column with energies
+    cols = numpy.flatnonzero(enes.count(axis=0))
+    rows = numpy.ma.argmax(enes[:, cols], axis=0, fill_value=-numpy.inf)
+    path = tuple(zip(rows.tolist(), cols.tolist()))
+    path_enes = enes[rows, cols].filled(numpy.inf)
+
+    # Local minima along the path, including its ends, sorted by energy
+    pad_enes = numpy.concatenate(([numpy.inf], path_enes, [numpy.inf]))
+    is_min = ((pad_enes[1:-1] <= pad_enes[:-2]) &
+              (pad_enes[1:-1] <= pad_enes[2:]))
+    min_pos = numpy.flatnonzero(is_min)
+    min_pos = min_pos[numpy.argsort(path_enes[min_pos], kind='stable')]
+    sadpt_idxs = tuple(path[pos] for pos in min_pos)
+
+    return path, sadpt_idxs, enes
+
+
+def smooth_surface(enes):
+    """ Average each point of a masked surface with its unmasked nearest
+        neighbors along each axis; masked points stay masked
+    """
+
+    vals = enes.filled(0.0)
+    wgts = (~numpy.ma.getmaskarray(enes)).astype(float)
+    tot, cnt = vals.copy(), wgts.copy()
+    for axis in range(enes.ndim):
+        npts = enes.shape[axis]
+        for shift in (-1, 1):
+            dst = [slice(None)] * enes.ndim
+            src = [slice(None)] * enes.ndim
+            dst[axis] = slice(max(shift, 0), npts + min(shift, 0))
+            src[axis] = slice(max(-shift, 0), npts + min(-shift, 0))
+            tot[tuple(dst)] += vals[tuple(src)]
+            cnt[tuple(dst)] += wgts[tuple(src)]
+
+    smooth = numpy.ma.masked_array(
+        tot / numpy.where(cnt > 0, cnt, 1.0), mask=numpy.ma.getmaskarray(enes))
+
+    return smooth
+
+
+# Functions for adaptive searches of the maximum
+def coarse_grid_idxs(npoints, nstride=None):
+    """ indices of the coarse subset of a grid, including both ends,
+        that is evaluated first in an adaptive search for the maximum;
+        the default stride is about the square root of the grid size
+    """
+    if nstride is None:
+        nstride = max(1, int(round(math.sqrt(npoints))))
+    idxs = list(range(0, npoints, nstride))
+    if npoints > 0 and idxs[-1] != npoints - 1:
+        idxs.append(npoints - 1)
+
+    return tuple(idxs)
+
+
+def refine_grid_idxs(enes, npoints, ethresh=0.1):
+    """ indices of the grid points to evaluate next to narrow the bracket
+        around the maximum of the points evaluated so far; empty once
+        the maximum is resolved, i.e. the energies of its evaluated
+        neighbors on both sides are within ethresh (kcal/mol) of it or
+        there are no more grid points between them
+
+        :param enes: energies (hartree) of the evaluated points keyed by
+            grid index, None for points that failed
+        :param npoints: number of points on the grid
+        :param ethresh: energy tolerance (kcal/mol)
+    """
+
+    done_idxs = sorted(idx for idx, ene in enes.items() if ene is not None)
+    if not done_idxs:
+        return ()
+
+    # Find the maximum and its evaluated neighbors
+    max_pos = max(range(len(done_idxs)), key=lambda pos: enes[done_idxs[pos]])
+    max_idx = done_idxs[max_pos]
+    nbr_idxs = [done_idxs[pos] for pos in (max_pos-1, max_pos+1)
+                if 0 <= pos < len(done_idxs)]
+    # A maximum at the first or last evaluated point is bracketed by
+    # the end of the grid, when the point at that end failed
+    if max_pos == 0 and max_idx != 0:
+        nbr_idxs.append(0)
+    if max_pos == len(done_idxs)-1 and max_idx != npoints-1:
+        nbr_idxs.append(npoints-1)
+
+    # Split each side of the bracket not yet resolved at its middle,
+    # skipping the points that have already been tried
+    new_idxs = []
+    for nbr_idx in nbr_idxs:
+        nbr_ene = enes.get(nbr_idx)
+        if nbr_ene is not None:
+            edif = abs(enes[max_idx] - nbr_ene) * phycon.EH2KCAL
+            if edif <= ethresh:
+                continue
+        lidx, hidx = sorted((max_idx, nbr_idx))
+        mid = (lidx + hidx) / 2.0
+        untried = [idx for idx in range(lidx+1, hidx) if idx not in enes]
+        if untried:
+            new_idxs.append(min(untried, key=lambda idx: abs(idx - mid)))
+
+    return tuple(sorted(set(new_idxs)))
+
+
 # Functions to build lists potential sadpts
 def vtst_max(grid, dist_name, scn_save_fs,
              mod_thy_info, constraint_dct, ethresh=0.3):
@@ -123,13 +228,12 @@ def vtst_max(grid, dist_name, scn_save_fs,
         (need to make the generic version)
     """
 
-    # Get the locs and energies along the grid
-    locs_lst, enes_lst = _grid_vals(
-        grid, dist_name, scn_save_fs,
-        mod_thy_info, constraint_dct)
+    # Get the energies along the grid
+    enes = scan_surface(
+        [dist_name], [grid], scn_save_fs, mod_thy_info, constraint_dct)
 
     # Locate all potential sadpts
-    sadpt_idxs, sadpt_enes = _potential_sadpt(enes_lst, ethresh=ethresh)
+    sadpt_idxs, sadpt_enes = _potential_sadpt(enes, ethresh=ethresh)
 
     if sadpt_idxs and sadpt_enes:
         # For now, find the greatest max for the saddle point
@@ -137,7 +241,8 @@ def vtst_max(grid, dist_name, scn_save_fs,
         sadpt_idx = sadpt_idxs[max_idx][1]
 
         # Get the locs for the maximum
-        sadpt_locs = locs_lst[sadpt_idx]
+        sadpt_locs = scan_locs(
+            [dist_name], [grid], (sadpt_idx,), constraint_dct)
 
         # Get the max zma
         sadpt_zma = scn_save_fs[-1].file.zmatrix.read(sadpt_locs)
@@ -147,39 +252,17 @@ def vtst_max(grid, dist_name, scn_save_fs,
     return sadpt_zma
 
 
-def _grid_vals(grid, dist_name, scn_save_fs,
-               mod_thy_info, constraint_dct):
-    """ efef
-    """
-
-    # Initialize the lists
-    locs_lst = []
-    enes_lst = []
-
-    # Build the lists of all the locs for the grid
-    grid_locs = []
-    for grid_val_i in grid:
-        if constraint_dct is None:
-            grid_locs.append([[dist_name], [grid_val_i]])
-        else:
-            grid_locs.append([constraint_dct, [dist_name], [grid_val_i]])
-
-    # Get the energies along the grid
-    for locs in grid_locs:
-        if scn_save_fs[-1].exists(locs):
-            scn_path = scn_save_fs[-1].path(locs)
-            sp_save_fs = autofile.fs.single_point(scn_path)
-            enes_lst.append(sp_save_fs[-1].file.energy.read(mod_thy_info[1:4]))
-            locs_lst.append(locs)
-
-    return locs_lst, enes_lst
-
-
-def _potential_sadpt(evals, ethresh=0.3):
+def _potential_sadpt(enes, ethresh=0.3):
     """ Determine points on a 1D-grid that could correspond to
-        a saddle point
+        a saddle point; the masked points of the grid are skipped and
+        the triplets are returned as indices of the full grid
     """
 
+    # Work on the points with energies
+    enes = numpy.ma.asarray(enes)
+    grid_idxs = numpy.flatnonzero(~numpy.ma.getmaskarray(enes))
+    evals = enes.compressed()
+
     # Determine the idxs for all of the local extrema
     loc_max, loc_min = _local_extrema(evals)
 
@@ -190,6 +273,8 @@ def _potential_sadpt(evals, ethresh=0.3):
     # Determine which local maxima should be considered for a sadpt search
     sadpt_idxs, sadpt_enes = _potential_sadpt_triplets(
         extrema, evals, ethresh=ethresh)
+    sadpt_idxs = tuple(tuple(int(grid_idxs[idx]) for idx in trip)
+                       for trip in sadpt_idxs)
 
     return sadpt_idxs, sadpt_enes
 
@@ -198,17 +283,14 @@ def _potential_sadpt_triplets(extrema_trips, evals, ethresh=0.3):
     """ Find triplets to look for sadpts
     """
 
-    sadpt_idxs = tuple()
-    sadpt_enes = tuple()
-    for trip in extrema_trips:
-        minidx1, maxidx, minidx2 = trip
-        emin1, emax, emin2 = evals[minidx1], evals[maxidx], evals[minidx2]
-        edif1 = abs(emax - emin1)
-        edif2 = abs(emax - emin2)
-        if edif1 >= ethresh or edif2 >= ethresh:
-            sadpt_idxs += (trip,)
-            sadpt_enes += (emax,)
-            # edifs += ((edif1, edif2),)
+    trips = numpy.array(extrema_trips, dtype=int).reshape(-1, 3)
+    evals = numpy.asarray(evals, dtype=float)
+    emin1, emax, emin2 = evals[trips].T
+    keep = ((numpy.abs(emax - emin1) >= ethresh) |
+            (numpy.abs(emax - emin2) >= ethresh))
+
+    sadpt_idxs = tuple(tuple(trip) for trip in trips[keep].tolist())
+    sadpt_enes = tuple(emax[keep].tolist())
 
     return sadpt_idxs, sadpt_enes
 
@@ -222,21 +304,16 @@ def _extrema_triplets(loc_max, loc_min, final_idx):
         param final_idx: index for the final point on the grid (in 0-index)
     """
 
-    trips = tuple()
-    for lmax in loc_max:
-
-        # Find inner min connected to emax
-        in_idx = lmax
-        while in_idx not in loc_min and in_idx != 0:
-            in_idx -= 1
+    loc_max = numpy.asarray(loc_max, dtype=int)
+    loc_min = numpy.sort(numpy.asarray(loc_min, dtype=int))
 
-        # Find outer min connected to emax
-        out_idx = lmax
-        while out_idx not in loc_min and out_idx != final_idx:
-            out_idx += 1
+    # Nearest min on either side of each max, or the grid endpoint
+    pos = numpy.searchsorted(loc_min, loc_max)
+    bnd_min = numpy.concatenate(([0], loc_min, [final_idx]))
+    in_idxs = bnd_min[pos]
+    out_idxs = bnd_min[pos + 1]
 
-        # Add to the triplet lst
-        trips += ((in_idx, lmax, out_idx),)
+    trips = tuple(zip(in_idxs.tolist(), loc_max.tolist(), out_idxs.tolist()))
 
     return trips
 
@@ -13,6 +13,7 @@ import mess_io
 from phydat import phycon
 from lib.structure import vib as vibprep
 from lib.submission import run_script
+from lib.submission import cached_output
 from lib.submission import DEFAULT_SCRIPT_DCT
 
 
@@ -552,20 +553,7 @@ def mess_tors_zpes(tors_geo, hind_rot_str, tors_save_path,
         create a messpf input and run messpf to get tors_freqs and tors_zpes
     """
 
-    # Set up the filesys
-    bld_locs = ['PF', 0]
-    bld_save_fs = autofile.fs.build(tors_save_path)
-    bld_save_fs[-1].create(bld_locs)
-    pf_path = bld_save_fs[-1].path(bld_locs)
-
-    pf_path = os.path.join(pf_path, str(random.randint(0,1234567)))
-    if not os.path.exists(pf_path):
-        os.makedirs(pf_path)
-
-    print('Run path for MESSPF:')
-    print(pf_path)
-
-    # Write the MESSPF input file
+    # Write the MESSPF input string
     global_pf_str = mess_io.writer.global_pf(
         temperatures=[100.0, 200.0, 300.0, 400.0, 500],
         rel_temp_inc=0.001,
@@ -583,18 +571,42 @@ def mess_tors_zpes(tors_geo, hind_rot_str, tors_save_path,
     )
     pf_inp_str = '\n'.join([global_pf_str, spc_str]) + '\n'
 
-    with open(os.path.join(pf_path, 'pf.inp'), 'w') as pf_file:
-        pf_file.write(pf_inp_str)
+    def _run_messpf():
+        """ run MESSPF in a new directory and read the zpes and freqs
+        """
+
+        # Set up the filesys
+        bld_locs = ['PF', 0]
+        bld_save_fs = autofile.fs.build(tors_save_path)
+        bld_save_fs[-1].create(bld_locs)
+        pf_path = bld_save_fs[-1].path(bld_locs)
+
+        pf_path = os.path.join(pf_path, str(random.randint(0, 1234567)))
+        if not os.path.exists(pf_path):
+            os.makedirs(pf_path)
+
+        print('Run path for MESSPF:')
+        print(pf_path)
+
+        with open(os.path.join(pf_path, 'pf.inp'), 'w') as pf_file:
+            pf_file.write(pf_inp_str)
+
+        # Run MESSPF
+        run_script(script_str, pf_path)
 
-    # Run MESSPF
-    run_script(script_str, pf_path)
+        # Obtain the torsional zpes and freqs from the MESS output
+        with open(os.path.join(pf_path, 'pf.log'), 'r') as mess_file:
+            output_string = mess_file.read()
 
-    # Obtain the torsional zpes and freqs from the MESS output
-    with open(os.path.join(pf_path, 'pf.log'), 'r') as mess_file:
-        output_string = mess_file.read()
+        tors_zpes = mess_io.reader.tors.zpves(output_string)
+        # tors_freqs = mess_io.reader.tors.freqs(output_string)
+        tors_freqs = mess_io.reader.grid_min_freqs(output_string)
 
-    tors_zpes = mess_io.reader.tors.zpves(output_string)
-    # tors_freqs = mess_io.reader.tors.freqs(output_string)
-    tors_freqs = mess_io.reader.grid_min_freqs(output_string)
+        return tors_zpes, tors_freqs
 
-    return tors_zpes, tors_freqs
+    # Run MESSPF, unless it was already run for the same input
+    return cached_output(
+        'messpf_tors',
+        {'pf.inp': pf_inp_str, 'script': script_str},
+        _run_messpf,
+        cache_if=lambda ret: bool(ret[0]))
@@ -8,6 +8,11 @@ from lib.submission._host import print_host_name
 from lib.submission._host import get_host_node
 from lib.submission._host import get_pid
 from lib.submission._par import qchem_params
+from lib.submission._pool import nprocs_avail
+from lib.submission._pool import set_nprocs
+from lib.submission._pool import run_locked_procs
+from lib.submission._cache import set_cache_path
+from lib.submission._cache import cached_output
 
 
 __all__ = [
@@ -16,5 +21,10 @@ __all__ = [
     'print_host_name',
     'get_host_node',
     'get_pid',
-    'qchem_params'
+    'qchem_params',
+    'nprocs_avail',
+    'set_nprocs',
+    'run_locked_procs',
+    'set_cache_path',
+    'cached_output'
 ]
@@ -0,0 +1,94 @@
+""" Cache the parsed outputs of external programs, keyed by a hash of the
+    program name and the contents of its input files
+"""
+
+import os
+import copy
+import pickle
+import hashlib
+import tempfile
+
+
+# Parsed outputs held in memory, keyed by the input hash
+_MEM_CACHE = {}
+# Directory where the parsed outputs are also stored on disk
+_CACHE_PATH = {'path': None}
+
+
+def set_cache_path(path):
+    """ set the directory where the cached outputs are stored on disk;
+        None keeps the cache in memory only
+    """
+    if path is not None and not os.path.exists(path):
+        os.makedirs(path)
+    _CACHE_PATH['path'] = path
+
+
+def input_hash(prog, inp_dct):
+    """ hash of the program name and the name and contents
+        of each of the input files
+
+        :param prog: name of the program
+        :type prog: str
+        :param inp_dct: input file contents keyed by file name
+        :type inp_dct: dict[str: str]
+        :rtype: str
+    """
+    sha = hashlib.sha256(prog.encode('utf-8'))
+    for name in sorted(inp_dct):
+        sha.update(b'\0' + name.encode('utf-8') + b'\0')
+        sha.update(str(inp_dct[name]).encode('utf-8'))
+
+    return sha.hexdigest()
+
+
+def cached_output(prog, inp_dct, run_fxn, cache_if=bool):
+    """ return the parsed output of run_fxn(), which writes the inputs,
+        runs the program, and reads its output, or the output of a
+        previous run from the cache if the inputs are identical
+
+        :param prog: name of the program
+        :type prog: str
+        :param inp_dct: input file contents keyed by file name
+        :type inp_dct: dict[str: str]
+        :param run_fxn: function to run the program and parse the output
+        :param cache_if: function to check if an output should be cached
+    """
+
+    key = input_hash(prog, inp_dct)
+    cache_file = None
+    if _CACHE_PATH['path'] is not None:
+        cache_file = os.path.join(
+            _CACHE_PATH['path'], prog, key[:2], key + '.pickle')
+
+    # Read the output from memory or from the disk
+    if key in _MEM_CACHE:
+        print('Reading {} output from memory cache'.format(prog))
+        return copy.deepcopy(_MEM_CACHE[key])
+    if cache_file is not None and os.path.exists(cache_file):
+        print('Reading {} output from cache at {}'.format(prog, cache_file))
+        with open(cache_file, 'rb') as cfile:
+            _MEM_CACHE[key] = pickle.load(cfile)
+        return copy.deepcopy(_MEM_CACHE[key])
+
+    # Run the program and cache the output if it succeeded
+    ret = run_fxn()
+    if cache_if(ret):
+        _MEM_CACHE[key] = copy.deepcopy(ret)
+        if cache_file is not None:
+            _write_cache_file(cache_file, ret)
+
+    return ret
+
+
+def _write_cache_file(cache_file, ret):
+    """ write the output to the cache file through a temporary file,
+        so that concurrent runs never read a partially written file
+    """
+    cache_dir = os.path.dirname(cache_file)
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+    fdesc, tmp_file = tempfile.mkstemp(dir=cache_dir)
+    with os.fdopen(fdesc, 'wb') as cfile:
+        pickle.dump(ret, cfile)
+    os.replace(tmp_file, cache_file)
@@ -0,0 +1,87 @@
+""" Run independent jobs concurrently in a bounded pool of processes
+"""
+
+import os
+import warnings
+import multiprocessing
+from multiprocessing.connection import wait
+
+
+def nprocs_avail():
+    """ get the number of processors available to the current process
+    """
+    try:
+        nprocs = len(os.sched_getaffinity(0))
+    except AttributeError:
+        nprocs = os.cpu_count()
+
+    return max(nprocs, 1)
+
+
+def set_nprocs(nprocs):
+    """ bound the requested number of processes by what is available;
+        None or a non-positive number requests all available processors
+    """
+    navail = nprocs_avail()
+    if nprocs is None or nprocs < 1:
+        nprocs = navail
+
+    return min(nprocs, navail)
+
+
+def run_locked_procs(fxn, args_lst, lock_keys_lst=None, nprocs=None):
+    """ call fxn(*args) for every args in args_lst, each in its own process,
+        with at most nprocs processes running at once.
+
+        Jobs that share any key in lock_keys_lst are never run at the same
+        time, which keeps two workers from writing to the same parts of the
+        filesystem. Pending jobs are started in the order they are given
+        as soon as a process slot and their keys are free.
+
+        :param fxn: function to run for each job
+        :param args_lst: positional arguments for each call of fxn
+        :type args_lst: list(tuple)
+        :param lock_keys_lst: keys locked by each job while it runs
+        :type lock_keys_lst: list(set(str))
+        :param nprocs: maximum number of concurrent processes
+        :type nprocs: int
+        :returns: exit code of the process for each job, in input order
+        :rtype: tuple(int)
+    """
+
+    nprocs = set_nprocs(nprocs)
+    if lock_keys_lst is None:
+        lock_keys_lst = [set() for _ in args_lst]
+    assert len(lock_keys_lst) == len(args_lst)
+
+    pending = list(range(len(args_lst)))
+    running = {}
+    locked_keys = set()
+    exit_codes = [None for _ in args_lst]
+
+    while pending or running:
+
+        # Launch as many of the pending jobs as the slots and locks allow
+        for idx in list(pending):
+            if len(running) >= nprocs:
+                break
+            if locked_keys & set(lock_keys_lst[idx]):
+                continue
+            proc = multiprocessing.Process(target=fxn, args=args_lst[idx])
+            proc.start()
+            running[proc.sentinel] = (idx, proc)
+            locked_keys |= set(lock_keys_lst[idx])
+            pending.remove(idx)
+
+        # Wait for at least one job to finish and release its locks
+        for sentinel in wait(list(running.keys())):
+            idx, proc = running.pop(sentinel)
+            proc.join()
+            exit_codes[idx] = proc.exitcode
+            locked_keys -= set(lock_keys_lst[idx])
+            if proc.exitcode != 0:
+                warnings.warn(
+                    'process for job {} exited with code {}'.format(
+                        idx, proc.exitcode))
+
+    return tuple(exit_codes)
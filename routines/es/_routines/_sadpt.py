@@ -1,6 +1,11 @@
 """ Functions for sadpt
 """
 
+import os
+import signal
+import shutil
+import multiprocessing
+from multiprocessing.connection import wait
 import automol
 import autofile
 from autofile import fs
@@ -120,8 +125,14 @@ def scan_for_guess(rxn_typ, grid, dist_name, brk_name,
                    ts_zma, ts_info, mod_thy_info, thy_save_fs,
                    scn_run_fs, scn_save_fs, opt_script_str,
                    overwrite, update_guess, constraint_dct, scn_typ='relaxed',
+                   grid_search='full', grid_ethresh=0.1,
                    **opt_kwargs):
     """ saddle point scan code
+
+        grid_search='full' runs every point of the grid;
+        grid_search='adaptive' runs a coarse subset of a 1D grid and
+        refines it around the maximum until it is resolved to
+        grid_ethresh (kcal/mol). 2D grids are always run in full.
     """
 
     # Build grid and names appropriate for reaction type
@@ -132,26 +143,48 @@ def scan_for_guess(rxn_typ, grid, dist_name, brk_name,
         coord_grids = [grid]
         coord_names = [dist_name]
 
-    scan.run_scan(
-        zma=ts_zma,
-        spc_info=ts_info,
-        mod_thy_info=mod_thy_info,
-        thy_save_fs=thy_save_fs,
-        coord_names=coord_names,
-        coord_grids=coord_grids,
-        scn_run_fs=scn_run_fs,
-        scn_save_fs=scn_save_fs,
-        scn_typ=scn_typ,
-        script_str=opt_script_str,
-        overwrite=overwrite,
-        update_guess=update_guess,
-        reverse_sweep=False,
-        saddle=False,
-        constraint_dct=constraint_dct,
-        retryfail=False,
-        chkstab=False,
-        **opt_kwargs,
-        )
+    if grid_search == 'adaptive' and len(coord_names) == 1:
+        scan.run_adaptive_scan(
+            zma=ts_zma,
+            spc_info=ts_info,
+            mod_thy_info=mod_thy_info,
+            thy_save_fs=thy_save_fs,
+            coord_name=dist_name,
+            coord_grid=grid,
+            scn_run_fs=scn_run_fs,
+            scn_save_fs=scn_save_fs,
+            scn_typ=scn_typ,
+            script_str=opt_script_str,
+            overwrite=overwrite,
+            update_guess=update_guess,
+            saddle=False,
+            constraint_dct=constraint_dct,
+            retryfail=False,
+            chkstab=False,
+            ethresh=grid_ethresh,
+            **opt_kwargs,
+            )
+    else:
+        scan.run_scan(
+            zma=ts_zma,
+            spc_info=ts_info,
+            mod_thy_info=mod_thy_info,
+            thy_save_fs=thy_save_fs,
+            coord_names=coord_names,
+            coord_grids=coord_grids,
+            scn_run_fs=scn_run_fs,
+            scn_save_fs=scn_save_fs,
+            scn_typ=scn_typ,
+            script_str=opt_script_str,
+            overwrite=overwrite,
+            update_guess=update_guess,
+            reverse_sweep=False,
+            saddle=False,
+            constraint_dct=constraint_dct,
+            retryfail=False,
+            chkstab=False,
+            **opt_kwargs,
+            )
     if 'elimination' in rxn_typ:
         coo_names = [dist_name, brk_name]
     else:
@@ -181,7 +214,7 @@ def scan_for_guess(rxn_typ, grid, dist_name, brk_name,
         max_zma = rxngrid.find_max_2d(
             grid1, grid2, dist_name, brk_name, scn_save_fs,
             mod_thy_info, constraint_dct)
-        guess_zmas = [max_zma]
+        guess_zmas = [max_zma] if max_zma is not None else []
     else:
         guess_zmas = rxngrid.find_max_1d(
             rxn_typ, grid, ts_zma, dist_name, scn_save_fs,
@@ -251,6 +284,100 @@ def optimize_saddle_point(guess_zmas, ts_info, mod_thy_info,
     return opt_ret
 
 
+def race_saddle_point(guess_zmas, ts_info, mod_thy_info,
+                      run_fs, opt_script_str, script_str, overwrite,
+                      **opt_kwargs):
+    """ Optimize all of the guess zmas at once, each in its own run filesys,
+        and keep the first that converges to a saddle point verified by
+        its Hessian; the optimizations still running are then stopped
+        and the run directories of all other guesses removed
+    """
+
+    print('\nOptimizing {} guess Z-Matrices at once...'.format(
+        len(guess_zmas)))
+
+    # Launch the optimization and Hessian of each guess in its own process
+    guess_paths = [os.path.join(run_fs[0].path(), 'GUESS{}'.format(idx+1))
+                   for idx in range(len(guess_zmas))]
+    running = {}
+    ret = (None, None, [], [])
+    win_idx = None
+    try:
+        for idx, (zma, guess_path) in enumerate(zip(guess_zmas, guess_paths)):
+            proc = multiprocessing.Process(
+                target=_race_guess,
+                args=(zma, ts_info, mod_thy_info, autofile.fs.run(guess_path),
+                      opt_script_str, script_str, overwrite),
+                kwargs=opt_kwargs)
+            proc.start()
+            running[proc.sentinel] = (idx, proc)
+
+        # Check each guess as it finishes until one is a saddle point
+        while running and win_idx is None:
+            for sentinel in wait(list(running.keys())):
+                idx, proc = running.pop(sentinel)
+                proc.join()
+                guess_run_fs = autofile.fs.run(guess_paths[idx])
+                opt_success, opt_ret = es_runner.read_job(
+                    job='optimization', run_fs=guess_run_fs)
+                if opt_success:
+                    hess_ret, freqs, imags = saddle_point_hessian(
+                        opt_ret, ts_info, mod_thy_info,
+                        guess_run_fs, script_str, False, **opt_kwargs)
+                    if hess_ret is not None and saddle_point_checker(imags):
+                        print('Guess Z-Matrix {} converged'.format(idx+1),
+                              'to a saddle point')
+                        ret = (opt_ret, hess_ret, freqs, imags)
+                        win_idx = idx
+                        break
+                print('Guess Z-Matrix {} did not converge'.format(idx+1),
+                      'to a saddle point')
+    finally:
+        # Stop the other guesses, also if the race itself was interrupted
+        for idx, proc in running.values():
+            print('Stopping the optimization of guess Z-Matrix {}'.format(
+                idx+1))
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                proc.terminate()
+            proc.join()
+
+        # Clean up the run directories of all but the winning guess
+        for idx, guess_path in enumerate(guess_paths):
+            if idx != win_idx:
+                shutil.rmtree(guess_path, ignore_errors=True)
+
+    return ret
+
+
+def _race_guess(zma, ts_info, mod_thy_info, run_fs,
+                opt_script_str, script_str, overwrite, **opt_kwargs):
+    """ Optimize one guess zma and run the Hessian at the optimized
+        geometry, in a process group of its own so the electronic
+        structure program is stopped along with it
+    """
+
+    os.setpgrp()
+    es_runner.run_job(
+        job='optimization',
+        script_str=opt_script_str,
+        run_fs=run_fs,
+        geom=zma,
+        spc_info=ts_info,
+        thy_info=mod_thy_info,
+        saddle=True,
+        overwrite=overwrite,
+        **opt_kwargs,
+        )
+    opt_success, opt_ret = es_runner.read_job(
+        job='optimization', run_fs=run_fs)
+    if opt_success:
+        saddle_point_hessian(
+            opt_ret, ts_info, mod_thy_info,
+            run_fs, script_str, overwrite, **opt_kwargs)
+
+
 def saddle_point_hessian(opt_ret, ts_info, mod_thy_info,
                          run_fs, script_str, overwrite,
                          **opt_kwargs):
@@ -10,6 +10,7 @@ from lib.structure import tors as torsprep
 from lib.structure import instab
 from lib import filesys
 from lib.submission import qchem_params
+from lib.reaction import grid as rxngrid
 
 
 def run_scan(zma, spc_info, mod_thy_info, thy_save_fs,
@@ -25,17 +26,7 @@ def run_scan(zma, spc_info, mod_thy_info, thy_save_fs,
     """
 
     # Build the SCANS/CSCANS filesystems
-    if constraint_dct is None:
-        scn_save_fs[1].create([coord_names])
-        print('coord_grids test:', coord_grids)
-        inf_obj = autofile.schema.info_objects.scan_branch(
-            dict(zip(coord_names, coord_grids)))
-        scn_save_fs[1].file.info.write(inf_obj, [coord_names])
-    else:
-        scn_save_fs[1].create([constraint_dct])
-        inf_obj = autofile.schema.info_objects.scan_branch(
-            dict(zip(coord_names, coord_grids)))
-        scn_save_fs[1].file.info.write(inf_obj, [constraint_dct])
+    _write_scan_info(coord_names, coord_grids, scn_save_fs, constraint_dct)
 
     # Build the grid of values
     _, grid_vals = torsprep.set_scan_dims(coord_grids)
@@ -83,6 +74,177 @@ def run_scan(zma, spc_info, mod_thy_info, thy_save_fs,
         )
 
 
+def run_adaptive_scan(zma, spc_info, mod_thy_info, thy_save_fs,
+                      coord_name, coord_grid,
+                      scn_run_fs, scn_save_fs, scn_typ,
+                      script_str, overwrite,
+                      update_guess=True, saddle=False,
+                      constraint_dct=None, retryfail=True,
+                      chkstab=False, ethresh=0.1,
+                      **kwargs):
+    """ run a 1D scan searching for the energy maximum adaptively
+
+        A coarse subset of the grid is run first, then only the grid points
+        that narrow the bracket around the highest point found so far,
+        until the maximum is resolved to ethresh (kcal/mol) or its grid
+        neighbors have been run. Each point is saved as soon as it is run
+        so its energy can be read; with update_guess, each point starts
+        from the structure of the nearest point already saved.
+    """
+
+    # Build the SCANS/CSCANS filesystems
+    coord_names = [coord_name]
+    _write_scan_info(coord_names, [coord_grid], scn_save_fs, constraint_dct)
+
+    npoints = len(coord_grid)
+    enes = {}
+    idxs = rxngrid.coarse_grid_idxs(npoints)
+    while idxs:
+        print('\nRunning points {} of the {}-point grid...'.format(
+            ', '.join(str(idx+1) for idx in idxs), npoints))
+        for idx in idxs:
+            locs = _scan_locs(coord_names, [coord_grid[idx]], constraint_dct)
+
+            # Start from the nearest point that has a saved structure
+            guess_zma = zma
+            if update_guess:
+                done_idxs = [didx for didx, ene in enes.items()
+                             if ene is not None]
+                if done_idxs:
+                    near_idx = min(done_idxs, key=lambda x: abs(x - idx))
+                    guess_zma = scn_save_fs[-1].file.zmatrix.read(
+                        _scan_locs(coord_names, [coord_grid[near_idx]],
+                                   constraint_dct))
+
+            _run_scan(
+                guess_zma=guess_zma,
+                spc_info=spc_info,
+                mod_thy_info=mod_thy_info,
+                thy_save_fs=thy_save_fs,
+                coord_names=coord_names,
+                grid_vals=((coord_grid[idx],),),
+                scn_run_fs=scn_run_fs,
+                scn_save_fs=scn_save_fs,
+                scn_typ=scn_typ,
+                script_str=script_str,
+                overwrite=overwrite,
+                retryfail=retryfail,
+                update_guess=False,
+                saddle=saddle,
+                constraint_dct=constraint_dct,
+                chkstab=chkstab,
+                **kwargs
+            )
+            enes[idx] = _save_point(
+                scn_run_fs, scn_save_fs, locs, scn_typ, mod_thy_info)
+
+        idxs = rxngrid.refine_grid_idxs(enes, npoints, ethresh=ethresh)
+
+    print('\nMaximum resolved after running {} of the {} grid points'.format(
+        len(enes), npoints))
+
+
+def scan_jobs(zma, spc_info, mod_thy_info, thy_save_fs,
+              coord_names, coord_grids,
+              scn_run_fs, scn_save_fs, scn_typ,
+              script_str, overwrite,
+              scan_mode='wavefront', update_guess=True,
+              saddle=False,
+              constraint_dct=None, retryfail=True,
+              chkstab=False,
+              **kwargs):
+    """ build the jobs to run a scan concurrently with es_runner.run_jobs
+
+        For scan_mode='wavefront', the grid is split in two sweeps that
+        start at either end of the grid and meet in the middle, each point
+        seeded by the previous one of its sweep. For scan_mode='independent',
+        every grid point is its own job started from the input zma.
+        The jobs only write to the run filesystem; the scan needs to
+        be saved once they have finished.
+    """
+
+    # Build the SCANS/CSCANS filesystems
+    _write_scan_info(coord_names, coord_grids, scn_save_fs, constraint_dct)
+
+    # Build the grid of values and split it into the sweeps
+    _, grid_vals = torsprep.set_scan_dims(coord_grids)
+    grid_vals = tuple(grid_vals)
+    if scan_mode == 'independent':
+        sweeps = [(vals,) for vals in grid_vals]
+    else:
+        nhalf = (len(grid_vals) + 1) // 2
+        sweeps = [grid_vals[:nhalf], tuple(reversed(grid_vals[nhalf:]))]
+
+    jobs = []
+    for sweep in sweeps:
+        if sweep:
+            jobs.append(
+                (_run_scan,
+                 dict(guess_zma=zma,
+                      spc_info=spc_info,
+                      mod_thy_info=mod_thy_info,
+                      thy_save_fs=thy_save_fs,
+                      coord_names=coord_names,
+                      grid_vals=sweep,
+                      scn_run_fs=scn_run_fs,
+                      scn_save_fs=scn_save_fs,
+                      scn_typ=scn_typ,
+                      script_str=script_str,
+                      overwrite=overwrite,
+                      retryfail=retryfail,
+                      update_guess=update_guess,
+                      saddle=saddle,
+                      constraint_dct=constraint_dct,
+                      chkstab=chkstab,
+                      **kwargs)))
+
+    return jobs
+
+
+def _write_scan_info(coord_names, coord_grids, scn_save_fs, constraint_dct):
+    """ create the scan branch in the save filesys and write its info
+    """
+    if constraint_dct is None:
+        scn_save_fs[1].create([coord_names])
+        print('coord_grids test:', coord_grids)
+        inf_obj = autofile.schema.info_objects.scan_branch(
+            dict(zip(coord_names, coord_grids)))
+        scn_save_fs[1].file.info.write(inf_obj, [coord_names])
+    else:
+        scn_save_fs[1].create([constraint_dct])
+        inf_obj = autofile.schema.info_objects.scan_branch(
+            dict(zip(coord_names, coord_grids)))
+        scn_save_fs[1].file.info.write(inf_obj, [constraint_dct])
+
+
+def _scan_locs(coord_names, vals, constraint_dct):
+    """ locs of a point of a scan
+    """
+    locs = [coord_names, vals]
+    if constraint_dct is not None:
+        locs = [constraint_dct] + locs
+    return locs
+
+
+def _save_point(scn_run_fs, scn_save_fs, locs, scn_typ, mod_thy_info):
+    """ save a point of a scan that has been run and read its energy,
+        None if the point could not be run
+    """
+
+    run_fs = autofile.fs.run(scn_run_fs[-1].path(locs))
+    filesys.save_struct(
+        run_fs, scn_save_fs, locs, _set_job(scn_typ),
+        mod_thy_info, in_zma_fs=True)
+
+    ene = None
+    if scn_save_fs[-1].exists(locs):
+        sp_save_fs = autofile.fs.single_point(scn_save_fs[-1].path(locs))
+        if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
+            ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
+
+    return ene
+
+
 def _run_scan(guess_zma, spc_info, mod_thy_info, thy_save_fs,
               coord_names, grid_vals,
               scn_run_fs, scn_save_fs, scn_typ,
@@ -318,32 +480,88 @@ def run_two_way_scan(ts_zma, ts_info, mod_var_scn_thy_info,
                      saddle=False,
                      constraint_dct=None,
                      retryfail=False,
+                     ncores=1, mem=None,
                      **opt_kwargs):
-    """ Run a two-part scan that goes into two directions, as for rxn path
+    """ Run a two-part scan that goes into two directions, as for rxn path;
+        the two directions are run concurrently if ncores allows for it
+    """
+
+    jobs = two_way_scan_jobs(
+        ts_zma, ts_info, mod_var_scn_thy_info,
+        grid1, grid2, coord_name,
+        thy_save_fs,
+        scn_run_fs, scn_save_fs,
+        opt_script_str, overwrite,
+        update_guess=update_guess,
+        reverse_sweep=reverse_sweep,
+        saddle=saddle,
+        constraint_dct=constraint_dct,
+        retryfail=retryfail,
+        **opt_kwargs)
+    es_runner.run_jobs(jobs, ncores=ncores, mem=mem)
+
+    save_two_way_scan(
+        scn_run_fs, scn_save_fs, coord_name,
+        mod_var_scn_thy_info, constraint_dct=constraint_dct)
+
+
+def two_way_scan_jobs(ts_zma, ts_info, mod_var_scn_thy_info,
+                      grid1, grid2, coord_name,
+                      thy_save_fs,
+                      scn_run_fs, scn_save_fs,
+                      opt_script_str, overwrite,
+                      update_guess=True,
+                      reverse_sweep=True,
+                      saddle=False,
+                      constraint_dct=None,
+                      retryfail=False,
+                      **opt_kwargs):
+    """ build the jobs to run a two-way scan with es_runner.run_jobs,
+        one lane for each direction: each lane starts from ts_zma and
+        runs its points in order, each seeded by the previous one of the
+        lane if update_guess, followed by the reverse sweep if requested
     """
 
-    # Setup and run the first part of the scan to shorter distances
+    jobs = []
     for grid in (grid1, grid2):
-        run_scan(
-            zma=ts_zma,
-            spc_info=ts_info,
-            mod_thy_info=mod_var_scn_thy_info,
-            thy_save_fs=thy_save_fs,
-            coord_names=[coord_name],
-            coord_grids=[grid],
-            scn_run_fs=scn_run_fs,
-            scn_save_fs=scn_save_fs,
-            scn_typ='relaxed',
-            script_str=opt_script_str,
-            overwrite=overwrite,
-            update_guess=update_guess,
-            reverse_sweep=reverse_sweep,
-            saddle=saddle,
-            constraint_dct=constraint_dct,
-            retryfail=retryfail,
-            chkstab=False,
-            **opt_kwargs
-        )
+
+        # Build the SCANS/CSCANS filesystems
+        _write_scan_info(
+            [coord_name], [grid], scn_save_fs, constraint_dct)
+
+        # Set the sweeps of the lane
+        _, grid_vals = torsprep.set_scan_dims([grid])
+        sweeps = [tuple(grid_vals)]
+        if reverse_sweep:
+            sweeps.append(tuple(reversed(grid_vals)))
+
+        jobs.append(
+            (_run_sweeps,
+             dict(sweeps=sweeps,
+                  guess_zma=ts_zma,
+                  spc_info=ts_info,
+                  mod_thy_info=mod_var_scn_thy_info,
+                  thy_save_fs=thy_save_fs,
+                  coord_names=[coord_name],
+                  scn_run_fs=scn_run_fs,
+                  scn_save_fs=scn_save_fs,
+                  scn_typ='relaxed',
+                  script_str=opt_script_str,
+                  overwrite=overwrite,
+                  retryfail=retryfail,
+                  update_guess=update_guess,
+                  saddle=saddle,
+                  constraint_dct=constraint_dct,
+                  chkstab=False,
+                  **opt_kwargs)))
+
+    return jobs
+
+
+def save_two_way_scan(scn_run_fs, scn_save_fs, coord_name,
+                      mod_var_scn_thy_info, constraint_dct=None):
+    """ save the points of a two-way scan that have been run
+    """
 
     print('\nSaving the scans...')
     if constraint_dct is None:
@@ -364,6 +582,13 @@ def run_two_way_scan(ts_zma, ts_info, mod_var_scn_thy_info,
             in_zma_fs=True)
 
 
+def _run_sweeps(sweeps, **kwargs):
+    """ run several sweeps of a scan one after the other
+    """
+    for grid_vals in sweeps:
+        _run_scan(grid_vals=grid_vals, **kwargs)
+
+
 # DERIVED FUNCTION FOR MULTIREFERENCE SCAN CALCULATIONS
 def multiref_rscan(ts_zma, ts_info,
                    grid1, grid2, coord_name,
@@ -372,18 +597,45 @@ def multiref_rscan(ts_zma, ts_info,
                    scn_run_fs, scn_save_fs,
                    overwrite, update_guess=True,
                    constraint_dct=None,
+                   ncores=1, mem=None,
                    **cas_kwargs):
     """ run constrained optimization scan
     """
 
+    jobs = multiref_rscan_jobs(
+        ts_zma, ts_info,
+        grid1, grid2, coord_name,
+        mod_var_scn_thy_info,
+        vscnlvl_thy_save_fs,
+        scn_run_fs, scn_save_fs,
+        overwrite, update_guess=update_guess,
+        constraint_dct=constraint_dct,
+        **cas_kwargs)
+    es_runner.run_jobs(jobs, ncores=ncores, mem=mem)
+
+    save_two_way_scan(
+        scn_run_fs, scn_save_fs, coord_name,
+        mod_var_scn_thy_info, constraint_dct=constraint_dct)
+
+
+def multiref_rscan_jobs(ts_zma, ts_info,
+                        grid1, grid2, coord_name,
+                        mod_var_scn_thy_info,
+                        vscnlvl_thy_save_fs,
+                        scn_run_fs, scn_save_fs,
+                        overwrite, update_guess=True,
+                        constraint_dct=None,
+                        **cas_kwargs):
+    """ build the jobs of a multireference two-way scan
+    """
+
     # Set the opt script string and build the opt_kwargs
     [prog, method, _, _] = mod_var_scn_thy_info
     _, opt_script_str, _, opt_kwargs = qchem_params(
         prog, method)
     opt_kwargs.update(cas_kwargs)
 
-    # Run the scans
-    run_two_way_scan(
+    return two_way_scan_jobs(
         ts_zma, ts_info, mod_var_scn_thy_info,
         grid1, grid2, coord_name,
         vscnlvl_thy_save_fs,
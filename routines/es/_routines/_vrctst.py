@@ -29,7 +29,8 @@ def calc_vrctst_flux(ini_zma, ts_info, hs_info,
                      vscnlvl_ts_run_fs,
                      vscnlvl_scn_run_fs, vscnlvl_scn_save_fs,
                      vscnlvl_cscn_run_fs, vscnlvl_cscn_save_fs,
-                     overwrite, update_guess):
+                     overwrite, update_guess,
+                     ncores=1, mem=None):
     """ Set up n VRC-TST calculations to get the flux file
     """
 
@@ -67,7 +68,8 @@ def calc_vrctst_flux(ini_zma, ts_info, hs_info,
         vscnlvl_thy_save_fs,
         overwrite, update_guess,
         vrc_dct, vrc_path,
-        cas_kwargs)
+        cas_kwargs,
+        ncores=ncores, mem=mem)
 
     # Write remaining VaReCoF input files
     _write_varecof_input(zma_for_inp, ts_info, ts_formula, high_mul,
@@ -99,7 +101,8 @@ def _build_correction_potential(ts_info, hs_info, ref_zma,
                                 vscnlvl_thy_save_fs,
                                 overwrite, update_guess,
                                 vrc_dct, vrc_path,
-                                cas_kwargs):
+                                cas_kwargs,
+                                ncores=1, mem=None):
     """  use the MEP potentials to compile the correction potential .so file
     """
 
@@ -116,7 +119,8 @@ def _build_correction_potential(ts_info, hs_info, ref_zma,
                     overwrite, update_guess,
                     constraint_dct,
                     cas_kwargs,
-                    sp_thy_info=mod_var_sp1_thy_info)
+                    sp_thy_info=mod_var_sp1_thy_info,
+                    ncores=ncores, mem=mem)
 
     # Calculate and store the infinite separation energy
     # max_grid = max([max(grid1), max(grid2)])
@@ -216,21 +220,21 @@ def _run_potentials(inf_sep_zma, ts_info,
                     overwrite, update_guess,
                     constraint_dct,
                     cas_kwargs,
-                    sp_thy_info=None):
+                    sp_thy_info=None,
+                    ncores=1, mem=None):
     """ Run and save the scan along both grids while
-          (1) constraining only reaction coordinate, then
-          (2) constraining all intermolecular coordinates
+          (1) constraining only reaction coordinate, and
+          (2) constraining all intermolecular coordinates;
+        the two directions of the two scans are independent lanes
+        that are run concurrently if ncores allows for it
     """
 
-    for constraints in (None, constraint_dct):
-        if constraints is None:
-            scn_run_fs, scn_save_fs = vscnlvl_scn_run_fs, vscnlvl_scn_save_fs
-            print('\nRunning full scans..')
-        else:
-            scn_run_fs, scn_save_fs = vscnlvl_cscn_run_fs, vscnlvl_cscn_save_fs
-            print('\nRunning constrained scans..')
-
-        scan.multiref_rscan(
+    # Build the lanes of both scans, one for each direction
+    scn_fss = ((None, vscnlvl_scn_run_fs, vscnlvl_scn_save_fs),
+               (constraint_dct, vscnlvl_cscn_run_fs, vscnlvl_cscn_save_fs))
+    jobs = []
+    for constraints, scn_run_fs, scn_save_fs in scn_fss:
+        jobs.extend(scan.multiref_rscan_jobs(
             ts_zma=inf_sep_zma,
             ts_info=ts_info,
             grid1=grid1,
@@ -244,20 +248,28 @@ def _run_potentials(inf_sep_zma, ts_info,
             update_guess=update_guess,
             constraint_dct=constraints,
             **cas_kwargs
-        )
+        ))
+
+    # Run the full and constrained scans, concurrently if possible
+    print('\nRunning full and constrained scans..')
+    es_runner.run_jobs(jobs, ncores=ncores, mem=mem)
+    for constraints, scn_run_fs, scn_save_fs in scn_fss:
+        scan.save_two_way_scan(
+            scn_run_fs, scn_save_fs, coord_name,
+            mod_var_scn_thy_info, constraint_dct=constraints)
 
     # Run the single points on top of the initial scan
     if sp_thy_info is not None:
         _scan_sp(ts_info, coord_name,
                  vscnlvl_scn_run_fs, vscnlvl_scn_save_fs,
                  sp_thy_info, overwrite,
-                 cas_kwargs)
+                 cas_kwargs, ncores=ncores, mem=mem)
 
 
 def _scan_sp(ts_info, coord_name,
              vscnlvl_scn_run_fs, vscnlvl_scn_save_fs,
              mod_var_sp1_thy_info, overwrite,
-             cas_kwargs):
+             cas_kwargs, ncores=1, mem=None):
     """ get sps for the scan; cas options and gen lines should be same
     """
 
@@ -267,21 +279,12 @@ def _scan_sp(ts_info, coord_name,
     sp_kwargs.update(cas_kwargs)
 
     # Compute the single-point energies along the scan
-    for locs in vscnlvl_scn_save_fs[-1].existing([[coord_name]]):
-
-        # Set up single point filesys
-        vscnlvl_scn_run_fs[-1].create(locs)
-        geo_run_path = vscnlvl_scn_run_fs[-1].path(locs)
-        geo_save_path = vscnlvl_scn_save_fs[-1].path(locs)
-        geo = vscnlvl_scn_save_fs[-1].file.geometry.read(locs)
-        zma = vscnlvl_scn_save_fs[-1].file.zmatrix.read(locs)
-
-        # Run the energy
-        sp.run_energy(zma, geo, ts_info, mod_var_sp1_thy_info,
-                      vscnlvl_scn_save_fs,
-                      geo_run_path, geo_save_path, locs,
-                      script_str, overwrite,
-                      highspin=False, **sp_kwargs)
+    sp.run_scan_batch(
+        'energy', vscnlvl_scn_save_fs[-1].existing([[coord_name]]),
+        ts_info, mod_var_sp1_thy_info,
+        vscnlvl_scn_run_fs, vscnlvl_scn_save_fs,
+        script_str, overwrite,
+        ncores=ncores, mem=mem, **sp_kwargs)
 
 
 def _read_potentials(scn_save_fs, cscn_save_fs,
@@ -28,7 +28,8 @@ def radrad_scan(ts_zma, ts_info, hs_info,
                 pot_thresh,
                 overwrite, update_guess,
                 constraint_dct=None,
-                zma_locs=(0,)):
+                zma_locs=(0,),
+                ncores=1, mem=None):
     """ Run the scan for VTST calculations
     """
 
@@ -52,6 +53,7 @@ def radrad_scan(ts_zma, ts_info, hs_info,
         overwrite=overwrite,
         update_guess=update_guess,
         constraint_dct=constraint_dct,
+        ncores=ncores, mem=mem,
         **cas_kwargs
     )
 
@@ -90,7 +92,7 @@ def radrad_scan(ts_zma, ts_info, hs_info,
         _vtst_hess_ene(ts_info, coord_name,
                        mod_var_scn_thy_info, mod_var_sp1_thy_info,
                        scn_save_fs, scn_run_fs,
-                       overwrite, **cas_kwargs)
+                       overwrite, ncores=ncores, mem=mem, **cas_kwargs)
 
 
 def molrad_scan(ts_zma, ts_info,
@@ -101,7 +103,8 @@ def molrad_scan(ts_zma, ts_info,
                 ts_save_fs,
                 scn_run_fs, scn_save_fs,
                 overwrite, update_guess, retryfail,
-                zma_locs=(0,)):
+                zma_locs=(0,),
+                ncores=1, mem=None):
     """ Run the scan for VTST calculations
     """
 
@@ -129,6 +132,7 @@ def molrad_scan(ts_zma, ts_info,
         saddle=False,   # opts along scan are min, not sadpt opts
         constraint_dct=None,
         retryfail=retryfail,
+        ncores=ncores, mem=mem,
         **opt_kwargs
     )
 
@@ -147,13 +151,13 @@ def molrad_scan(ts_zma, ts_info,
     _vtst_hess_ene(ts_info, coord_name,
                    mod_thy_info, mod_vsp1_thy_info,
                    scn_save_fs, scn_run_fs,
-                   overwrite, **{})
+                   overwrite, ncores=ncores, mem=mem)
 
 
 def _vtst_hess_ene(ts_info, coord_name,
                    mod_thy_info, mod_vsp1_thy_info,
                    scn_save_fs, scn_run_fs,
-                   overwrite, **cas_kwargs):
+                   overwrite, ncores=1, mem=None, **cas_kwargs):
     """ VTST Hessians and Energies
     """
 
@@ -164,30 +168,22 @@ def _vtst_hess_ene(ts_info, coord_name,
     hess_script_str, _, hess_kwargs, _ = qchem_params(
         *mod_thy_info[0:2])
     hess_kwargs.update(cas_kwargs)
-    for locs in scn_locs:
-        geo_run_path = scn_run_fs[-1].path(locs)
-        geo_save_path = scn_save_fs[-1].path(locs)
-        scn_run_fs[-1].create(locs)
-        zma, geo = filesys.inf.cnf_fs_zma_geo(scn_save_fs, locs)
-        sp.run_hessian(zma, geo, ts_info, mod_thy_info,
-                       scn_save_fs, geo_run_path, geo_save_path, locs,
-                       hess_script_str, overwrite, **hess_kwargs)
-        sp.run_gradient(zma, geo, ts_info, mod_thy_info,
-                        scn_save_fs, geo_run_path, geo_save_path, locs,
-                        hess_script_str, overwrite, **hess_kwargs)
+    for job in ('hess', 'grad'):
+        sp.run_scan_batch(
+            job, scn_locs, ts_info, mod_thy_info,
+            scn_run_fs, scn_save_fs,
+            hess_script_str, overwrite,
+            ncores=ncores, mem=mem, **hess_kwargs)
 
     print('\n Running Energies...')
     script_str, _, ene_kwargs, _ = qchem_params(
         *mod_vsp1_thy_info[0:2])
     ene_kwargs.update(cas_kwargs)
-    for locs in scn_locs:
-        geo_run_path = scn_run_fs[-1].path(locs)
-        geo_save_path = scn_save_fs[-1].path(locs)
-        scn_run_fs[-1].create(locs)
-        zma, geo = filesys.inf.cnf_fs_zma_geo(scn_save_fs, locs)
-        sp.run_energy(zma, geo, ts_info, mod_vsp1_thy_info,
-                      scn_save_fs, geo_run_path, geo_save_path, locs,
-                      script_str, overwrite, **ene_kwargs)
+    sp.run_scan_batch(
+        'energy', scn_locs, ts_info, mod_vsp1_thy_info,
+        scn_run_fs, scn_save_fs,
+        script_str, overwrite,
+        ncores=ncores, mem=mem, **ene_kwargs)
 
 
 def _save_traj(ts_zma, frm_bnd_keys, rcts_gra, ts_save_fs, zma_locs=(0,)):
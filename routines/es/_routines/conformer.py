@@ -21,7 +21,7 @@ def conformer_sampling(zma, spc_info,
                        saddle=False, nsamp_par=(False, 3, 3, 1, 50, 50),
                        tors_names='',
                        two_stage=False, retryfail=True,
-                       rxn_class='', **kwargs):
+                       rxn_class='', ncores=1, mem=None, **kwargs):
     """ Find the minimum energy conformer by optimizing from nsamp random
     initial torsional states
     """
@@ -71,6 +71,8 @@ def conformer_sampling(zma, spc_info,
         saddle=saddle,
         two_stage=two_stage,
         retryfail=retryfail,
+        ncores=ncores,
+        mem=mem,
         **kwargs,
     )
 
@@ -167,8 +169,13 @@ def run_conformers(
         zma, spc_info, thy_info, nsamp, tors_range_dct,
         cnf_run_fs, cnf_save_fs, script_str, overwrite,
         saddle, two_stage, retryfail,
+        ncores=1, mem=None,
         **kwargs):
     """ run sampling algorithm to find conformers
+
+        If the ncores budget allows for more than one job, all of the
+        remaining samples are generated up front and optimized
+        concurrently through the job queue.
     """
     if not tors_range_dct:
         print(" - No torsional coordinates. Setting nsamp to 1.")
@@ -185,14 +192,7 @@ def run_conformers(
     # cnf_save_fs[0].file.vmatrix.write(vma)
     nsamp0 = nsamp
     inf_obj = autofile.schema.info_objects.conformer_trunk(0)
-    if cnf_save_fs[0].file.info2.exists():
-        inf_obj_s = cnf_save_fs[0].file.info2.read()
-        nsampd = inf_obj_s.nsamp
-    elif cnf_run_fs[0].file.info2.exists():
-        inf_obj_r = cnf_run_fs[0].file.info2.read()
-        nsampd = inf_obj_r.nsamp
-    else:
-        nsampd = 0
+    nsampd = _read_nsampd(cnf_run_fs, cnf_save_fs)
 
     tot_samp = nsamp - nsampd
     print(' - Number of samples that have been currently run:', nsampd)
@@ -200,82 +200,140 @@ def run_conformers(
 
     if nsamp-nsampd > 0:
         print('\nRunning {} samples...'.format(nsamp-nsampd))
-    samp_idx = 1
-    while True:
-        nsamp = nsamp0 - nsampd
-        # Break the while loop if enough sampls completed
-        if nsamp <= 0:
-            print('Requested number of samples have been completed. '
-                  'Conformer search complete.')
-            break
-
-        # Run the conformer sampling
-        if nsampd > 0:
-            samp_zma, = automol.zmatrix.samples(zma, 1, tors_range_dct)
-        else:
+    tors_names = list(tors_range_dct.keys())
+
+    if tot_samp <= 0:
+        print('Requested number of samples have been completed. '
+              'Conformer search complete.')
+    elif ncores is not None and ncores > 1:
+
+        # Generate all of the samples that still need to be run
+        samp_zmas = _sample_zmas(
+            zma, tors_range_dct, tot_samp, include_ref=(nsampd == 0))
+
+        # Set the optimization jobs for each of the samples
+        jobs = []
+        for samp_zma in samp_zmas:
+            locs = [autofile.schema.generate_new_conformer_id()]
+            cnf_run_fs[-1].create(locs)
+            cnf_run_path = cnf_run_fs[-1].path(locs)
+            run_fs = autofile.fs.run(cnf_run_path)
+            jobs.append(
+                (_optimize_sample,
+                 dict(samp_zma=samp_zma,
+                      spc_info=spc_info,
+                      thy_info=thy_info,
+                      run_fs=run_fs,
+                      script_str=script_str,
+                      overwrite=overwrite,
+                      saddle=saddle,
+                      two_stage=two_stage,
+                      tors_names=tors_names,
+                      retryfail=retryfail,
+                      **kwargs)))
+
+        # Run the samples and update the sample count as each one finishes
+        def _count_sample(_):
+            _update_nsampd(inf_obj, cnf_run_fs, cnf_save_fs)
+
+        es_runner.run_jobs(
+            jobs, ncores=ncores, mem=mem, read_fxn=_count_sample)
+
+    else:
+
+        samp_idx = 1
+        while True:
+            nsamp = nsamp0 - nsampd
+            # Break the while loop if enough sampls completed
+            if nsamp <= 0:
+                print('Requested number of samples have been completed. '
+                      'Conformer search complete.')
+                break
+
+            # Run the conformer sampling
+            samp_zma, = _sample_zmas(
+                zma, tors_range_dct, 1, include_ref=(nsampd == 0))
+
+            cid = autofile.schema.generate_new_conformer_id()
+            locs = [cid]
+
+            cnf_run_fs[-1].create(locs)
+            cnf_run_path = cnf_run_fs[-1].path(locs)
+            run_fs = autofile.fs.run(cnf_run_path)
+
+            print("Run {}/{}".format(samp_idx, tot_samp))
+            _optimize_sample(
+                samp_zma, spc_info, thy_info, run_fs,
+                script_str, overwrite, saddle,
+                two_stage, tors_names, retryfail,
+                **kwargs)
+
+            nsampd = _update_nsampd(inf_obj, cnf_run_fs, cnf_save_fs)
+            samp_idx += 1
+
+
+def _sample_zmas(zma, tors_range_dct, nsamp, include_ref=False):
+    """ generate nsamp sample z-matrices with low repulsion by randomly
+        sampling the torsions of the reference z-matrix, which is used
+        as the first sample if requested
+    """
+
+    samp_zmas = []
+    for idx in range(nsamp):
+
+        if include_ref and idx == 0:
             samp_zma = zma
+        else:
+            samp_zma, = automol.zmatrix.samples(zma, 1, tors_range_dct)
 
         print('\nChecking if ZMA has high repulsion...')
-        # print('zma tests:',
-        #         automol.zmatrix.string(zma), automol.zmatrix.string(zma))
         bad_geom_count = 0
         while (not automol.intmol.low_repulsion_struct(zma, samp_zma) and
                bad_geom_count < 1000):
             print('  ZMA has high repulsion.')
-            # print('  Bad geometry:')
-            # print(automol.geom.string(automol.zmatrix.geometry(samp_zma)))
             print('\n  Generating new sample ZMA')
             samp_zma, = automol.zmatrix.samples(zma, 1, tors_range_dct)
             bad_geom_count += 1
         print('  ZMA is fine...')
 
-        cid = autofile.schema.generate_new_conformer_id()
-        locs = [cid]
+        samp_zmas.append(samp_zma)
 
-        cnf_run_fs[-1].create(locs)
-        cnf_run_path = cnf_run_fs[-1].path(locs)
-        run_fs = autofile.fs.run(cnf_run_path)
+    return samp_zmas
 
-        print("Run {}/{}".format(samp_idx, tot_samp))
-        tors_names = list(tors_range_dct.keys())
-        if two_stage and tors_names:
-            print('Stage one beginning, holding the coordinates constant',
-                  tors_names)
-            es_runner.run_job(
-                job=elstruct.Job.OPTIMIZATION,
-                script_str=script_str,
-                run_fs=run_fs,
-                geom=samp_zma,
-                spc_info=spc_info,
-                thy_info=thy_info,
-                overwrite=overwrite,
-                frozen_coordinates=[tors_names],
-                saddle=saddle,
-                retryfail=retryfail,
-                **kwargs
-            )
-            # print('Stage one success, reading for stage 2')
-            success, ret = es_runner.read_job(
-                job=elstruct.Job.OPTIMIZATION, run_fs=run_fs)
-            if success:
-                sinf_obj, _, out_str = ret
-                prog = sinf_obj.prog
-                samp_zma = elstruct.reader.opt_zmatrix(prog, out_str)
-                print('Stage one success beginning stage two')
-                # print('Stage one success beginning stage two on', samp_zma)
-                es_runner.run_job(
-                    job=elstruct.Job.OPTIMIZATION,
-                    script_str=script_str,
-                    run_fs=run_fs,
-                    geom=samp_zma,
-                    spc_info=spc_info,
-                    thy_info=thy_info,
-                    overwrite=overwrite,
-                    saddle=saddle,
-                    retryfail=False,
-                    **kwargs
-                )
-        else:
+
+def _optimize_sample(samp_zma, spc_info, thy_info, run_fs,
+                     script_str, overwrite, saddle,
+                     two_stage, tors_names, retryfail,
+                     **kwargs):
+    """ optimize a single conformer sample; for two-stage runs the
+        torsions are held fixed for a first optimization
+    """
+
+    if two_stage and tors_names:
+        print('Stage one beginning, holding the coordinates constant',
+              tors_names)
+        es_runner.run_job(
+            job=elstruct.Job.OPTIMIZATION,
+            script_str=script_str,
+            run_fs=run_fs,
+            geom=samp_zma,
+            spc_info=spc_info,
+            thy_info=thy_info,
+            overwrite=overwrite,
+            frozen_coordinates=[tors_names],
+            saddle=saddle,
+            retryfail=retryfail,
+            **kwargs
+        )
+        # print('Stage one success, reading for stage 2')
+        success, ret = es_runner.read_job(
+            job=elstruct.Job.OPTIMIZATION, run_fs=run_fs)
+        if success:
+            sinf_obj, _, out_str = ret
+            prog = sinf_obj.prog
+            samp_zma = elstruct.reader.opt_zmatrix(prog, out_str)
+            print('Stage one success beginning stage two')
+            # print('Stage one success beginning stage two on', samp_zma)
             es_runner.run_job(
                 job=elstruct.Job.OPTIMIZATION,
                 script_str=script_str,
@@ -285,21 +343,51 @@ def run_conformers(
                 thy_info=thy_info,
                 overwrite=overwrite,
                 saddle=saddle,
-                retryfail=retryfail,
+                retryfail=False,
                 **kwargs
             )
+    else:
+        es_runner.run_job(
+            job=elstruct.Job.OPTIMIZATION,
+            script_str=script_str,
+            run_fs=run_fs,
+            geom=samp_zma,
+            spc_info=spc_info,
+            thy_info=thy_info,
+            overwrite=overwrite,
+            saddle=saddle,
+            retryfail=retryfail,
+            **kwargs
+        )
+
+
+def _read_nsampd(cnf_run_fs, cnf_save_fs):
+    """ read the number of samples that have been run from the
+        save filesystem, or from the run filesystem if it is not there
+    """
+
+    if cnf_save_fs[0].file.info2.exists():
+        inf_obj_s = cnf_save_fs[0].file.info2.read()
+        nsampd = inf_obj_s.nsamp
+    elif cnf_run_fs[0].file.info2.exists():
+        inf_obj_r = cnf_run_fs[0].file.info2.read()
+        nsampd = inf_obj_r.nsamp
+    else:
+        nsampd = 0
+
+    return nsampd
+
+
+def _update_nsampd(inf_obj, cnf_run_fs, cnf_save_fs):
+    """ add a finished sample to the count in the run and save filesystems
+    """
+
+    nsampd = _read_nsampd(cnf_run_fs, cnf_save_fs) + 1
+    inf_obj.nsamp = nsampd
+    cnf_save_fs[0].file.info2.write(inf_obj)
+    cnf_run_fs[0].file.info2.write(inf_obj)
 
-        if cnf_save_fs[0].file.info2.exists():
-            inf_obj_s = cnf_save_fs[0].file.info2.read()
-            nsampd = inf_obj_s.nsamp
-        elif cnf_run_fs[0].file.info2.exists():
-            inf_obj_r = cnf_run_fs[0].file.info2.read()
-            nsampd = inf_obj_r.nsamp
-        nsampd += 1
-        samp_idx += 1
-        inf_obj.nsamp = nsampd
-        cnf_save_fs[0].file.info2.write(inf_obj)
-        cnf_run_fs[0].file.info2.write(inf_obj)
+    return nsampd
 
 
 def save_conformers(cnf_run_fs, cnf_save_fs, thy_info, saddle=False,
@@ -742,6 +830,7 @@ def _save_unique_conformer(ret, thy_info, cnf_save_fs, locs,
     sp_save_fs[-1].file.input.write(inp_str, thy_info[1:4])
     sp_save_fs[-1].file.info.write(inf_obj, thy_info[1:4])
     sp_save_fs[-1].file.energy.write(ene, thy_info[1:4])
+    filesys.mincnf.clear_ladders(cnf_save_path)
 
 
 def _save_sym_indistinct_conformer(geo, cnf_save_fs,
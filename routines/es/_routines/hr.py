@@ -3,6 +3,7 @@
 
 import itertools
 from routines.es._routines import _scan as scan
+from routines.es import runner as es_runner
 from lib import filesys
 from lib.structure import tors as torsprep
 
@@ -14,8 +15,14 @@ def hindered_rotor_scans(
         script_str, overwrite,
         scn_typ='relaxed',
         saddle=False, const_names=None,
-        retryfail=True, chkstab=None, **opt_kwargs):
+        retryfail=True, chkstab=None,
+        ncores=1, mem=None, scan_mode='wavefront', **opt_kwargs):
     """ Perform scans over each of the torsional coordinates
+
+        If the ncores budget allows for it, the grid points of all of the
+        rotors are run concurrently, either as two sweeps from both ends
+        of each grid (scan_mode='wavefront') or as independent optimizations
+        from the reference zma (scan_mode='independent').
     """
 
     # Set appropriate value for check stability
@@ -30,39 +37,68 @@ def hindered_rotor_scans(
         if set(list(itertools.chain(*run_tors_names))) == set(const_names):
             print('\nUser requested all torsions of system will be fixed.')
 
-    # for tors_name, tors_grid in zip(tors_names, tors_grids):
+    # Set the constraints and filesystems for each of the rotors
+    rotor_lst = []
     for tors_names, tors_grids in zip(run_tors_names, run_tors_grids):
-
-        print('\nRunning Rotor: {}...'.format(tors_names))
-
-        # Setting the constraints
         constraint_dct = torsprep.build_constraint_dct(
             zma, const_names, tors_names)
-
-        # Setting the filesystem
-        # print('hr constraint dct', constraint_dct)
         scn_run_fs = filesys.build.scn_fs_from_cnf(
             zma_run_path, constraint_dct=constraint_dct)
         scn_save_fs = filesys.build.scn_fs_from_cnf(
             zma_save_path, constraint_dct=constraint_dct)
+        rotor_lst.append(
+            (tors_names, tors_grids, constraint_dct, scn_run_fs, scn_save_fs))
+
+    if ncores is not None and ncores > 1:
 
         print('\nSaving any HR in run filesys...')
-        if constraint_dct is None:
-            scan.save_scan(
+        for tors_names, _, const_dct, scn_run_fs, scn_save_fs in rotor_lst:
+            _save_hr_scan(scn_run_fs, scn_save_fs, scn_typ,
+                          tors_names, const_dct, mod_thy_info)
+
+        print('\nRunning any HR Scans for all rotors concurrently...')
+        jobs = []
+        for rotor in rotor_lst:
+            tors_names, tors_grids, constraint_dct = rotor[:3]
+            scn_run_fs, scn_save_fs = rotor[3:]
+            jobs.extend(scan.scan_jobs(
+                zma=zma,
+                spc_info=spc_info,
+                mod_thy_info=mod_thy_info,
+                thy_save_fs=thy_save_fs,
+                coord_names=tors_names,
+                coord_grids=tors_grids,
                 scn_run_fs=scn_run_fs,
                 scn_save_fs=scn_save_fs,
                 scn_typ=scn_typ,
-                coo_names=tors_names,
-                mod_thy_info=mod_thy_info,
-                in_zma_fs=True)
-        else:
-            scan.save_cscan(
-                cscn_run_fs=scn_run_fs,
-                cscn_save_fs=scn_save_fs,
-                scn_typ=scn_typ,
+                script_str=script_str,
+                overwrite=overwrite,
+                scan_mode=scan_mode,
+                update_guess=True,
+                saddle=saddle,
                 constraint_dct=constraint_dct,
-                mod_thy_info=mod_thy_info,
-                in_zma_fs=True)
+                retryfail=retryfail,
+                chkstab=chkstab,
+                **opt_kwargs
+            ))
+        es_runner.run_jobs(jobs, ncores=ncores, mem=mem)
+
+        print('\nSaving any newly run HR scans in run filesys...')
+        for tors_names, _, const_dct, scn_run_fs, scn_save_fs in rotor_lst:
+            _save_hr_scan(scn_run_fs, scn_save_fs, scn_typ,
+                          tors_names, const_dct, mod_thy_info)
+
+        return
+
+    for rotor in rotor_lst:
+        tors_names, tors_grids, constraint_dct = rotor[:3]
+        scn_run_fs, scn_save_fs = rotor[3:]
+
+        print('\nRunning Rotor: {}...'.format(tors_names))
+
+        print('\nSaving any HR in run filesys...')
+        _save_hr_scan(scn_run_fs, scn_save_fs, scn_typ,
+                      tors_names, constraint_dct, mod_thy_info)
 
         print('\nRunning any HR Scans if needed...')
         scan.run_scan(
@@ -87,19 +123,27 @@ def hindered_rotor_scans(
         )
 
         print('\nSaving any newly run HR scans in run filesys...')
-        if constraint_dct is None:
-            scan.save_scan(
-                scn_run_fs=scn_run_fs,
-                scn_save_fs=scn_save_fs,
-                scn_typ=scn_typ,
-                coo_names=tors_names,
-                mod_thy_info=mod_thy_info,
-                in_zma_fs=True)
-        else:
-            scan.save_cscan(
-                cscn_run_fs=scn_run_fs,
-                cscn_save_fs=scn_save_fs,
-                scn_typ=scn_typ,
-                constraint_dct=constraint_dct,
-                mod_thy_info=mod_thy_info,
-                in_zma_fs=True)
+        _save_hr_scan(scn_run_fs, scn_save_fs, scn_typ,
+                      tors_names, constraint_dct, mod_thy_info)
+
+
+def _save_hr_scan(scn_run_fs, scn_save_fs, scn_typ,
+                  tors_names, constraint_dct, mod_thy_info):
+    """ save the scan or constrained scan of a rotor
+    """
+    if constraint_dct is None:
+        scan.save_scan(
+            scn_run_fs=scn_run_fs,
+            scn_save_fs=scn_save_fs,
+            scn_typ=scn_typ,
+            coo_names=tors_names,
+            mod_thy_info=mod_thy_info,
+            in_zma_fs=True)
+    else:
+        scan.save_cscan(
+            cscn_run_fs=scn_run_fs,
+            cscn_save_fs=scn_save_fs,
+            scn_typ=scn_typ,
+            constraint_dct=constraint_dct,
+            mod_thy_info=mod_thy_info,
+            in_zma_fs=True)
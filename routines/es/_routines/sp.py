@@ -8,6 +8,7 @@ from phydat import phycon
 from phydat import symm
 from routines.es import runner as es_runner
 from lib import structure
+from lib import filesys
 
 
 # _JSON_SAVE = ['TAU']
@@ -21,6 +22,26 @@ def run_energy(zma, geo, spc_info, thy_info,
     """ Find the energy for the given structure
     """
 
+    job = _energy_job(
+        zma, geo, spc_info, thy_info,
+        geo_save_fs, geo_run_path, geo_save_path, locs,
+        script_str, overwrite,
+        retryfail=retryfail, highspin=highspin, **kwargs)
+    if job is not None:
+        job_kwargs, save_args = job
+        es_runner.run_job(**job_kwargs)
+        _save_energy(*save_args)
+
+
+def _energy_job(zma, geo, spc_info, thy_info,
+                geo_save_fs, geo_run_path, geo_save_path, locs,
+                script_str, overwrite,
+                retryfail=True, highspin=False, **kwargs):
+    """ Set up the energy job for the given structure. Returns the
+        run_job keywords and the arguments for saving the output,
+        or None if no job needs to be run
+    """
+
     # geo_save_fs and locs unneeded for this
     _, _ = geo_save_fs, locs
 
@@ -63,7 +84,7 @@ def run_energy(zma, geo, spc_info, thy_info,
             errs = ()
             optmat = ()
 
-        es_runner.run_job(
+        job_kwargs = dict(
             job='energy',
             script_str=script_str,
             run_fs=run_fs,
@@ -76,30 +97,40 @@ def run_energy(zma, geo, spc_info, thy_info,
             retryfail=retryfail,
             **kwargs,
         )
-
-        success, ret = es_runner.read_job(
-            job='energy',
-            run_fs=run_fs,
-        )
-
-        if success:
-            inf_obj, inp_str, out_str = ret
-
-            print(" - Reading energy from output...")
-            ene = elstruct.reader.energy(inf_obj.prog, inf_obj.method, out_str)
-
-            print("Energy: {}".format(ene))
-            print(" - Saving energy...")
-            sp_save_fs[-1].file.input.write(inp_str, thy_info[1:4])
-            sp_save_fs[-1].file.info.write(inf_obj, thy_info[1:4])
-            sp_save_fs[-1].file.energy.write(ene, thy_info[1:4])
-            print(" - Save path: {}".format(sp_save_path))
+        job = (job_kwargs, (run_fs, sp_save_fs, sp_save_path, thy_info))
 
     else:
         print('Energy found and saved previously at {}'.format(
             sp_save_path))
         ene = sp_save_fs[-1].file.energy.read(thy_info[1:4])
         print("Energy: {}".format(ene))
+        job = None
+
+    return job
+
+
+def _save_energy(run_fs, sp_save_fs, sp_save_path, thy_info):
+    """ Read the energy from the job output and save it
+    """
+
+    success, ret = es_runner.read_job(
+        job='energy',
+        run_fs=run_fs,
+    )
+
+    if success:
+        inf_obj, inp_str, out_str = ret
+
+        print(" - Reading energy from output...")
+        ene = elstruct.reader.energy(inf_obj.prog, inf_obj.method, out_str)
+
+        print("Energy: {}".format(ene))
+        print(" - Saving energy...")
+        sp_save_fs[-1].file.input.write(inp_str, thy_info[1:4])
+        sp_save_fs[-1].file.info.write(inf_obj, thy_info[1:4])
+        filesys.index.write(sp_save_fs[-1].file.energy, ene, thy_info[1:4])
+        filesys.mincnf.clear_ladders(sp_save_path)
+        print(" - Save path: {}".format(sp_save_path))
 
 
 def run_gradient(zma, geo, spc_info, thy_info,
@@ -109,6 +140,26 @@ def run_gradient(zma, geo, spc_info, thy_info,
     """ Determine the gradient for the geometry in the given location
     """
 
+    job = _gradient_job(
+        zma, geo, spc_info, thy_info,
+        geo_save_fs, geo_run_path, geo_save_path, locs,
+        script_str, overwrite,
+        retryfail=retryfail, **kwargs)
+    if job is not None:
+        job_kwargs, save_args = job
+        es_runner.run_job(**job_kwargs)
+        _save_gradient(*save_args)
+
+
+def _gradient_job(zma, geo, spc_info, thy_info,
+                  geo_save_fs, geo_run_path, geo_save_path, locs,
+                  script_str, overwrite,
+                  retryfail=True, **kwargs):
+    """ Set up the gradient job for the geometry in the given location.
+        Returns the run_job keywords and the arguments for saving the
+        output, or None if no job needs to be run
+    """
+
     # Set input geom
     if geo is not None:
         job_geo = geo
@@ -116,6 +167,7 @@ def run_gradient(zma, geo, spc_info, thy_info,
         job_geo = automol.zmatrix.geometry(zma)
     is_atom = automol.geom.is_atom(job_geo)
 
+    job = None
     if not is_atom:
 
         if _json_database(geo_save_path):
@@ -135,7 +187,7 @@ def run_gradient(zma, geo, spc_info, thy_info,
 
             run_fs = autofile.fs.run(geo_run_path)
 
-            es_runner.run_job(
+            job_kwargs = dict(
                 job='gradient',
                 script_str=script_str,
                 run_fs=run_fs,
@@ -146,33 +198,7 @@ def run_gradient(zma, geo, spc_info, thy_info,
                 retryfail=retryfail,
                 **kwargs,
             )
-
-            success, ret = es_runner.read_job(
-                job='gradient',
-                run_fs=run_fs,
-            )
-
-            if success:
-                inf_obj, inp_str, out_str = ret
-
-                if is_atom:
-                    grad = ()
-                else:
-                    print(" - Reading gradient from output...")
-                    grad = elstruct.reader.gradient(inf_obj.prog, out_str)
-
-                    print(" - Saving gradient...")
-                    if _json_database(geo_save_path):
-                        geo_save_fs[-1].json.gradient_info.write(inf_obj, locs)
-                        geo_save_fs[-1].json.gradient_input.write(
-                            inp_str, locs)
-                        geo_save_fs[-1].json.gradient.write(grad, locs)
-                    else:
-                        geo_save_fs[-1].file.gradient_info.write(inf_obj, locs)
-                        geo_save_fs[-1].file.gradient_input.write(
-                            inp_str, locs)
-                        geo_save_fs[-1].file.gradient.write(grad, locs)
-                    print(" - Save path: {}".format(geo_save_path))
+            job = (job_kwargs, (run_fs, geo_save_fs, geo_save_path, locs))
 
         else:
             print('Gradient found and saved previously at {}'.format(
@@ -181,6 +207,37 @@ def run_gradient(zma, geo, spc_info, thy_info,
     else:
         print('Species is an atom. Skipping gradient task.')
 
+    return job
+
+
+def _save_gradient(run_fs, geo_save_fs, geo_save_path, locs):
+    """ Read the gradient from the job output and save it
+    """
+
+    success, ret = es_runner.read_job(
+        job='gradient',
+        run_fs=run_fs,
+    )
+
+    if success:
+        inf_obj, inp_str, out_str = ret
+
+        print(" - Reading gradient from output...")
+        grad = elstruct.reader.gradient(inf_obj.prog, out_str)
+
+        print(" - Saving gradient...")
+        if _json_database(geo_save_path):
+            geo_save_fs[-1].json.gradient_info.write(inf_obj, locs)
+            geo_save_fs[-1].json.gradient_input.write(
+                inp_str, locs)
+            geo_save_fs[-1].json.gradient.write(grad, locs)
+        else:
+            geo_save_fs[-1].file.gradient_info.write(inf_obj, locs)
+            geo_save_fs[-1].file.gradient_input.write(
+                inp_str, locs)
+            geo_save_fs[-1].file.gradient.write(grad, locs)
+        print(" - Save path: {}".format(geo_save_path))
+
 
 def run_hessian(zma, geo, spc_info, thy_info,
                 geo_save_fs, geo_run_path, geo_save_path, locs,
@@ -189,8 +246,25 @@ def run_hessian(zma, geo, spc_info, thy_info,
     """ Determine the hessian for the geometry in the given location
     """
 
-    # Set the run filesystem information
-    run_fs = autofile.fs.run(geo_run_path)
+    job = _hessian_job(
+        zma, geo, spc_info, thy_info,
+        geo_save_fs, geo_run_path, geo_save_path, locs,
+        script_str, overwrite,
+        retryfail=retryfail, **kwargs)
+    if job is not None:
+        job_kwargs, save_args = job
+        es_runner.run_job(**job_kwargs)
+        _save_hessian(*save_args)
+
+
+def _hessian_job(zma, geo, spc_info, thy_info,
+                 geo_save_fs, geo_run_path, geo_save_path, locs,
+                 script_str, overwrite,
+                 retryfail=True, **kwargs):
+    """ Set up the hessian job for the geometry in the given location.
+        Returns the run_job keywords and the arguments for saving the
+        output, or None if no job needs to be run
+    """
 
     # if prog == 'molpro2015':
     #     geo = hess_geometry(out_str)
@@ -205,6 +279,7 @@ def run_hessian(zma, geo, spc_info, thy_info,
         job_geo = automol.zmatrix.geometry(zma)
     is_atom = automol.geom.is_atom(job_geo)
 
+    job = None
     if not is_atom:
 
         if _json_database(geo_save_path):
@@ -224,7 +299,7 @@ def run_hessian(zma, geo, spc_info, thy_info,
 
             run_fs = autofile.fs.run(geo_run_path)
 
-            es_runner.run_job(
+            job_kwargs = dict(
                 job='hessian',
                 script_str=script_str,
                 run_fs=run_fs,
@@ -235,34 +310,9 @@ def run_hessian(zma, geo, spc_info, thy_info,
                 retryfail=retryfail,
                 **kwargs,
             )
-
-            success, ret = es_runner.read_job(
-                job='hessian',
-                run_fs=run_fs,
-            )
-
-            if success:
-                inf_obj, inp_str, out_str = ret
-
-                print(" - Reading hessian from output...")
-                hess = elstruct.reader.hessian(inf_obj.prog, out_str)
-
-                print(" - Saving Hessian...")
-                if _json_database(geo_save_path):
-                    geo_save_fs[-1].json.hessian_info.write(inf_obj, locs)
-                    geo_save_fs[-1].json.hessian_input.write(inp_str, locs)
-                    geo_save_fs[-1].json.hessian.write(hess, locs)
-                else:
-                    geo_save_fs[-1].file.hessian_info.write(inf_obj, locs)
-                    geo_save_fs[-1].file.hessian_input.write(inp_str, locs)
-                    geo_save_fs[-1].file.hessian.write(hess, locs)
-                print(" - Save path: {}".format(geo_save_path))
-
-                if thy_info[0] == 'gaussian09':
-                    _hess_grad(inf_obj.prog, out_str, geo_save_fs,
-                               geo_save_path, locs, overwrite)
-                _hess_freqs(geo, geo_save_fs,
-                            geo_run_path, geo_save_path, locs, overwrite)
+            job = (job_kwargs,
+                   (run_fs, geo, thy_info, geo_save_fs,
+                    geo_run_path, geo_save_path, locs, overwrite))
 
         else:
             print('Hessian found and saved previously at {}'.format(
@@ -274,6 +324,120 @@ def run_hessian(zma, geo, spc_info, thy_info,
     else:
         print('Species is an atom. Skipping Hessian task.')
 
+    return job
+
+
+def _save_hessian(run_fs, geo, thy_info, geo_save_fs,
+                  geo_run_path, geo_save_path, locs, overwrite):
+    """ Read the hessian from the job output and save it, along with the
+        harmonic frequencies and any gradient found in the output
+    """
+
+    success, ret = es_runner.read_job(
+        job='hessian',
+        run_fs=run_fs,
+    )
+
+    if success:
+        inf_obj, inp_str, out_str = ret
+
+        print(" - Reading hessian from output...")
+        hess = elstruct.reader.hessian(inf_obj.prog, out_str)
+
+        print(" - Saving Hessian...")
+        if _json_database(geo_save_path):
+            geo_save_fs[-1].json.hessian_info.write(inf_obj, locs)
+            geo_save_fs[-1].json.hessian_input.write(inp_str, locs)
+            geo_save_fs[-1].json.hessian.write(hess, locs)
+        else:
+            geo_save_fs[-1].file.hessian_info.write(inf_obj, locs)
+            geo_save_fs[-1].file.hessian_input.write(inp_str, locs)
+            geo_save_fs[-1].file.hessian.write(hess, locs)
+        print(" - Save path: {}".format(geo_save_path))
+
+        if thy_info[0] == 'gaussian09':
+            _hess_grad(inf_obj.prog, out_str, geo_save_fs,
+                       geo_save_path, locs, overwrite)
+        _hess_freqs(geo, geo_save_fs,
+                    geo_run_path, geo_save_path, locs, overwrite)
+
+
+def run_batch(job, batch_lst, spc_info, thy_info, geo_save_fs,
+              script_str, overwrite,
+              retryfail=True, ncores=1, mem=None, **kwargs):
+    """ Run an energy, gradient, or hessian job for a batch of structures.
+        The calculations are dispatched concurrently through the job queue
+        under the ncores and mem budget and the outputs are saved as each
+        job finishes. Other jobs are run one structure at a time.
+
+        :param batch_lst: (zma, geo, geo_run_path, geo_save_path, locs)
+            for each structure
+        :type batch_lst: list(tuple)
+    """
+
+    if job not in BATCH_JOBS:
+        for zma, geo, geo_run_path, geo_save_path, locs in batch_lst:
+            RUN_JOBS[job](
+                zma, geo, spc_info, thy_info,
+                geo_save_fs, geo_run_path, geo_save_path, locs,
+                script_str, overwrite,
+                retryfail=retryfail, **kwargs)
+    else:
+        job_fxn, save_fxn = BATCH_JOBS[job]
+
+        # Set up the jobs for every structure missing the information
+        jobs, save_args_lst = [], []
+        for zma, geo, geo_run_path, geo_save_path, locs in batch_lst:
+            job_info = job_fxn(
+                zma, geo, spc_info, thy_info,
+                geo_save_fs, geo_run_path, geo_save_path, locs,
+                script_str, overwrite,
+                retryfail=retryfail, **kwargs)
+            if job_info is not None:
+                job_kwargs, save_args = job_info
+                jobs.append((es_runner.run_job, job_kwargs))
+                save_args_lst.append(save_args)
+
+        # Run the jobs and save the results as they finish
+        es_runner.run_jobs(
+            jobs, ncores=ncores, mem=mem,
+            read_fxn=lambda idx: save_fxn(*save_args_lst[idx]))
+
+
+def run_scan_batch(job, locs_lst, spc_info, thy_info,
+                   scn_run_fs, scn_save_fs,
+                   script_str, overwrite,
+                   retryfail=True, ncores=1, mem=None, **kwargs):
+    """ Run an energy, gradient, or hessian job for each point of a saved
+        scan (or any other filesystem with a geometry at each locs) through
+        run_batch, so the points are run concurrently under the ncores and
+        mem budget and saved in the main process as they finish
+    """
+    run_batch(
+        job, scan_batch_lst(locs_lst, scn_run_fs, scn_save_fs),
+        spc_info, thy_info, scn_save_fs, script_str, overwrite,
+        retryfail=retryfail, ncores=ncores, mem=mem, **kwargs)
+
+
+def scan_batch_lst(locs_lst, scn_run_fs, scn_save_fs):
+    """ Build the batch list used by run_batch for the points of a scan,
+        creating their run directories
+    """
+
+    batch_lst = []
+    for locs in locs_lst:
+        scn_run_fs[-1].create(locs)
+        if scn_save_fs[-1].file.zmatrix.exists(locs):
+            zma = scn_save_fs[-1].file.zmatrix.read(locs)
+            geo = scn_save_fs[-1].file.geometry.read(locs)
+        else:
+            zma, geo = filesys.inf.cnf_fs_zma_geo(scn_save_fs, locs)
+        batch_lst.append(
+            (zma, geo, scn_run_fs[-1].path(locs), scn_save_fs[-1].path(locs),
+             locs))
+
+    return batch_lst
+
 
 def run_vpt2(zma, geo, spc_info, thy_info,
              geo_save_fs, geo_run_path, geo_save_path, locs,
@@ -566,3 +730,18 @@ def _json_database(save_path):
         if inst in save_path:
             it_is = True
     return it_is
+
+
+# Single-point job runners and their parts for running jobs in batches
+RUN_JOBS = {
+    'energy': run_energy,
+    'grad': run_gradient,
+    'hess': run_hessian,
+    'vpt2': run_vpt2,
+    'prop': run_prop
+}
+BATCH_JOBS = {
+    'energy': (_energy_job, _save_energy),
+    'grad': (_gradient_job, _save_gradient),
+    'hess': (_hessian_job, _save_hessian)
+}
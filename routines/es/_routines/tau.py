@@ -16,7 +16,7 @@ def tau_sampling(zma, ref_ene, spc_info, tors_name_grps, nsamp_par,
                  mod_thy_info,
                  tau_run_fs, tau_save_fs,
                  script_str, overwrite,
-                 saddle=False, **opt_kwargs):
+                 saddle=False, ncores=1, mem=None, **opt_kwargs):
     """ Sample over torsions optimizing all other coordinates
     """
 
@@ -45,23 +45,27 @@ def tau_sampling(zma, ref_ene, spc_info, tors_name_grps, nsamp_par,
         script_str=script_str,
         overwrite=overwrite,
         saddle=saddle,
+        ncores=ncores,
+        mem=mem,
         **opt_kwargs,
     )
 
-    save_tau(
-        tau_run_fs=tau_run_fs,
-        tau_save_fs=tau_save_fs,
-        mod_thy_info=mod_thy_info
-    )
-
     print('Assessing the convergence of the Monte Carlo Partition Function...')
     assess_pf_convergence(tau_save_fs, ref_ene)
 
 
 def run_tau(zma, spc_info, thy_info, nsamp, tors_range_dct,
             tau_run_fs, tau_save_fs, script_str, overwrite,
-            saddle, **kwargs):
+            saddle, ncores=1, mem=None, batch_size=None, **kwargs):
     """ run sampling algorithm to find tau dependent geometries
+
+        The optimizations for all of the remaining samples are dispatched
+        through the job queue, concurrently if the ncores budget allows.
+        The number of samples run is tracked in memory; it is written to
+        the info files, and the finished samples are saved, once every
+        batch_size samples (by default, after every sample when running
+        serially and every ten samples per core when running concurrently);
+        the saved samples are sorted once all of them are done.
     """
     if not tors_range_dct:
         print("No torsional coordinates. Setting nsamp to 1.")
@@ -74,26 +78,51 @@ def run_tau(zma, spc_info, thy_info, nsamp, tors_range_dct,
         existing_vma = tau_save_fs[0].file.vmatrix.read()
         assert vma == existing_vma
     tau_save_fs[0].file.vmatrix.write(vma)
-    idx = 0
+
+    if tau_save_fs[0].file.info.exists():
+        inf_obj_s = tau_save_fs[0].file.info.read()
+        nsampd = inf_obj_s.nsamp
+    elif tau_run_fs[0].file.info.exists():
+        inf_obj_r = tau_run_fs[0].file.info.read()
+        nsampd = inf_obj_r.nsamp
+    else:
+        nsampd = 0
+
     nsamp0 = nsamp
-    inf_obj = autofile.schema.info_objects.tau_trunk(0, tors_range_dct)
-    while True:
-        if tau_save_fs[0].file.info.exists():
-            inf_obj_s = tau_save_fs[0].file.info.read()
-            nsampd = inf_obj_s.nsamp
-        elif tau_run_fs[0].file.info.exists():
-            inf_obj_r = tau_run_fs[0].file.info.read()
-            nsampd = inf_obj_r.nsamp
+    nsamp = nsamp0 - nsampd
+    if nsamp <= 0:
+        print('Reached requested number of samples. '
+              'Tau sampling complete.')
+        return
+    print("    New nsamp is {:d}.".format(nsamp))
+
+    # Save each finished sample when running serially, so a crash loses
+    # no progress, and in larger batches when running concurrently
+    if batch_size is None:
+        if ncores is not None and ncores > 1:
+            batch_size = 10 * ncores
         else:
-            nsampd = 0
+            batch_size = 1
+
+    # Counter of the samples and locs of the runs still to be saved
+    inf_obj = autofile.schema.info_objects.tau_trunk(0, tors_range_dct)
+    samp_cnt = {'nsampd': nsampd}
+    unsaved_locs = []
 
-        nsamp = nsamp0 - nsampd
-        if nsamp <= 0:
-            print('Reached requested number of samples. '
-                  'Tau sampling complete.')
-            break
+    def _flush(sort=False):
+        """ write the sample count and save the finished samples
+        """
+        inf_obj.nsamp = samp_cnt['nsampd']
+        tau_save_fs[0].file.info.write(inf_obj)
+        tau_run_fs[0].file.info.write(inf_obj)
+        if unsaved_locs or sort:
+            save_tau(tau_run_fs, tau_save_fs, thy_info,
+                     locs_lst=unsaved_locs, sort=sort)
+            del unsaved_locs[:]
 
-        print("    New nsamp is {:d}.".format(nsamp))
+    # Generate the samples and set up the optimization jobs
+    jobs, jobs_locs = [], []
+    for idx in range(nsamp):
 
         samp_zma, = automol.zmatrix.samples(zma, 1, tors_range_dct)
         tid = autofile.schema.generate_new_tau_id()
@@ -103,24 +132,24 @@ def run_tau(zma, spc_info, thy_info, nsamp, tors_range_dct,
         tau_run_prefix = tau_run_fs[-1].path(locs)
         run_fs = autofile.fs.run(tau_run_prefix)
 
-        idx += 1
-        print("Run {}/{}".format(idx, nsamp0))
+        print("Sample {}/{}".format(idx+1, nsamp))
 
         print('\nChecking if ZMA has high repulsion...')
         if automol.intmol.low_repulsion_struct(zma, samp_zma):
             print('ZMA fine.')
-            es_runner.run_job(
-                job=elstruct.Job.OPTIMIZATION,
-                script_str=script_str,
-                run_fs=run_fs,
-                geom=samp_zma,
-                spc_info=spc_info,
-                thy_info=thy_info,
-                saddle=saddle,
-                overwrite=overwrite,
-                frozen_coordinates=tors_range_dct.keys(),
-                **kwargs
-            )
+            jobs.append(
+                (es_runner.run_job,
+                 dict(job=elstruct.Job.OPTIMIZATION,
+                      script_str=script_str,
+                      run_fs=run_fs,
+                      geom=samp_zma,
+                      spc_info=spc_info,
+                      thy_info=thy_info,
+                      saddle=saddle,
+                      overwrite=overwrite,
+                      frozen_coordinates=tors_range_dct.keys(),
+                      **kwargs)))
+            jobs_locs.append(locs)
         else:
             print('repulsive ZMA:')
             inp_str = elstruct.writer.optimization(
@@ -136,30 +165,31 @@ def run_tau(zma, spc_info, thy_info, nsamp, tors_range_dct,
             )
             tau_run_fs[-1].file.geometry_input.write(inp_str, locs)
             print('geometry for bad ZMA at', tau_run_fs[-1].path(locs))
+            samp_cnt['nsampd'] += 1
 
-        # nsampd += 1
-        # inf_obj.nsamp = nsampd
-        # tau_save_fs[0].file.info.write(inf_obj)
-        # tau_run_fs[0].file.info.write(inf_obj)
-
-        if tau_save_fs[0].file.info.exists():
-            inf_obj_s = tau_save_fs[0].file.info.read()
-            nsampd = inf_obj_s.nsamp
-        elif tau_run_fs[0].file.info.exists():
-            inf_obj_r = tau_run_fs[0].file.info.read()
-            nsampd = inf_obj_r.nsamp
-        nsampd += 1
-        inf_obj.nsamp = nsampd
-        tau_save_fs[0].file.info.write(inf_obj)
-        tau_run_fs[0].file.info.write(inf_obj)
+    # Run the optimizations, counting and saving them in batches
+    def _count_sample(job_idx):
+        samp_cnt['nsampd'] += 1
+        unsaved_locs.append(jobs_locs[job_idx])
+        if len(unsaved_locs) >= batch_size:
+            _flush()
+
+    es_runner.run_jobs(
+        jobs, ncores=ncores, mem=mem, read_fxn=_count_sample)
+    _flush(sort=True)
 
 
-def save_tau(tau_run_fs, tau_save_fs, mod_thy_info):
-    """ save the tau dependent geometries that have been found so far
+def save_tau(tau_run_fs, tau_save_fs, mod_thy_info,
+             locs_lst=None, sort=True):
+    """ save the tau dependent geometries that have been found so far;
+        by default all runs are saved, otherwise only those for the given
+        locs_lst that are not yet in the save filesystem
     """
     # db_style = 'jsondb'
     db_style = 'directory'
-    if db_style == 'jsondb':
+    if locs_lst is not None:
+        saved_geos = []
+    elif db_style == 'jsondb':
         saved_locs = tau_save_fs[-1].json_existing()
         saved_geos = tau_save_fs[-1].json.geometry.read_all(saved_locs)
     elif db_style == 'directory':
@@ -171,7 +201,13 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info):
         if db_style == 'jsondb':
             save_info = [[], [], [], [], []]
             sp_save_info = [[], [], [], [], []]
-        for locs in tau_run_fs[-1].existing():
+        skip_saved = locs_lst is not None
+        if locs_lst is None:
+            locs_lst = tau_run_fs[-1].existing()
+        for locs in locs_lst:
+            if (skip_saved and db_style == 'directory' and
+                    tau_save_fs[-1].file.energy.exists(locs)):
+                continue
             run_path = tau_run_fs[-1].path(locs)
             run_fs = autofile.fs.run(run_path)
             save_path = tau_save_fs[-1].root.path()
@@ -249,7 +285,8 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info):
                     sp_save_info[4][i], sp_save_info[1][i])
 
         # update the tau trajectory file
-        filesys.mincnf.traj_sort(tau_save_fs, mod_thy_info)
+        if sort:
+            filesys.mincnf.traj_sort(tau_save_fs, mod_thy_info)
 
 
 def assess_pf_convergence(tau_save_fs, ref_ene,
@@ -189,7 +189,8 @@ def run(job, spc_dct, spc_name, thy_dct, es_keyword_dct,
             run_prefix, save_prefix,
             scn_run_fs, scn_save_fs,
             overwrite, vrc_dct,
-            update_guess)
+            update_guess,
+            ncores=es_keyword_dct['ncores'], mem=es_keyword_dct['mem'])
 
         # Print switch message
         if switch:
@@ -219,7 +220,8 @@ def run(job, spc_dct, spc_name, thy_dct, es_keyword_dct,
             var_sp1_thy_info,
             scn_run_fs, scn_save_fs,
             run_prefix, save_prefix,
-            overwrite, update_guess)
+            overwrite, update_guess,
+            ncores=es_keyword_dct['ncores'], mem=es_keyword_dct['mem'])
 
     # Run single/multi reference mol-rad Saddle Point Search
     if _sadpt_search(ts_dct, ts_search, switch):
@@ -296,24 +298,36 @@ def sadpt_transition_state(
             typ, grid, dist_name, brk_name, ini_zma, ts_info,
             mod_thy_info, thy_save_fs,
             scn_run_fs, scn_save_fs, opt_script_str,
-            overwrite, update_guess, constraint_dct, **opt_kwargs)
+            overwrite, update_guess, constraint_dct,
+            grid_search=es_keyword_dct['ts_grid'],
+            grid_ethresh=es_keyword_dct['ts_grid_ethresh'],
+            **opt_kwargs)
 
-    # Optimize the saddle point
-    print('\nOptimizing guess Z-Matrix obtained from scan or filesys...')
-    opt_ret = sadpt.optimize_saddle_point(
-        guess_zmas, ts_info, mod_thy_info,
-        run_fs, opt_script_str, overwrite, **opt_kwargs)
+    # Optimize all the guesses at once, keeping the first saddle point
+    if es_keyword_dct['ts_opt'] == 'race' and len(guess_zmas) > 1:
+        opt_ret, hess_ret, freqs, imags = sadpt.race_saddle_point(
+            guess_zmas, ts_info, mod_thy_info,
+            run_fs, opt_script_str, script_str, overwrite, **opt_kwargs)
+        saddle = opt_ret is not None
+    else:
+        # Optimize the saddle point
+        print('\nOptimizing guess Z-Matrix obtained from scan or filesys...')
+        opt_ret = sadpt.optimize_saddle_point(
+            guess_zmas, ts_info, mod_thy_info,
+            run_fs, opt_script_str, overwrite, **opt_kwargs)
+
+        # Calculate the Hessian for the optimized structure
+        if opt_ret is not None:
+            print('\nCalculating Hessian for the optimized geometry...')
+            hess_ret, freqs, imags = sadpt.saddle_point_hessian(
+                opt_ret, ts_info, mod_thy_info,
+                run_fs, script_str, overwrite, **opt_kwargs)
+
+            # Assess saddle point, save it if viable
+            print('Assessing the saddle point...')
+            saddle = sadpt.saddle_point_checker(imags)
 
-    # Calculate the Hessian for the optimized structure
     if opt_ret is not None:
-        print('\nCalculating Hessian for the optimized geometry...')
-        hess_ret, freqs, imags = sadpt.saddle_point_hessian(
-            opt_ret, ts_info, mod_thy_info,
-            run_fs, script_str, overwrite, **opt_kwargs)
-
-        # Assess saddle point, save it if viable
-        print('Assessing the saddle point...')
-        saddle = sadpt.saddle_point_checker(imags)
         if saddle:
             sadpt.save_saddle_point(
                 opt_ret, hess_ret, freqs, imags,
@@ -341,7 +355,7 @@ def barrierless_transition_state(
         run_prefix, save_prefix,
         scn_run_fs, scn_save_fs,
         overwrite, vrc_dct,
-        update_guess, **opt_kwargs):
+        update_guess, ncores=1, mem=None, **opt_kwargs):
     """ Run TS finder for barrierless reactions
     """
     switch = False
@@ -387,6 +401,7 @@ def barrierless_transition_state(
             scn_run_fs, scn_save_fs,
             run_prefix, save_prefix,
             overwrite, update_guess,
+            ncores=ncores, mem=mem,
             **opt_kwargs)
         # if ts_found:
         #     print('Scans for VTST succeeded')
@@ -406,7 +421,8 @@ def barrierless_transition_state(
             overwrite, update_guess,
             run_prefix, save_prefix,
             vrc_dct,
-            corr_pot=True)
+            corr_pot=True,
+            ncores=ncores, mem=mem)
     #     if ts_found:
     #         print('VaReCoF run successful and flux file was obtained')
     #     else:
@@ -5,10 +5,14 @@
 from routines.es.runner._run import run_job
 from routines.es.runner._run import read_job
 from routines.es.runner._optseq import molpro_opts_mat
+from routines.es.runner._queue import run_jobs
+from routines.es.runner._queue import job_resources
 
 
 __all__ = [
     'run_job',
     'read_job',
-    'molpro_opts_mat'
+    'molpro_opts_mat',
+    'run_jobs',
+    'job_resources'
 ]
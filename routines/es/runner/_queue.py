@@ -0,0 +1,112 @@
+""" Queue of electronic structure jobs run concurrently under a
+    core and memory budget
+"""
+
+import re
+import warnings
+import multiprocessing
+from multiprocessing.connection import wait
+
+
+def job_resources(script_str, thy_info, kwargs):
+    """ estimate the number of cores and the memory (GB) one job will use
+        from the submission script and the elstruct keyword arguments
+    """
+
+    # Read the number of cores from the Gaussian options or the script
+    ncores = 1
+    for opt in kwargs.get('machine_options', ()):
+        match = re.search(r'nprocshared\s*=\s*(\d+)', opt, re.IGNORECASE)
+        if match:
+            ncores = int(match.group(1))
+    match = re.search(r'\s-n\s+(\d+)', script_str)
+    if match:
+        ncores = int(match.group(1))
+
+    # Molpro memory is allocated per process
+    mem = kwargs.get('memory', 0)
+    if thy_info[0] == 'molpro2015':
+        mem *= ncores
+
+    return ncores, mem
+
+
+def run_jobs(jobs, ncores=1, mem=None, read_fxn=None):
+    """ run a list of electronic structure jobs, concurrently if the core
+        budget allows for it.
+
+        Each job is a (runner, run_kwargs) pair where runner(**run_kwargs)
+        runs the calculations in the run filesystem, usually through
+        run_job. The resources of each job are estimated from the
+        script_str, thy_info (or mod_thy_info) and elstruct keywords
+        in run_kwargs.
+        A job is only launched if it fits in what is left of the ncores and
+        mem budget, although one job is always allowed to run so that
+        large jobs cannot stall the queue.
+
+        Since the jobs are run in separate processes, they must only write
+        to the run filesystem. Reading and saving of the output is done
+        by read_fxn(job_idx), which is called in the main process as each
+        job finishes.
+
+        :param jobs: runner and its keyword arguments for each job
+        :type jobs: list((function, dict))
+        :param ncores: total number of cores the jobs may use at once
+        :type ncores: int
+        :param mem: total memory (GB) the jobs may use at once
+        :type mem: float
+        :param read_fxn: function to read and save the output of a job
+        :type read_fxn: function
+    """
+
+    # Run the jobs in the main process if no concurrency is requested
+    if ncores is None or ncores <= 1:
+        for idx, (runner, run_kwargs) in enumerate(jobs):
+            runner(**run_kwargs)
+            if read_fxn is not None:
+                read_fxn(idx)
+        return
+
+    res_lst = [
+        job_resources(
+            run_kwargs['script_str'],
+            run_kwargs.get('thy_info', run_kwargs.get('mod_thy_info')),
+            run_kwargs)
+        for _, run_kwargs in jobs]
+    mem = float('inf') if mem is None else mem
+
+    pending = list(range(len(jobs)))
+    running = {}
+    used_cores, used_mem = 0, 0
+    print('Running {} jobs with a budget of {} cores'.format(
+        len(jobs), ncores))
+    while pending or running:
+
+        # Launch pending jobs, in order, while they fit in the budget
+        while pending:
+            idx = pending[0]
+            job_cores, job_mem = res_lst[idx]
+            fits = (used_cores + job_cores <= ncores and
+                    used_mem + job_mem <= mem)
+            if not fits and running:
+                break
+            runner, run_kwargs = jobs[idx]
+            proc = multiprocessing.Process(target=runner, kwargs=run_kwargs)
+            proc.start()
+            running[proc.sentinel] = (idx, proc)
+            used_cores += job_cores
+            used_mem += job_mem
+            pending.pop(0)
+
+        # Poll for finished jobs, then read and save their output
+        for sentinel in wait(list(running.keys())):
+            idx, proc = running.pop(sentinel)
+            proc.join()
+            job_cores, job_mem = res_lst[idx]
+            used_cores -= job_cores
+            used_mem -= job_mem
+            if proc.exitcode != 0:
+                warnings.warn(
+                    'job {} exited with code {}'.format(idx, proc.exitcode))
+            if read_fxn is not None:
+                read_fxn(idx)
@@ -262,7 +262,9 @@ def conformer_tsk(job, spc_dct, spc_name,
             saddle=saddle, nsamp_par=mc_nsamp,
             tors_names=tors_names,
             two_stage=two_stage, retryfail=retryfail,
-            rxn_class=rxn_class, **opt_kwargs)
+            rxn_class=rxn_class,
+            ncores=es_keyword_dct['ncores'], mem=es_keyword_dct['mem'],
+            **opt_kwargs)
 
     elif job == 'opt':
 
@@ -327,17 +329,20 @@ def conformer_tsk(job, spc_dct, spc_name,
             *mod_thy_info[0:2])
 
         # Run the job over all the conformers requested by the user
+        batch_lst = []
         for locs in ini_cnf_save_locs_lst:
             print('\n\nRunning task for cnf locs', locs)
             geo_run_path = ini_cnf_run_fs[-1].path(locs)
             geo_save_path = ini_cnf_save_fs[-1].path(locs)
             ini_cnf_run_fs[-1].create(locs)
             zma, geo = filesys.inf.cnf_fs_zma_geo(ini_cnf_save_fs, locs)
-            ES_TSKS[job](
-                zma, geo, spc_info, mod_thy_info,
-                ini_cnf_save_fs, geo_run_path, geo_save_path, locs,
-                script_str, overwrite,
-                retryfail=retryfail, **kwargs)
+            batch_lst.append((zma, geo, geo_run_path, geo_save_path, locs))
+        SP_MODULE.run_batch(
+            job, batch_lst, spc_info, mod_thy_info,
+            ini_cnf_save_fs, script_str, overwrite,
+            retryfail=retryfail,
+            ncores=es_keyword_dct['ncores'],
+            mem=es_keyword_dct['mem'], **kwargs)
 
 
 def tau_tsk(job, spc_dct, spc_name,
@@ -499,7 +504,9 @@ def tau_tsk(job, spc_dct, spc_name,
                 mod_ini_thy_info,
                 tau_run_fs, tau_save_fs,
                 opt_script_str, overwrite,
-                saddle=saddle, **opt_kwargs)
+                saddle=saddle,
+                ncores=es_keyword_dct['ncores'], mem=es_keyword_dct['mem'],
+                **opt_kwargs)
 
         elif job in ('energy', 'grad'):
 
@@ -507,6 +514,7 @@ def tau_tsk(job, spc_dct, spc_name,
             script_str, _, kwargs, _ = qchem_params(
                 *thy_info[0:2])
             # Run the job over all the conformers requested by the user
+            batch_lst = []
             for locs in tau_save_locs:
                 geo_run_path = tau_run_fs[-1].path(locs)
                 if db_style == 'jsondb':
@@ -517,12 +525,14 @@ def tau_tsk(job, spc_dct, spc_name,
                     geo = tau_save_fs[-1].file.geometry.read(locs)
                 tau_run_fs[-1].create(locs)
                 zma = None
-                ES_TSKS[job](
-                    zma, geo, spc_info, mod_thy_info,
-                    tau_save_fs, geo_run_path, geo_save_path, locs,
-                    script_str, overwrite,
-                    retryfail=retryfail, **kwargs)
-                print('\n')
+                batch_lst.append(
+                    (zma, geo, geo_run_path, geo_save_path, locs))
+            SP_MODULE.run_batch(
+                job, batch_lst, spc_info, mod_thy_info,
+                tau_save_fs, script_str, overwrite,
+                retryfail=retryfail,
+                ncores=es_keyword_dct['ncores'],
+                mem=es_keyword_dct['mem'], **kwargs)
 
         elif job == 'hess':
 
@@ -534,7 +544,10 @@ def tau_tsk(job, spc_dct, spc_name,
                 *thy_info[0:2])
             # Run the job over all the conformers requested by the user
             hess_cnt = 0
+            batch_lst = []
             for locs in tau_save_locs:
+                if hess_cnt == hessmax:
+                    break
                 print('\nHESS Number {}'.format(hess_cnt+1))
                 geo_run_path = tau_run_fs[-1].path(locs)
                 if db_style == 'directory':
@@ -555,14 +568,15 @@ def tau_tsk(job, spc_dct, spc_name,
                     geo = tau_save_fs[-1].json.geometry.read(locs)
                 zma = None
                 tau_run_fs[-1].create(locs)
-                ES_TSKS[job](
-                    zma, geo, spc_info, mod_thy_info,
-                    tau_save_fs, geo_run_path, geo_save_path, locs,
-                    script_str, overwrite,
-                    retryfail=retryfail, **kwargs)
+                batch_lst.append(
+                    (zma, geo, geo_run_path, geo_save_path, locs))
                 hess_cnt += 1
-                if hess_cnt == hessmax:
-                    break
+            SP_MODULE.run_batch(
+                job, batch_lst, spc_info, mod_thy_info,
+                tau_save_fs, script_str, overwrite,
+                retryfail=retryfail,
+                ncores=es_keyword_dct['ncores'],
+                mem=es_keyword_dct['mem'], **kwargs)
 
     else:
         print('No torsional modes in the species')
@@ -678,7 +692,10 @@ def hr_tsk(job, spc_dct, spc_name,
                 opt_script_str, overwrite,
                 scn_typ=scn_typ,
                 saddle=saddle, const_names=const_names,
-                retryfail=retryfail, **opt_kwargs)
+                retryfail=retryfail,
+                ncores=es_keyword_dct['ncores'], mem=es_keyword_dct['mem'],
+                scan_mode=es_keyword_dct['scan_mode'],
+                **opt_kwargs)
 
             # Read and print the potential
             sp_fs = autofile.fs.single_point(ini_cnf_save_path)
@@ -755,18 +772,13 @@ def hr_tsk(job, spc_dct, spc_name,
                 scn_locs = filesys.build.scn_locs_from_fs(
                     ini_scn_save_fs, tors_names, constraint_dct=constraint_dct)
                 if scn_locs:
-                    for locs in scn_locs:
-                        geo_run_path = ini_scn_run_fs[-1].path(locs)
-                        geo_save_path = ini_scn_save_fs[-1].path(locs)
-                        geo = ini_scn_save_fs[-1].file.geometry.read(locs)
-                        zma = ini_scn_save_fs[-1].file.zmatrix.read(locs)
-                        ini_scn_run_fs[-1].create(locs)
-                        ES_TSKS[job](
-                            zma, geo, spc_info, mod_thy_info,
-                            ini_scn_save_fs, geo_run_path, geo_save_path, locs,
-                            script_str, overwrite,
-                            retryfail=retryfail, **kwargs)
-                        print('\n')
+                    SP_MODULE.run_scan_batch(
+                        job, scn_locs, spc_info, mod_thy_info,
+                        ini_scn_run_fs, ini_scn_save_fs,
+                        script_str, overwrite,
+                        retryfail=retryfail,
+                        ncores=es_keyword_dct['ncores'],
+                        mem=es_keyword_dct['mem'], **kwargs)
                 else:
                     print('*WARNING: NO SCAN INFORMATION EXISTS.',
                           'Doing scan vs cscan?')
@@ -872,14 +884,9 @@ def irc_tsk(job, spc_dct, spc_name,
         # Need to put in something with the IRC idxs
         scn_locs = filesys.build.scn_locs_from_fs(
             ini_scn_save_fs, coord_name, constraint_dct=None)
-        for locs in scn_locs:
-            geo_run_path = ini_scn_run_fs[-1].path(locs)
-            geo_save_path = ini_scn_save_fs[-1].path(locs)
-            zma, geo = filesys.inf.cnf_fs_zma_geo(
-                ini_scn_save_fs, locs)
-            ini_scn_run_fs[-1].create(locs)
-            ES_TSKS[job](
-                zma, geo, spc_info, mod_thy_info,
-                ini_scn_save_fs, geo_run_path, geo_save_path, locs,
-                script_str, overwrite, **kwargs)
-            print('\n')
+        SP_MODULE.run_scan_batch(
+            job, scn_locs, spc_info, mod_thy_info,
+            ini_scn_run_fs, ini_scn_save_fs,
+            script_str, overwrite,
+            ncores=es_keyword_dct['ncores'],
+            mem=es_keyword_dct['mem'], **kwargs)
@@ -4,31 +4,30 @@
 """
 
 import copy
+import numpy
 import ratefit
 import chemkin_io
 import mess_io
 from routines.pf.ktp.fit._util import pull_highp_from_dct
 
 
+RC = 1.98720425864083e-3  # Gas constant in kcal/(mol.K)
+
 # Functions to fit rates to Arrhenius/PLOG function
 def perform_fits(ktp_dct, reaction, mess_path,
                  a_conv_factor, arrfit_thresh):
     """ Read the rates for each channel and perform the fits
     """
 
-    # Fit rate constants to single Arrhenius expressions
-    sing_params_dct, sing_fit_temp_dct, sing_fit_success = mod_arr_fit(
-        ktp_dct, mess_path, fit_type='single', fit_method='python',
+    # Fit rate constants to single Arrhenius expressions and get the errors
+    fit_ret = batch_arr_fit(
+        ktp_dct, fit_type='single',
         t_ref=1.0, a_conv_factor=a_conv_factor)
+    sing_params_dct, sing_fit_temp_dct = fit_ret[0], fit_ret[1]
+    sing_fit_success, sing_fit_err_dct = fit_ret[2], fit_ret[3]
     if sing_fit_success:
         print('\nSuccessful fit to Single Arrhenius at all T, P')
 
-    # Assess the errors of the single Arrhenius Fit
-    sing_fit_err_dct = assess_arr_fit_err(
-        sing_params_dct, ktp_dct,
-        fit_type='single',
-        t_ref=1.0, a_conv_factor=a_conv_factor)
-
     # Write a chemkin string for the single fit
     sing_highp, sing_plog_dct, pressures = pull_highp_from_dct(sing_params_dct)
     if sing_plog_dct:  # if PLOG
@@ -76,11 +75,12 @@ def perform_fits(ktp_dct, reaction, mess_path,
         guess_params_dct = make_dbl_fit_guess(sing_params_dct)
 
         # Fit rate constants to double Arrhenius expressions
-        doub_params_dct, doub_fit_temp_dct, doub_fit_suc = mod_arr_fit(
-            ktp_dct, mess_path, fit_type='double',
-            fit_method='dsarrfit', t_ref=1.0,
+        fit_ret = batch_arr_fit(
+            ktp_dct, fit_type='double', t_ref=1.0,
             a_conv_factor=a_conv_factor,
             inp_param_dct=guess_params_dct)
+        doub_params_dct, doub_fit_temp_dct = fit_ret[0], fit_ret[1]
+        doub_fit_suc, doub_fit_err_dct = fit_ret[2], fit_ret[3]
 
         if doub_fit_suc:
             print('\nSuccessful fit to double Arrhenius at all T, P')
@@ -89,10 +89,6 @@ def perform_fits(ktp_dct, reaction, mess_path,
                   'single arrhenius fit for comparison')
             print(sing_chemkin_str)
 
-            # Assess the errors of the single Arrhenius Fit
-            doub_fit_err_dct = assess_arr_fit_err(
-                doub_params_dct, ktp_dct, fit_type='double',
-                t_ref=1.0, a_conv_factor=a_conv_factor)
             doub_highp, doub_plog_dct, pressures = pull_highp_from_dct(
                 doub_params_dct)
             if doub_plog_dct:  # if PLOG
@@ -111,65 +107,199 @@ def perform_fits(ktp_dct, reaction, mess_path,
     return chemkin_str
 
 
-def mod_arr_fit(ktp_dct, mess_path,
-                fit_type='single', fit_method='dsarrfit',
-                t_ref=1.0, a_conv_factor=1.0, inp_param_dct=None):
+def batch_arr_fit(ktp_dct, fit_type='single',
+                  t_ref=1.0, a_conv_factor=1.0, inp_param_dct=None):
     """
-    Routine for a single reaction:
-        (1) Grab high-pressure and pressure-dependent rate constants
-            from a MESS output file
-        (2) Fit rate constants to an Arrhenius expression
+    Fit the rate constants at all pressures at once, in-process:
+        single: a batched linear least-squares fit of ln k
+        double: a batched Levenberg-Marquardt fit of ln k, seeded by
+                the guess parameters in inp_param_dct
+    The errors of the fits, as in assess_arr_fit_err, are computed in the
+    same pass. The parameters of each pressure are [A, n, Ea] for each
+    Arrhenius term, with A multiplied by a_conv_factor, or empty if the
+    fit failed. The sign of each A of the double fit is kept from its
+    guess, so a negative term can be fit; a guess whose rate constants
+    are not all positive is skipped.
     """
 
     assert fit_type in ('single', 'double'), 'Only single/double fits'
-    if inp_param_dct is not None:
-        assert set(list(ktp_dct.keys())) <= set(list(inp_param_dct.keys())), (
-            'Pressure in ktp not in guess: \n {} \n{}'.format(
-                list(ktp_dct.keys()), list(inp_param_dct.keys()))
-            )
-
-    # Dictionaries to store info; indexed by pressure (given in fit_ps)
-    fit_param_dct = {}
-    fit_temp_dct = {}
-
-    # Calculate the fitting parameters from the filtered T,k lists
-    for pressure, tk_arr in ktp_dct.items():
-
-        # Set the temperatures and rate constants
-        temps = tk_arr[0]
-        rate_constants = tk_arr[1]
 
-        # Fit rate constants using desired Arrhenius fit
-        if fit_type == 'single':
-
-            fit_params = ratefit.fit.arrhenius.single(
-                temps, rate_constants, t_ref, fit_method,
-                dsarrfit_path=mess_path, a_conv_factor=a_conv_factor)
+    # Stack the rate constants of all pressures, padded to the same length
+    pressures = list(ktp_dct.keys())
+    npts = max(len(ktp_dct[pressure][0]) for pressure in pressures)
+    temps = numpy.ones((len(pressures), npts))
+    rate_constants = numpy.ones((len(pressures), npts))
+    mask = numpy.zeros((len(pressures), npts), dtype=bool)
+    for idx, pressure in enumerate(pressures):
+        ntemps = len(ktp_dct[pressure][0])
+        temps[idx, :ntemps] = ktp_dct[pressure][0]
+        rate_constants[idx, :ntemps] = ktp_dct[pressure][1]
+        mask[idx, :ntemps] = True
+
+    # Fit ln k for all of the pressures
+    sing_params = _batch_single_fit(temps, rate_constants, mask, t_ref)
+    if fit_type == 'single':
+        params = sing_params
+        signs = numpy.ones((len(pressures), 1))
+    else:
+        if inp_param_dct is not None:
+            guess = numpy.array(
+                [inp_param_dct[pressure] for pressure in pressures],
+                dtype=float)
+            guess[:, (0, 3)] /= a_conv_factor
+        else:
+            guess = numpy.array(
+                [_generate_guess((numpy.exp(par[0]), par[1], par[2]))
+                 for par in sing_params])
+        signs = numpy.where(guess[:, (0, 3)] < 0.0, -1.0, 1.0)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            guess[:, (0, 3)] = numpy.log(numpy.abs(guess[:, (0, 3)]))
+
+        # Skip the pressures where the guess gives negative rate constants
+        guess_lnks = _arr_lnks(guess, temps, t_ref, signs=signs)[0]
+        bad = ~numpy.all(numpy.isfinite(guess_lnks) | ~mask, axis=1)
+        for idx in numpy.flatnonzero(bad):
+            print('Double Arrhenius guess gives negative rate constants',
+                  'at pressure {}: skipping the double fit'.format(
+                      pressures[idx]))
+        params = _batch_double_fit(
+            temps, rate_constants, mask, t_ref, guess, signs)
+        params[bad] = numpy.nan
+
+    # Calculate the errors of the fitted rate constants
+    fit_ks = numpy.exp(_arr_lnks(params, temps, t_ref, signs=signs)[0])
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        abs_err = numpy.abs((rate_constants - fit_ks) / rate_constants)
+    abs_err = numpy.where(mask, abs_err, numpy.nan)
+
+    # Store the parameters, temperature ranges, and errors in dictionaries
+    fit_param_dct, fit_temp_dct, fit_err_dct = {}, {}, {}
+    for idx, pressure in enumerate(pressures):
+        if numpy.all(numpy.isfinite(params[idx])):
+            fit_params = [float(val) for val in params[idx]]
+            for aidx in range(0, len(fit_params), 3):
+                fit_params[aidx] = float(
+                    signs[idx, aidx // 3] * numpy.exp(fit_params[aidx]) *
+                    a_conv_factor)
+        else:
+            fit_params = []
+        fit_param_dct[pressure] = fit_params
+        fit_temp_dct[pressure] = [min(ktp_dct[pressure][0]),
+                                  max(ktp_dct[pressure][0])]
+        if fit_params:
+            fit_err_dct[pressure] = [
+                numpy.nanmean(abs_err[idx]) * 100.0,
+                numpy.nanmax(abs_err[idx]) * 100.0]
+        else:
+            fit_err_dct[pressure] = [numpy.nan, numpy.nan]
 
-        elif fit_type == 'double':
+    # Check if the desired fits were successful at each pressure
+    fit_success = all(params for params in fit_param_dct.values())
 
-            # Generate guess parameters
-            if inp_param_dct is not None:
-                arr_guess = inp_param_dct[pressure]
-                arr1_guess, arr2_guess = arr_guess[:3], arr_guess[3:]
-            else:
-                arr1_guess, arr2_guess = (8.1e-11, -0.01, 2000.0), ()
+    return fit_param_dct, fit_temp_dct, fit_success, fit_err_dct
 
-            fit_params = ratefit.fit.arrhenius.double(
-                temps, rate_constants, t_ref, fit_method,
-                arr1_guess=arr1_guess, arr2_guess=arr2_guess,
-                dsarrfit_path=mess_path, a_conv_factor=a_conv_factor)
 
-        # Store the fitting parameters in a dictionary
-        fit_param_dct[pressure] = fit_params
+def _batch_single_fit(temps, rate_constants, mask, t_ref):
+    """ Fit ln k = ln A + n ln(T/T_ref) - Ea/RT at each pressure as one
+        batched least-squares problem; the padded points have zeroed rows.
+        As for the python fitter, only A is fit for one rate constant
+        and only A and Ea for two or three.
+    """
 
-        # Store the temperatures used to fit in a dictionary
-        fit_temp_dct[pressure] = [min(temps), max(temps)]
+    nks = mask.sum(axis=1)
+    coeff_mat = numpy.stack(
+        [numpy.ones_like(temps),
+         numpy.log(temps / t_ref),
+         -1.0 / (RC * temps)], axis=-1)
+    coeff_mat[nks <= 3, :, 1] = 0.0
+    coeff_mat[nks <= 1, :, 2] = 0.0
+    coeff_mat[~mask] = 0.0
+    k_vec = numpy.where(mask, numpy.log(rate_constants), 0.0)
+
+    theta = numpy.einsum(
+        'pij,pj->pi', numpy.linalg.pinv(coeff_mat), k_vec)
+    theta[nks == 0] = (-numpy.inf, 0.0, 0.0)
+
+    return theta
+
+
+def _batch_double_fit(temps, rate_constants, mask, t_ref, guess, signs,
+                      max_iter=500, tol=1.0e-12):
+    """ Fit the double Arrhenius expression to ln k at each pressure with
+        a batched Levenberg-Marquardt; the params are
+        (ln |A1|, n1, Ea1, ln |A2|, n2, Ea2) for each pressure, with the
+        signs of A1 and A2 fixed
+    """
 
-    # Check if the desired fits were successful at each pressure
-    fit_success = all(params for params in fit_param_dct.values())
+    lnk = numpy.where(mask, numpy.log(rate_constants), 0.0)
+
+    def _resid_jac(params):
+        lnk_fit, jac = _arr_lnks(params, temps, t_ref, signs=signs)
+        resid = numpy.where(mask, lnk_fit - lnk, 0.0)
+        jac = numpy.where(mask[..., None], jac, 0.0)
+        return resid, jac
+
+    params = numpy.array(guess, dtype=float)
+    resid, jac = _resid_jac(params)
+    cost = numpy.sum(resid**2, axis=1)
+    lam = numpy.full(len(params), 1.0e-3)
+    done = ~numpy.isfinite(cost)
+    diag_idxs = numpy.arange(params.shape[1])
+    for _ in range(max_iter):
+
+        # Solve the damped normal equations for the step of each pressure
+        jtj = numpy.einsum('pmi,pmj->pij', jac, jac)
+        grad = numpy.einsum('pmi,pm->pi', jac, resid)
+        lhs = jtj.copy()
+        lhs[:, diag_idxs, diag_idxs] += (
+            lam[:, None] * (jtj[:, diag_idxs, diag_idxs] + 1.0e-12))
+        lhs[done] = numpy.eye(len(diag_idxs))
+        grad[done] = 0.0
+        step = numpy.linalg.solve(lhs, -grad[..., None])[..., 0]
+
+        # Accept the steps that lower the cost and update the damping
+        new_params = params + step
+        new_resid, new_jac = _resid_jac(new_params)
+        new_cost = numpy.sum(new_resid**2, axis=1)
+        better = ~done & numpy.isfinite(new_cost) & (new_cost < cost)
+        conv = better & ((cost - new_cost) <= tol * (cost + tol))
+        params[better] = new_params[better]
+        resid[better], jac[better] = new_resid[better], new_jac[better]
+        cost[better] = new_cost[better]
+        lam = numpy.where(better, lam * 0.3, lam * 10.0)
+        done |= conv | (lam > 1.0e12)
+        if done.all():
+            break
+
+    return params
+
+
+def _arr_lnks(params, temps, t_ref, signs=None):
+    """ ln k of the single or double Arrhenius expressions of all pressures
+        and its derivatives with respect to (ln |A|, n, Ea) of each term,
+        where signs holds the sign of each A (default all positive);
+        ln k is nan where the terms do not sum to a positive k
+    """
 
-    return fit_param_dct, fit_temp_dct, fit_success
+    params = numpy.asarray(params, dtype=float)
+    if signs is None:
+        signs = numpy.ones((params.shape[0], params.shape[1] // 3))
+    lnt = numpy.log(temps / t_ref)[..., None]
+    invt = (1.0 / (RC * temps))[..., None]
+    lna, npar, eapar = (params[:, None, 0::3], params[:, None, 1::3],
+                        params[:, None, 2::3])
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        expo = lna + npar * lnt - eapar * invt
+        emax = numpy.max(expo, axis=-1, keepdims=True)
+        terms = signs[:, None, :] * numpy.exp(expo - emax)
+        ksum = numpy.sum(terms, axis=-1)
+        lnk_fit = numpy.where(
+            ksum > 0.0, emax[..., 0] + numpy.log(ksum), numpy.nan)
+        wts = terms / ksum[..., None]
+    jac = numpy.stack([wts, wts * lnt, -wts * invt], axis=-1)
+    jac = jac.reshape(jac.shape[0], jac.shape[1], -1)
+
+    return lnk_fit, jac
 
 
 def make_dbl_fit_guess(params_dct):
@@ -3,12 +3,16 @@
   Arrhenius, Plog, Troe, and Chebyshev expressions
 """
 
+import os
 import copy
+import itertools
+import multiprocessing
 import numpy
 import ratefit
 import mess_io
 from phydat import phycon
 from lib.amech_io import writer
+from lib.submission import set_nprocs
 from routines.pf.ktp.fit import _arr as arr
 from routines.pf.ktp.fit import _cheb as cheb
 
@@ -16,9 +20,13 @@ from routines.pf.ktp.fit import _cheb as cheb
 def fit_rates(inp_temps, inp_pressures, inp_tunit, inp_punit,
               pes_formula, label_dct, es_info, pf_model,
               mess_path, inp_fit_method, pdep_fit,
-              arrfit_thresh):
+              arrfit_thresh, nprocs=1):
     """ Parse the MESS output and fit the rates to
         Arrhenius expressions written as CHEMKIN strings
+
+        With nprocs > 1, the fits of the reaction pairs are run in a pool
+        of processes, each pair in its own scratch directory under
+        mess_path; the strings are gathered in the order of the pairs.
     """
 
     # Initialize chemkin dct with header
@@ -26,7 +34,11 @@ def fit_rates(inp_temps, inp_pressures, inp_tunit, inp_punit,
         'header': writer.ckin.model_header(es_info, pf_model)
     }
 
-    # Loop through reactions, fit rates, and write ckin strings
+    # Read the rate constants of all channels from the MESS output once
+    rate_tab = read_rate_table(mess_path)
+
+    # Loop through reactions, read the rates and set up the fits
+    fit_args_lst, ridx_lst = [], []
     rxn_pairs = gen_reaction_pairs(label_dct)
     for (name_i, lab_i), (name_j, lab_j) in rxn_pairs:
 
@@ -43,42 +55,74 @@ def fit_rates(inp_temps, inp_pressures, inp_tunit, inp_punit,
         print('\nReading k(T,P)s from MESS output...')
         ktp_dct = read_rates(
             inp_temps, inp_pressures, inp_tunit, inp_punit,
-            lab_i, lab_j, mess_path, pdep_fit,
+            lab_i, lab_j, rate_tab, pdep_fit,
             bimol=numpy.isclose(a_conv_factor, 6.0221e23))
 
         # Check the ktp dct and fit_method to see how to fit rates
         fit_method = _assess_fit_method(ktp_dct, inp_fit_method)
-
-        # Get the desired fits in the form of CHEMKIN strs
         if fit_method is None:
             continue
-        if fit_method == 'arrhenius':
-            chemkin_str = arr.perform_fits(
-                ktp_dct, reaction, mess_path,
-                a_conv_factor, arrfit_thresh)
-        elif fit_method == 'chebyshev':
-            chemkin_str = cheb.perform_fits(
-                ktp_dct, inp_temps, reaction, mess_path,
-                a_conv_factor)
-            if not chemkin_str:
-                chemkin_str = arr.perform_fits(
-                    ktp_dct, reaction, mess_path,
-                    a_conv_factor, arrfit_thresh)
-        # elif fit_method == 'troe':
-        #     # chemkin_str += troe.perform_fits(
-        #     #     ktp_dct, reaction, mess_path,
-        #     #     troe_param_fit_lst,
-        #     #     a_conv_factor, err_thresh)
-
-        # Update the chemkin string dct
+
+        # Set the directory for the fitting programs
+        if nprocs is not None and nprocs > 1:
+            fit_path = os.path.join(
+                mess_path, 'fits', 'fit{}'.format(len(fit_args_lst)))
+        else:
+            fit_path = mess_path
+
+        fit_args_lst.append(
+            (ktp_dct, fit_method, reaction, fit_path,
+             inp_temps, a_conv_factor, arrfit_thresh))
+        ridx_lst.append(pes_formula + '_' + reaction.replace('=', '_'))
+
+    # Get the desired fits in the form of CHEMKIN strs
+    if nprocs is not None and nprocs > 1 and len(fit_args_lst) > 1:
+        print('\nFitting rates for {} reactions with {} processes'.format(
+            len(fit_args_lst), set_nprocs(nprocs)))
+        with multiprocessing.Pool(processes=set_nprocs(nprocs)) as pool:
+            chemkin_strs = pool.starmap(_fit_pair, fit_args_lst)
+    else:
+        chemkin_strs = list(itertools.starmap(_fit_pair, fit_args_lst))
+
+    # Update the chemkin string dct
+    for ridx, chemkin_str in zip(ridx_lst, chemkin_strs):
         print('\n\nFinal Fitting Parameters in CHEMKIN Format:')
         print(chemkin_str)
-        ridx = pes_formula + '_' + reaction.replace('=', '_')
         chemkin_str_dct.update({ridx: chemkin_str})
 
     return chemkin_str_dct
 
 
+def _fit_pair(ktp_dct, fit_method, reaction, fit_path,
+              inp_temps, a_conv_factor, arrfit_thresh):
+    """ fit the rates of a reaction pair and return the CHEMKIN string
+    """
+
+    if not os.path.exists(fit_path):
+        os.makedirs(fit_path)
+
+    chemkin_str = ''
+    if fit_method == 'arrhenius':
+        chemkin_str = arr.perform_fits(
+            ktp_dct, reaction, fit_path,
+            a_conv_factor, arrfit_thresh)
+    elif fit_method == 'chebyshev':
+        chemkin_str = cheb.perform_fits(
+            ktp_dct, inp_temps, reaction, fit_path,
+            a_conv_factor)
+        if not chemkin_str:
+            chemkin_str = arr.perform_fits(
+                ktp_dct, reaction, fit_path,
+                a_conv_factor, arrfit_thresh)
+    # elif fit_method == 'troe':
+    #     # chemkin_str += troe.perform_fits(
+    #     #     ktp_dct, reaction, fit_path,
+    #     #     troe_param_fit_lst,
+    #     #     a_conv_factor, err_thresh)
+
+    return chemkin_str
+
+
 def gen_reaction_pairs(label_dct):
     """ Generate pairs of reactions
     """
@@ -100,20 +144,18 @@ def gen_reaction_pairs(label_dct):
 
 
 # Readers
-def read_rates(inp_temps, inp_pressures, inp_tunit, inp_punit,
-               rct_lab, prd_lab, mess_path, pdep_fit, bimol=False):
-    """ Read the rate constants from the MESS output and
-        (1) filter out the invalid rates that are negative or undefined
-        and obtain the pressure dependent values
+def read_rate_table(mess_path):
+    """ Read the MESS output once and parse the rate constants of all
+        of the channels into a dense (channel x pressure x temperature)
+        array, with undefined rate constants set to nan.
+
+        The table is built from the Temperature-Species Rate Tables and
+        the high-pressure rate coefficients; channels missing from it are
+        read from the output string with mess_io when they are requested.
     """
 
-    # Dictionaries to store info; indexed by pressure (given in fit_ps)
-    calc_k_dct = {}
-    valid_calc_tk_dct = {}
-    ktp_dct = {}
-
     # Read the MESS output file into a string
-    mess_file = mess_path+'/rate.out'
+    mess_file = os.path.join(mess_path, 'rate.out')
     print('mess file', mess_file)
     with open(mess_file, 'r') as mess_file:
         output_string = mess_file.read()
@@ -124,35 +166,139 @@ def read_rates(inp_temps, inp_pressures, inp_tunit, inp_punit,
     mess_pressures, punit = mess_io.reader.rates.get_pressures(
         output_string)
 
+    # Parse the tables into the dense array of rate constants
+    chn_ks = _parse_rate_tables(output_string, mess_temps, mess_pressures)
+    chn_idxs = {chn: idx for idx, chn in enumerate(chn_ks)}
+    ktab = numpy.full(
+        (len(chn_ks), len(mess_pressures), len(mess_temps)), numpy.nan)
+    for chn, idx in chn_idxs.items():
+        ktab[idx] = chn_ks[chn]
+
+    return {
+        'output_string': output_string,
+        'temps': mess_temps,
+        'tunit': tunit,
+        'pressures': mess_pressures,
+        'punit': punit,
+        'chn_idxs': chn_idxs,
+        'ks': ktab
+    }
+
+
+def _parse_rate_tables(output_string, mess_temps, mess_pressures):
+    """ Parse the rate constants of every channel at every pressure and
+        temperature out of the rate tables of the MESS output
+    """
+
+    pressures = [pressure if pressure == 'high' else float(pressure)
+                 for pressure in mess_pressures]
+    temps = [float(temp) for temp in mess_temps]
+
+    chn_ks = {}
+    pidx, header = None, None
+    for line in output_string.splitlines():
+        tokens = line.split()
+        if line.strip().startswith('High Pressure Rate Coefficients'):
+            pidx = pressures.index('high') if 'high' in pressures else None
+            header = None
+        elif line.strip().startswith('Pressure ='):
+            pval = float(line.split('=')[1].split()[0])
+            pidx = _close_idx(pval, pressures)
+            header = None
+        elif 'Rate Tables' in line or 'Rate Coefficients' in line:
+            pidx, header = None, None
+        elif pidx is not None and tokens:
+            if tokens[0] == 'T(K)':
+                header = [tuple(name.split('->')) for name in tokens[1:]]
+            elif header is not None and len(tokens) == len(header) + 1:
+                tidx = _close_idx(_to_float(tokens[0]), temps)
+                if tidx is None:
+                    continue
+                for chn, kval in zip(header, tokens[1:]):
+                    if chn not in chn_ks:
+                        chn_ks[chn] = numpy.full(
+                            (len(pressures), len(temps)), numpy.nan)
+                    chn_ks[chn][pidx, tidx] = _to_float(kval)
+        elif not tokens:
+            header = None
+
+    return chn_ks
+
+
+def _close_idx(val, vals):
+    """ index of the number in vals that is close to val
+    """
+    idx = None
+    if not numpy.isnan(val):
+        for i, val2 in enumerate(vals):
+            if val2 != 'high' and numpy.isclose(val, val2):
+                idx = i
+                break
+    return idx
+
+
+def _to_float(val):
+    """ convert a value read from the MESS output to a float,
+        with undefined values (***) set to nan
+    """
+    try:
+        fval = float(val)
+    except (TypeError, ValueError):
+        fval = numpy.nan
+    return fval
+
+
+def read_rates(inp_temps, inp_pressures, inp_tunit, inp_punit,
+               rct_lab, prd_lab, rate_tab, pdep_fit, bimol=False):
+    """ Read the rate constants from the table of the MESS output and
+        (1) filter out the invalid rates that are negative or undefined
+        and obtain the pressure dependent values
+    """
+
+    # Dictionaries to store info; indexed by pressure (given in fit_ps)
+    valid_calc_tk_dct = {}
+    ktp_dct = {}
+
+    mess_temps, tunit = rate_tab['temps'], rate_tab['tunit']
+    mess_pressures, punit = rate_tab['pressures'], rate_tab['punit']
+
     assert inp_temps <= mess_temps
     assert inp_pressures <= mess_pressures
     assert inp_tunit == tunit
     assert inp_punit == punit
 
-    # Loop over the pressures obtained from the MESS output
-    for pressure in mess_pressures:
-
-        # Read the rate constants
-        if pressure == 'high':
-            rate_ks = mess_io.reader.highp_ks(
-                output_string, rct_lab, prd_lab)
-        else:
-            rate_ks = mess_io.reader.pdep_ks(
-                output_string, rct_lab, prd_lab, pressure)
-
-        # Store in a dictionary
-        calc_k_dct[pressure] = rate_ks
+    # Get the rate constants for all pressures from the table, falling
+    # back on reading them from the output string if the table lacks them
+    chn_idx = rate_tab['chn_idxs'].get((rct_lab, prd_lab))
+    if chn_idx is not None and not numpy.isnan(rate_tab['ks'][chn_idx]).all():
+        calc_ks = rate_tab['ks'][chn_idx]
+    else:
+        output_string = rate_tab['output_string']
+        calc_ks = []
+        for pressure in mess_pressures:
+            if pressure == 'high':
+                rate_ks = mess_io.reader.highp_ks(
+                    output_string, rct_lab, prd_lab)
+            else:
+                rate_ks = mess_io.reader.pdep_ks(
+                    output_string, rct_lab, prd_lab, pressure)
+            calc_ks.append([_to_float(kval) for kval in rate_ks])
+        calc_ks = numpy.array(calc_ks, dtype=float)
 
     # Remove k(T) vals at each P where where k is negative or undefined
     # If ANY valid k(T,P) vals at given pressure, store in dct
     print('\nRemoving invalid k(T,P)s from MESS output that are either:\n',
           '  (1) negative, (2) undefined [***], or (3) below 10**(-21) if',
           'reaction is bimolecular')
-    for pressure, calc_ks in calc_k_dct.items():
-        filtered_temps, filtered_ks = ratefit.fit.get_valid_tk(
-            mess_temps, calc_ks, bimol)
-        if filtered_ks.size > 0:
-            valid_calc_tk_dct[pressure] = [filtered_temps, filtered_ks]
+    temps = numpy.array(mess_temps, dtype=float)
+    with numpy.errstate(invalid='ignore'):
+        valid = numpy.isfinite(calc_ks) & (calc_ks > 0.0)
+        if bimol:
+            valid &= (calc_ks > 1.0e-21)
+    for pidx, pressure in enumerate(mess_pressures):
+        if valid[pidx].any():
+            valid_calc_tk_dct[pressure] = [
+                temps[valid[pidx]], calc_ks[pidx][valid[pidx]]]
 
     # Filter the ktp dictionary by assessing the presure dependence
     if valid_calc_tk_dct:
@@ -4,10 +4,12 @@ Write and Read MESS files for Rates
 
 import importlib
 import copy
+import multiprocessing
 import ioformat
 import automol
 import mess_io
 from mess_io.writer import rxnchan_header_str
+from lib.submission import set_nprocs
 from routines.pf.models import blocks
 from routines.pf.models import build
 from routines.pf.models.ene import set_reference_ene
@@ -85,7 +87,7 @@ def make_global_etrans_str(rxn_lst, spc_dct, etrans_dct):
 # Reaction Channel Writers for the PES
 def make_pes_mess_str(spc_dct, rxn_lst, pes_idx,
                       run_prefix, save_prefix, label_dct,
-                      model_dct, thy_dct):
+                      model_dct, thy_dct, nprocs=1):
     """ Write all the MESS input file strings for the reaction channels
     """
 
@@ -103,37 +105,21 @@ def make_pes_mess_str(spc_dct, rxn_lst, pes_idx,
     ref_ene, ref_model = set_reference_ene(
         rxn_lst, spc_dct, thy_dct, model_dct,
         run_prefix, save_prefix, ref_idx=0)
+
+    # Gather the data for all of the channels, in parallel if requested
+    chnl_infs_lst = get_pes_channel_data(
+        rxn_lst, pes_idx, spc_dct, model_dct, thy_dct, ref_model,
+        run_prefix, save_prefix, nprocs=nprocs)
+
     # Loop over all the channels and write the MESS strings
     written_labels = []
-    basis_energy_dct = {}
-    for rxn in rxn_lst:
-
-        print('\n\nReading PES electronic structure data ' +
-              'from save filesystem for')
-        print('Channel {}: {} = {}...'.format(
-            rxn['chn_idx'],
-            '+'.join(rxn['reacs']),
-            '+'.join(rxn['prods'])))
+    for rxn, chnl_infs in zip(rxn_lst, chnl_infs_lst):
 
         # Set the TS name and channel model
         tsname = 'ts_{:g}_{:g}'.format(pes_idx, rxn['chn_idx'])
         chn_model = rxn['model'][1]
-
-        # Obtain useful info objects
-        pf_info = set_pf_info(model_dct, thy_dct, chn_model, ref_model)
         ts_cls_info = set_ts_cls_info(spc_dct, model_dct, tsname, chn_model)
 
-        # Obtain all of the species data
-        if not chn_model in basis_energy_dct:
-            basis_energy_dct[chn_model] = {}
-
-        chnl_infs, chn_basis_ene_dct = get_channel_data(rxn, tsname, spc_dct,
-                                     basis_energy_dct[chn_model],
-                                     pf_info, ts_cls_info,
-                                     run_prefix, save_prefix)
-
-        basis_energy_dct[chn_model].update(chn_basis_ene_dct)
-
         # Calculate the relative energies of all spc on the channel
         chnl_enes = calc_channel_enes(chnl_infs, ref_ene,
                                       chn_model, ref_model)
@@ -458,62 +444,103 @@ def _make_fake_mess_strs(rxn, side, fake_inf_dcts,
 
 
 # Data Retriever Functions
-def get_channel_data(rxn, tsname, spc_dct, model_basis_energy_dct, pf_info, ts_cls_info,
-                     run_prefix, save_prefix):
-    """ generate dcts with the models
+def get_pes_channel_data(rxn_lst, pes_idx, spc_dct, model_dct, thy_dct,
+                         ref_model, run_prefix, save_prefix, nprocs=1):
+    """ generate the dcts with the models for all of the channels of a PES;
+        the data for each species shared between channels is read once and,
+        for nprocs > 1, the species and TSs are read in a pool of processes
+    """
+
+    # Set the data jobs for the unique species and the TSs of the channels
+    jobs, job_keys = [], []
+    for rxn in rxn_lst:
+        tsname = 'ts_{:g}_{:g}'.format(pes_idx, rxn['chn_idx'])
+        chn_model = rxn['model'][1]
+        pf_info = set_pf_info(model_dct, thy_dct, chn_model, ref_model)
+        ts_cls_info = set_ts_cls_info(spc_dct, model_dct, tsname, chn_model)
+        for rgt in rxn['reacs'] + rxn['prods']:
+            if (chn_model, rgt) not in job_keys:
+                job_keys.append((chn_model, rgt))
+                jobs.append(('spc', rgt, None, pf_info, None))
+        job_keys.append((chn_model, tsname))
+        jobs.append(('ts', tsname, rxn, pf_info, ts_cls_info))
+
+    # Read the data for all the species and TSs
+    if nprocs is not None and nprocs > 1 and len(jobs) > 1:
+        print('\nReading data for {} species and TSs with {} processes'.format(
+            len(jobs), set_nprocs(nprocs)))
+        args_lst = [job + (spc_dct, {}, run_prefix, save_prefix)
+                    for job in jobs]
+        with multiprocessing.Pool(processes=set_nprocs(nprocs)) as pool:
+            infs = pool.starmap(_read_data, args_lst)
+    else:
+        infs, basis_energy_dct = [], {}
+        for (chn_model, _), job in zip(job_keys, jobs):
+            infs.append(_read_data(
+                *job, spc_dct, basis_energy_dct.setdefault(chn_model, {}),
+                run_prefix, save_prefix))
+    inf_dct = dict(zip(job_keys, infs))
+
+    # Assemble the dcts for each channel in order
+    chnl_infs_lst = []
+    for rxn in rxn_lst:
+        tsname = 'ts_{:g}_{:g}'.format(pes_idx, rxn['chn_idx'])
+        chn_model = rxn['model'][1]
+        [ts_class, _, _, _, _] = set_ts_cls_info(
+            spc_dct, model_dct, tsname, chn_model)
+        chn_pf_models = set_pf_info(
+            model_dct, thy_dct, chn_model, ref_model)[1]
+
+        # Set the data for the reactants, products and TS
+        chnl_infs = {}
+        for side in ('reacs', 'prods'):
+            chnl_infs[side] = [copy.deepcopy(inf_dct[(chn_model, rgt)])
+                               for rgt in rxn[side]]
+        chnl_infs['ts'] = inf_dct[(chn_model, tsname)]
+        chnl_infs['ts']['symm_barrier'] = any(
+            side in rxn['dummy'] for side in ('reacs', 'prods'))
+
+        # Set up the info for the wells
+        rwell_model = chn_pf_models['rwells']
+        if need_fake_wells(ts_class, rwell_model):
+            chnl_infs['fake_vdwr'] = copy.deepcopy(chnl_infs['reacs'])
+        pwell_model = chn_pf_models['pwells']
+        if need_fake_wells(ts_class, pwell_model):
+            chnl_infs['fake_vdwp'] = copy.deepcopy(chnl_infs['prods'])
+
+        chnl_infs_lst.append(chnl_infs)
+
+    return chnl_infs_lst
+
+
+def _read_data(job, name, rxn, pf_info, ts_cls_info,
+               spc_dct, chn_basis_ene_dct, run_prefix, save_prefix):
+    """ read the data for a species or the TS of a channel
     """
 
     # Unpack info objects
     [chn_pf_levels, chn_pf_models, ref_pf_levels, ref_pf_models] = pf_info
-    [ts_class, ts_sadpt, ts_nobarrier, _, _] = ts_cls_info
-
-    # Initialize the dict
-    chnl_infs = {}
 
-    # Initialize the symm_barrier variable for TS
-    symm_barrier = False
-
-    # Determine the MESS data for the reactants and products
-    # Gather data or set fake information for dummy reactants/products
-    chnl_infs['reacs'], chnl_infs['prods'] = [], []
-    for side in ('reacs', 'prods'):
-        for rgt in rxn[side]:
-            chnl_infs_i, model_basis_energy_dct = build.read_spc_data(
-                spc_dct, rgt,
-                chn_pf_models, chn_pf_levels,
-                run_prefix, save_prefix, model_basis_energy_dct,
-                ref_pf_models=ref_pf_models,
-                ref_pf_levels=ref_pf_levels)
-            chnl_infs[side].append(chnl_infs_i)
-        if side in rxn['dummy']:
-            symm_barrier = True
-            # for _ in range(len(rxn[side])):
-            #     chnl_infs[side].append({'ene_chnlvl': 0.00})
-
-    # Set up data for TS
-    chnl_infs['ts'] = []
-    chnl_infs['ts'], model_basis_energy_dct = build.read_ts_data(
-        spc_dct, tsname, rxn['reacs'], rxn['prods'],
-        chn_pf_models, chn_pf_levels,
-        run_prefix, save_prefix, model_basis_energy_dct,
-        ts_class, ts_sadpt, ts_nobarrier,
-        ref_pf_models=ref_pf_models, ref_pf_levels=ref_pf_levels)
-
-    # if chnl_infs['ts']['writer'] in ('pst_block', 'vrctst_block'):
-    #     if len(chnl_infs['reacs']) == 2:
-    #         ts_ene = sum(inf['ene_chnlvl'] for inf in chnl_infs['reacs'])
-    #     else: 
-    #         ts_ene = sum(inf['ene_chnlvl'] for inf in chnl_infs['prods'])
-    #     chnl_infs['ts'].update({'ene_chnlvl': ts_ene})
-
-    chnl_infs['ts']['symm_barrier'] = symm_barrier
-
-    # Set up the info for the wells
-    rwell_model = chn_pf_models['rwells']
-    if need_fake_wells(ts_class, rwell_model):
-        chnl_infs['fake_vdwr'] = copy.deepcopy(chnl_infs['reacs'])
-    pwell_model = chn_pf_models['pwells']
-    if need_fake_wells(ts_class, pwell_model):
-        chnl_infs['fake_vdwp'] = copy.deepcopy(chnl_infs['prods'])
-
-    return chnl_infs, model_basis_energy_dct
+    if job == 'spc':
+        inf_dct, _ = build.read_spc_data(
+            spc_dct, name,
+            chn_pf_models, chn_pf_levels,
+            run_prefix, save_prefix, chn_basis_ene_dct,
+            ref_pf_models=ref_pf_models,
+            ref_pf_levels=ref_pf_levels)
+    else:
+        [ts_class, ts_sadpt, ts_nobarrier, _, _] = ts_cls_info
+        print('\n\nReading PES electronic structure data ' +
+              'from save filesystem for')
+        print('Channel {}: {} = {}...'.format(
+            rxn['chn_idx'],
+            '+'.join(rxn['reacs']),
+            '+'.join(rxn['prods'])))
+        inf_dct, _ = build.read_ts_data(
+            spc_dct, name, rxn['reacs'], rxn['prods'],
+            chn_pf_models, chn_pf_levels,
+            run_prefix, save_prefix, chn_basis_ene_dct,
+            ts_class, ts_sadpt, ts_nobarrier,
+            ref_pf_models=ref_pf_models, ref_pf_levels=ref_pf_levels)
+
+    return inf_dct
@@ -0,0 +1,172 @@
+"""
+  Build the partition function data of a species (rotors, frequencies,
+  ZPE, symmetry factor and MESS species block) that does not depend on the
+  energies, memoized by the species, the pf levels and models, and the
+  state of the save filesystem, so the thermo and kTP drivers compute
+  it once for each species shared across channels, PESs and runs
+"""
+
+import os
+from phydat import phycon
+from routines.pf.models import typ
+from routines.pf.models import blocks
+from routines.pf.models import _rot as rot
+from routines.pf.models import _tors as tors
+from routines.pf.models import _sym as sym
+from routines.pf.models import _vib as vib
+from routines.pf.models import _util as util
+from lib import filesys
+from lib.submission import cached_output
+
+
+# Species dct keys the pf data depends on
+SPC_KEYS = ('inchi', 'charge', 'mult', 'elec_levels', 'sym_factor',
+            'hind_inc', 'tors_names', 'class', 'rxn_fs')
+
+
+def pf_data(spc_dct_i, pf_filesystems, pf_models, pf_levels,
+            run_prefix, saddle=False):
+    """ Pull the rotors, freqs, zpe, sym factor and species block
+        of a species from the filesystem, or from the cache if they
+        have been built for the same species, models and levels before
+    """
+
+    def _build():
+        return _pf_data(spc_dct_i, pf_filesystems, pf_models, pf_levels,
+                        run_prefix, saddle=saddle)
+
+    return cached_output(
+        'pfdata',
+        _key_dct(spc_dct_i, pf_filesystems, pf_models, pf_levels, saddle),
+        _build,
+        cache_if=lambda dat_dct: dat_dct['zpe'] is not None)
+
+
+def _pf_data(spc_dct_i, pf_filesystems, pf_models, pf_levels,
+             run_prefix, saddle=False):
+    """ Build the pf data of a species from the filesystem
+    """
+
+    # Initialize all of the elements of the dct
+    imag, allr_str, mdhr_dat = None, '', ''
+    xmat, rovib_coups, rot_dists = None, None, None
+
+    # Set information for transition states
+    [cnf_fs, _, min_cnf_locs, _, _] = pf_filesystems['harm']
+    frm_bnd_keys, brk_bnd_keys = util.get_bnd_keys(
+        cnf_fs, min_cnf_locs, saddle)
+    rxn_class = util.set_rxn_class(spc_dct_i, saddle)
+
+    # Obtain rotor information used to determine new information
+    print('\nPreparing internal rotor info building partition functions...')
+    rotors = tors.build_rotors(
+        spc_dct_i, pf_filesystems, pf_models, pf_levels,
+        rxn_class=rxn_class,
+        frm_bnd_keys=frm_bnd_keys, brk_bnd_keys=brk_bnd_keys)
+    if typ.nonrigid_tors(pf_models, rotors):
+        run_path = filesys.models.make_run_path(pf_filesystems, 'tors')
+        tors_strs = tors.make_hr_strings(
+            rotors, run_path, pf_models['tors'],
+            )
+        [allr_str, hr_str, _, prot_str, mdhr_dat] = tors_strs
+
+    # Obtain rotation partition function information
+    print('\nObtaining info for rotation partition function...')
+    geom = rot.read_geom(pf_filesystems)
+
+    if typ.nonrigid_rotations(pf_models):
+        rovib_coups, rot_dists = rot.read_rotational_values(pf_filesystems)
+
+    # Obtain vibration partition function information
+    print('\nObtaining the vibrational frequencies and zpves...')
+    if typ.nonrigid_tors(pf_models, rotors):
+        # Calculate initial proj. freqs, unproj. imag, tors zpe and scale fact
+        freqs, imag, tors_zpe, pot_scalef = vib.tors_projected_freqs_zpe(
+            pf_filesystems, hr_str, prot_str, run_prefix, saddle=saddle)
+        # Make final hindered rotor strings and get corrected tors zpe
+        if typ.scale_1d(pf_models):
+            tors_strs = tors.make_hr_strings(
+                rotors, run_path, pf_models['tors'],
+                scale_factor=pot_scalef)
+            [allr_str, hr_str, _, prot_str, mdhr_dat] = tors_strs
+            _, _, tors_zpe, _ = vib.tors_projected_freqs_zpe(
+                pf_filesystems, hr_str, prot_str, run_prefix, saddle=saddle)
+            # Calculate current zpe assuming no freq scaling: tors+projfreq
+        zpe = tors_zpe + (sum(freqs) / 2.0) * phycon.WAVEN2EH
+
+        # For mdhrv model no freqs needed in MESS input, zero out freqs lst
+        if 'mdhrv' in pf_models['tors']:
+            freqs = ()
+    else:
+        freqs, imag, zpe = vib.read_harmonic_freqs(
+            pf_filesystems, saddle=saddle)
+        tors_zpe = 0.0
+
+    # Scale the frequencies
+    if freqs:
+        freqs, zpe = vib.scale_frequencies(
+            freqs, tors_zpe, pf_levels, scale_method='3c')
+
+    if typ.anharm_vib(pf_models):
+        xmat = vib.read_anharmon_matrix(pf_filesystems)
+
+    # Obtain symmetry factor
+    print('\nDetermining the symmetry factor...')
+    sym_factor = sym.symmetry_factor(
+        pf_filesystems, pf_models, spc_dct_i, rotors,
+        frm_bnd_keys=frm_bnd_keys, brk_bnd_keys=brk_bnd_keys)
+
+    # Obtain electronic energy levels
+    elec_levels = spc_dct_i['elec_levels']
+
+    # Create the data dictionary and render the MESS species block
+    keys = ['rotors', 'frm_bnd_keys', 'brk_bnd_keys',
+            'geom', 'sym_factor', 'freqs', 'imag', 'zpe', 'elec_levels',
+            'mess_hr_str', 'mdhr_dat',
+            'xmat', 'rovib_coups', 'rot_dists']
+    vals = [rotors, frm_bnd_keys, brk_bnd_keys,
+            geom, sym_factor, freqs, imag, zpe, elec_levels,
+            allr_str, mdhr_dat,
+            xmat, rovib_coups, rot_dists]
+    dat_dct = dict(zip(keys, vals))
+    dat_dct['mess_block'] = blocks.species_block(dat_dct)
+
+    return dat_dct
+
+
+def _key_dct(spc_dct_i, pf_filesystems, pf_models, pf_levels, saddle):
+    """ Build the dct of strings hashed to the key of the cache
+    """
+
+    key_dct = {
+        'spc': repr([(key, spc_dct_i.get(key)) for key in SPC_KEYS]),
+        'pf_models': repr(sorted(pf_models.items())),
+        'pf_levels': repr(sorted(pf_levels.items())),
+        'saddle': repr(saddle)
+    }
+    states = {}
+    for model, (_, cnf_save_path, min_cnf_locs, _, _) in sorted(
+            pf_filesystems.items()):
+        if cnf_save_path not in states:
+            states[cnf_save_path] = _cnf_state(cnf_save_path)
+        key_dct['fs_'+model] = repr(
+            (cnf_save_path, min_cnf_locs, states[cnf_save_path]))
+
+    return key_dct
+
+
+def _cnf_state(path):
+    """ modification times of the conformer directory and of the entries
+        directly in it: the geometry, Hessian and anharmonic files read
+        for the pf data and the roots of the zmatrix, scan and symmetry
+        filesystems; only this one directory is listed, rather than the
+        whole tree under it
+    """
+    mtimes = ()
+    if path and os.path.isdir(path):
+        mtimes = tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns)
+            for entry in os.scandir(path)))
+        mtimes += (('.', os.stat(path).st_mtime_ns),)
+
+    return mtimes
@@ -2,6 +2,8 @@
   NEW: Handle rotational data info
 """
 
+from lib.filesys import index
+
 
 def read_geom(pf_filesystems):
     """ Read the geometry from the filesys
@@ -12,7 +14,7 @@ def read_geom(pf_filesystems):
 
     # Read the filesys for the geometry
     if min_cnf_locs:
-        geom = cnf_fs[-1].file.geometry.read(min_cnf_locs)
+        geom = index.read(cnf_fs[-1].file.geometry, min_cnf_locs)
         print('Reading geometry from path:')
         print(cnf_path)
     else:
@@ -4,6 +4,7 @@
 import automol
 from autofile import fs
 from lib import structure
+from lib.filesys import index
 
 
 def symmetry_factor(pf_filesystems, pf_models, spc_dct_i, rotors,
@@ -24,7 +25,7 @@ def symmetry_factor(pf_filesystems, pf_models, spc_dct_i, rotors,
 
         # Obtain geometry, energy, and symmetry filesystem
         [cnf_fs, cnf_path, min_cnf_locs, _, _] = pf_filesystems['sym']
-        geo = cnf_fs[-1].file.geometry.read(min_cnf_locs)
+        geo = index.read(cnf_fs[-1].file.geometry, min_cnf_locs)
 
         # Obtain the external symssetry number
         ext_sym = automol.geom.external_symmetry_factor(geo)
@@ -35,8 +36,8 @@ def symmetry_factor(pf_filesystems, pf_models, spc_dct_i, rotors,
             # Set up the symmetry filesystem
             sym_fs = fs.symmetry(cnf_path)
             sym_geos = [geo]
-            sym_geos += [sym_fs[-1].file.geometry.read(locs)
-                         for locs in sym_fs[-1].existing()]
+            sym_geos += [index.read(sym_fs[-1].file.geometry, locs)
+                         for locs in index.existing(sym_fs[-1])]
 
             # Obtain the internal
             if rotors:
@@ -34,9 +34,9 @@ def build_rotors(spc_dct_i, pf_filesystems, pf_models, pf_levels,
     # Grab the zmatrix
     if min_cnf_locs is not None:
         zma_fs = fs.zmatrix(cnf_fs[-1].path(min_cnf_locs))
-        zma = zma_fs[-1].file.zmatrix.read([0])
+        zma = filesys.index.read(zma_fs[-1].file.zmatrix, [0])
         remdummy = geomprep.build_remdummy_shift_lst(zma)
-        geo = cnf_fs[-1].file.geometry.read(min_cnf_locs)
+        geo = filesys.index.read(cnf_fs[-1].file.geometry, min_cnf_locs)
 
         # Read the reference energy
         ref_ene = torsprep.read_tors_ene(
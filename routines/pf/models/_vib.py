@@ -9,6 +9,7 @@ from phydat import phycon
 from lib.structure import tors as torsprep
 from lib.structure import vib as vibprep
 from lib.submission import DEFAULT_SCRIPT_DCT
+from lib.filesys import index
 
 
 def read_harmonic_freqs(pf_filesystems, saddle=False):
@@ -23,8 +24,8 @@ def read_harmonic_freqs(pf_filesystems, saddle=False):
     if min_cnf_locs is not None:
 
         # Obtain geom and freqs from filesys
-        geo = cnf_fs[-1].file.geometry.read(min_cnf_locs)
-        hess = cnf_fs[-1].file.hessian.read(min_cnf_locs)
+        geo = index.read(cnf_fs[-1].file.geometry, min_cnf_locs)
+        hess = index.read(cnf_fs[-1].file.hessian, min_cnf_locs)
         hess_path = cnf_fs[-1].path(min_cnf_locs)
         print(' - Reading Hessian from path {}'.format(hess_path))
 
@@ -100,9 +101,9 @@ def tors_projected_freqs_zpe(pf_filesystems, mess_hr_str, projrot_hr_str,
     tors_run_path = tors_run_fs[-1].path(tors_min_locs)
 
     # Read info from the filesystem that is needed
-    harm_geo = harm_cnf_fs[-1].file.geometry.read(harm_min_locs)
-    hess = harm_cnf_fs[-1].file.hessian.read(harm_min_locs)
-    tors_geo = tors_cnf_fs[-1].file.geometry.read(tors_min_locs)
+    harm_geo = index.read(harm_cnf_fs[-1].file.geometry, harm_min_locs)
+    hess = index.read(harm_cnf_fs[-1].file.hessian, harm_min_locs)
+    tors_geo = index.read(tors_cnf_fs[-1].file.geometry, tors_min_locs)
     hess_path = harm_cnf_fs[-1].path(harm_min_locs)
     print(' - Reading Hessian from path {}'.format(hess_path))
 
@@ -28,6 +28,10 @@ def species_block(inf_dct):
     """ prepare the species input for messpf
     """
 
+    # Use the block rendered with the cached pf data of the species
+    if inf_dct.get('mess_block') is not None:
+        return inf_dct['mess_block']
+
     # Build the data files dct
     dat_dct = {}
 
@@ -19,6 +19,7 @@ from routines.pf.models import _vib as vib
 from routines.pf.models import _flux as flux
 from routines.pf.models import _pst as pst
 from routines.pf.models import _util as util
+from routines.pf.models import _pfdata as pfdata
 from routines.pf.thermo import basis 
 from routines.pf.thermo import heatform
 from lib.structure import tors as torsprep
@@ -245,86 +246,18 @@ def mol_data(spc_name, spc_dct,
     zpe = None
     hf0K_trs = None
 
-    # Initialize all of the elements of the inf dct
-    geom, sym_factor, freqs, imag, elec_levels = None, None, None, None, None
-    allr_str, mdhr_dat = '', ''
-    xmat, rovib_coups, rot_dists = None, None, None
-
     # Set up all the filesystem objects using models and levels
     pf_filesystems = filesys.models.pf_filesys(
         spc_dct_i, chn_pf_levels, run_prefix, save_prefix, saddle)
-
-    # Set information for transition states
     [cnf_fs, _, min_cnf_locs, _, _] = pf_filesystems['harm']
-    # cnf_path = cnf_fs[-1].path(min_cnf_locs)
-    frm_bnd_keys, brk_bnd_keys = util.get_bnd_keys(
-        cnf_fs, min_cnf_locs, saddle)
-    print('bnd keys in mol_data', frm_bnd_keys, brk_bnd_keys)
-    rxn_class = util.set_rxn_class(spc_dct_i, saddle)
-
-    # Obtain rotor information used to determine new information
-    print('\nPreparing internal rotor info building partition functions...')
-    rotors = tors.build_rotors(
-        spc_dct_i, pf_filesystems, chn_pf_models, chn_pf_levels,
-        rxn_class=rxn_class,
-        frm_bnd_keys=frm_bnd_keys, brk_bnd_keys=brk_bnd_keys)
-    print('Frm and brk key in model build', frm_bnd_keys, brk_bnd_keys)
-    if typ.nonrigid_tors(chn_pf_models, rotors):
-        run_path = filesys.models.make_run_path(pf_filesystems, 'tors')
-        tors_strs = tors.make_hr_strings(
-            rotors, run_path, chn_pf_models['tors'],
-            )
-        [allr_str, hr_str, _, prot_str, mdhr_dat] = tors_strs
-
-    # Obtain rotation partition function information
-    print('\nObtaining info for rotation partition function...')
-    geom = rot.read_geom(pf_filesystems)
-
-    if typ.nonrigid_rotations(chn_pf_models):
-        rovib_coups, rot_dists = rot.read_rotational_values(pf_filesystems)
-
-    # Obtain vibration partition function information
-    print('\nObtaining the vibrational frequencies and zpves...')
-    if typ.nonrigid_tors(chn_pf_models, rotors):
-        # Calculate initial proj. freqs, unproj. imag, tors zpe and scale fact
-        freqs, imag, tors_zpe, pot_scalef = vib.tors_projected_freqs_zpe(
-            pf_filesystems, hr_str, prot_str, run_prefix, saddle=saddle)
-        # Make final hindered rotor strings and get corrected tors zpe
-        if typ.scale_1d(chn_pf_models):
-            tors_strs = tors.make_hr_strings(
-                rotors, run_path, chn_pf_models['tors'],
-                scale_factor=pot_scalef)
-            [allr_str, hr_str, _, prot_str, mdhr_dat] = tors_strs
-            _, _, tors_zpe, _ = vib.tors_projected_freqs_zpe(
-                pf_filesystems, hr_str, prot_str, run_prefix, saddle=saddle)
-            # Calculate current zpe assuming no freq scaling: tors+projfreq
-        zpe = tors_zpe + (sum(freqs) / 2.0) * phycon.WAVEN2EH
-
-        # For mdhrv model no freqs needed in MESS input, zero out freqs lst
-        if 'mdhrv' in chn_pf_models['tors']:
-            freqs = ()
-    else:
-        freqs, imag, zpe = vib.read_harmonic_freqs(
-            pf_filesystems, saddle=saddle)
-        tors_zpe = 0.0
 
-    # Scale the frequencies
-    if freqs:
-        freqs, zpe = vib.scale_frequencies(
-            freqs, tors_zpe, chn_pf_levels, scale_method='3c')
-
-    # print('zpe in mol_data test:', zpe)
-    if typ.anharm_vib(chn_pf_models):
-        xmat = vib.read_anharmon_matrix(pf_filesystems)
-
-    # Obtain symmetry factor
-    print('\nDetermining the symmetry factor...')
-    sym_factor = sym.symmetry_factor(
-        pf_filesystems, chn_pf_models, spc_dct_i, rotors,
-        frm_bnd_keys=frm_bnd_keys, brk_bnd_keys=brk_bnd_keys)
-
-    # Obtain electronic energy levels
-    elec_levels = spc_dct_i['elec_levels']
+    # Obtain the rotors, freqs, zpe, sym factor and species block
+    dat_dct = pfdata.pf_data(
+        spc_dct_i, pf_filesystems, chn_pf_models, chn_pf_levels,
+        run_prefix, saddle=saddle)
+    frm_bnd_keys = dat_dct['frm_bnd_keys']
+    brk_bnd_keys = dat_dct['brk_bnd_keys']
+    geom, zpe = dat_dct['geom'], dat_dct['zpe']
 
     # Obtain energy levels
     print('\nObtaining the electronic energy + zpve...')
@@ -467,15 +400,13 @@ def mol_data(spc_name, spc_dct,
     # Create info dictionary
     keys = ['geom', 'sym_factor', 'freqs', 'imag', 'elec_levels',
             'mess_hr_str', 'mdhr_dat',
-            'xmat', 'rovib_coups', 'rot_dists',
-            'ene_chnlvl', 'ene_reflvl', 'zpe_chnlvl', 'ene_tsref',
+            'xmat', 'rovib_coups', 'rot_dists', 'mess_block']
+    inf_dct = {key: dat_dct[key] for key in keys}
+    keys = ['ene_chnlvl', 'ene_reflvl', 'zpe_chnlvl', 'ene_tsref',
             'edown_str', 'collid_freq_str']
-    vals = [geom, sym_factor, freqs, imag, elec_levels,
-            allr_str, mdhr_dat,
-            xmat, rovib_coups, rot_dists,
-            ene_chnlvl, ene_reflvl, zpe, hf0K_trs,
+    vals = [ene_chnlvl, ene_reflvl, zpe, hf0K_trs,
             edown_str, collid_freq_str]
-    inf_dct = dict(zip(keys, vals))
+    inf_dct.update(dict(zip(keys, vals)))
 
     return inf_dct, chn_basis_ene_dct
 
@@ -727,8 +658,10 @@ def tau_data(spc_dct_i,
 
     # Get the conformer filesys for the reference geom and energy
     if harm_min_locs:
-        geom = harm_cnf_fs[-1].file.geometry.read(harm_min_locs)
-        min_ene = harm_cnf_fs[-1].file.energy.read(harm_min_locs)
+        geom = filesys.index.read(
+            harm_cnf_fs[-1].file.geometry, harm_min_locs)
+        min_ene = filesys.index.read(
+            harm_cnf_fs[-1].file.energy, harm_min_locs)
 
     # Set the filesystem
     tau_save_fs = autofile.fs.tau(harm_save)
@@ -760,14 +693,15 @@ def tau_data(spc_dct_i,
     reference_energy = harm_zpve * phycon.EH2KCAL
     if vib_model == 'tau':
         if db_style == 'directory':
-            tau_locs = [locs for locs in tau_save_fs[-1].existing()
+            tau_locs = [locs
+                        for locs in filesys.index.existing(tau_save_fs[-1])
                         if tau_save_fs[-1].file.hessian.exists(locs)]
         elif db_style == 'jsondb':
             tau_locs = [locs for locs in tau_save_fs[-1].json_existing()
                         if tau_save_fs[-1].json.hessian.exists(locs)]
     else:
         if db_style == 'directory':
-            tau_locs = tau_save_fs[-1].existing()
+            tau_locs = filesys.index.existing(tau_save_fs[-1])
         elif db_style == 'jsondb':
             tau_locs = tau_save_fs[-1].json_existing()
 
@@ -779,7 +713,7 @@ def tau_data(spc_dct_i,
         #     tau_save_fs[-1].path(locs)))
 
         if db_style == 'directory':
-            geo = tau_save_fs[-1].file.geometry.read(locs)
+            geo = filesys.index.read(tau_save_fs[-1].file.geometry, locs)
         elif db_style == 'jsondb':
             geo = tau_save_fs[-1].json.geometry.read(locs)
 
@@ -787,7 +721,7 @@ def tau_data(spc_dct_i,
         samp_geoms.append(geo_str)
 
         if db_style == 'directory':
-            tau_ene = tau_save_fs[-1].file.energy.read(locs)
+            tau_ene = filesys.index.read(tau_save_fs[-1].file.energy, locs)
         elif db_style == 'jsondb':
             tau_ene = tau_save_fs[-1].json.energy.read(locs)
         rel_ene = (tau_ene - min_ene) * phycon.EH2KCAL
@@ -796,14 +730,16 @@ def tau_data(spc_dct_i,
 
         if vib_model == 'tau':
             if db_style == 'directory':
-                grad = tau_save_fs[-1].file.gradient.read(locs)
+                grad = filesys.index.read(
+                    tau_save_fs[-1].file.gradient, locs)
             elif db_style == 'jsondb':
                 grad = tau_save_fs[-1].json.gradient.read(locs)
             grad_str = autofile.data_types.swrite.gradient(grad)
             samp_grads.append(grad_str)
 
             if db_style == 'directory':
-                hess = tau_save_fs[-1].file.hessian.read(locs)
+                hess = filesys.index.read(
+                    tau_save_fs[-1].file.hessian, locs)
             elif db_style == 'jsondb':
                 hess = tau_save_fs[-1].json.hessian.read(locs)
             hess_str = autofile.data_types.swrite.hessian(hess)
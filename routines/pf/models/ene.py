@@ -7,11 +7,10 @@ import autofile
 from phydat import phycon
 from routines.pf import thermo as thmroutines
 from routines.pf.models import typ
-from routines.pf.models import _tors as tors
-from routines.pf.models import _vib as vib
-from routines.pf.models import _util as util
+from routines.pf.models import _pfdata as pfdata
 from lib.filesys import inf as finf
 from lib.filesys import models as fmod
+from lib.filesys import index as findex
 from lib.amech_io import parser
 
 
@@ -77,7 +76,8 @@ def electronic_energy(spc_dct_i, pf_filesystems, pf_levels):
             sp_path = sp_save_fs[-1].path(mod_thy_info[1:4])
             if os.path.exists(sp_path):
                 print('Energy read from path {}'.format(sp_path))
-                ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
+                ene = findex.read(
+                    sp_save_fs[-1].file.energy, mod_thy_info[1:4])
                 e_elec += (coeff * ene)
             else:
                 print('No energy at path')
@@ -96,13 +96,6 @@ def zero_point_energy(spc_dct_i,
 
     print('- Calculating zero-point energy')
 
-    # spc_dct_i = spc_dct[spc_name]
-    [cnf_fs, _, min_cnf_locs, _, _] = pf_filesystems['harm']
-    frm_bnd_keys, brk_bnd_keys = util.get_bnd_keys(
-        cnf_fs, min_cnf_locs, saddle)
-    # frm_bnd_keys, brk_bnd_keys = util.get_bnd_keys(spc_dct_i, saddle)
-    rxn_class = util.set_rxn_class(spc_dct_i, saddle)
-
     # Calculate ZPVE
     is_atom = False
     if not saddle:
@@ -111,47 +104,10 @@ def zero_point_energy(spc_dct_i,
     if is_atom:
         zpe = 0.0
     else:
-        rotors = tors.build_rotors(
+        zpe = pfdata.pf_data(
             spc_dct_i, pf_filesystems, pf_models, pf_levels,
-            rxn_class=rxn_class,
-            frm_bnd_keys=frm_bnd_keys, brk_bnd_keys=brk_bnd_keys)
-
-        if typ.nonrigid_tors(pf_models, rotors):
-            run_path = fmod.make_run_path(pf_filesystems, 'tors')
-            tors_strs = tors.make_hr_strings(
-                rotors, run_path, pf_models['tors'],
-                )
-            [_, hr_str, _, prot_str, _] = tors_strs
-
-        if typ.nonrigid_tors(pf_models, rotors):
-            # Calculate init proj. freqs, unproj. imag, tors zpe and scale fact
-            freqs, _, tors_zpe, pot_scalef = vib.tors_projected_freqs_zpe(
-                pf_filesystems, hr_str, prot_str, run_prefix, saddle=saddle)
-            # Make final hindered rotor strings and get corrected tors zpe
-            if typ.scale_1d(pf_models):
-                tors_strs = tors.make_hr_strings(
-                    rotors, run_path, pf_models['tors'],
-                    scale_factor=pot_scalef)
-                [_, hr_str, _, prot_str, _] = tors_strs
-                _, _, tors_zpe, _ = vib.tors_projected_freqs_zpe(
-                    pf_filesystems, hr_str, prot_str, run_prefix, saddle=saddle)
-                # Calculate current zpe assuming no freq scaling: tors+projfreq
-            zpe = tors_zpe + (sum(freqs) / 2.0) * phycon.WAVEN2EH
-
-            # For mdhrv model no freqs needed in MESS input, zero out freqs lst
-            if 'mdhrv' in pf_models['tors']:
-                freqs = ()
-        else:
-            freqs, _, zpe = vib.read_harmonic_freqs(
-                pf_filesystems, saddle=saddle)
-            tors_zpe = 0.0
-
-        # Scale the frequencies
-        if freqs:
-            freqs, zpe = vib.scale_frequencies(
-                freqs, tors_zpe, pf_levels, scale_method='3c')
+            run_prefix, saddle=saddle)['zpe']
 
-        # print('zpe in zero_point_energy test:', zpe, freqs)
     return zpe
 
 
@@ -11,6 +11,7 @@ from routines.pf.runner.mess import read_mess_file
 from routines.pf.runner.mess import read_messpf_temps
 from routines.pf.runner.mess import run_rates
 from routines.pf.runner.mess import run_pf
+from routines.pf.runner.mess import run_pfs
 from routines.pf.runner.thermo import thermo_paths
 from routines.pf.runner.thermo import run_thermp
 from routines.pf.runner.thermo import run_pac
@@ -27,6 +28,7 @@ __all__ = [
     'read_messpf_temps',
     'run_rates',
     'run_pf',
+    'run_pfs',
     'thermo_paths',
     'run_thermp',
     'run_pac',
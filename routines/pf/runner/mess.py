@@ -3,11 +3,13 @@
 """
 
 import os
+import sys
 import numpy
 import automol
 import mess_io
 from lib.submission import run_script
 from lib.submission import DEFAULT_SCRIPT_DCT
+from lib.submission import run_locked_procs
 
 
 # OBTAIN THE PATH TO THE DIRECTORY CONTAINING THE TEMPLATES #
@@ -219,3 +221,30 @@ def run_pf(mess_path, script_str=DEFAULT_SCRIPT_DCT['messpf']):
         run_script(script_str, mess_path)
     else:
         print('No MESS input file at path: {}'.format(mess_path))
+
+
+def run_pfs(mess_paths, nprocs=1, script_str=DEFAULT_SCRIPT_DCT['messpf']):
+    """ Run the mess files written at several paths, each in its own
+        process with at most nprocs running at once
+    """
+    mess_paths = list(dict.fromkeys(mess_paths))
+    if nprocs is not None and nprocs > 1 and len(mess_paths) > 1:
+        exit_codes = run_locked_procs(
+            _run_pf_proc, [(path, script_str) for path in mess_paths],
+            nprocs=nprocs)
+        if any(code != 0 for code in exit_codes):
+            print('killing AutoMech:')
+            sys.exit()
+    else:
+        for path in mess_paths:
+            run_pf(path, script_str=script_str)
+
+
+def _run_pf_proc(mess_path, script_str):
+    """ Run a mess file in a child process, exiting with an error
+        code if the run failed
+    """
+    try:
+        run_pf(mess_path, script_str=script_str)
+    except SystemExit:
+        sys.exit(1)
@@ -38,8 +38,8 @@ def run_thermp(pf_path, thermp_path,
     assert os.path.exists(thermp_file), 'ThermP file does not exist'
     assert os.path.exists(pf_outfile), 'PF file does not exist'
 
-    # Run thermp
-    subprocess.check_call(['thermp', thermp_file])
+    # Run thermp in its directory
+    subprocess.check_call(['thermp', thermp_file], cwd=thermp_path)
 
 
 def run_pac(formula, nasa_path):
@@ -63,7 +63,7 @@ def run_pac(formula, nasa_path):
     assert os.path.exists(newgroups_file)
 
     # Run pac99
-    proc = subprocess.Popen('pac99', stdin=subprocess.PIPE)
+    proc = subprocess.Popen('pac99', stdin=subprocess.PIPE, cwd=nasa_path)
     proc.communicate(bytes(formula, 'utf-8'))
 
     # Check to see if pac99 does not have error message
@@ -6,6 +6,8 @@ from routines.pf.thermo import qt
 from routines.pf.thermo import basis
 from routines.pf.thermo import heatform
 from routines.pf.thermo import nasapoly
+from routines.pf.thermo import nasafit
+from routines.pf.thermo import pfcomb
 
 
 __all__ = [
@@ -13,4 +15,6 @@ __all__ = [
     'basis',
     'heatform',
     'nasapoly',
+    'nasafit',
+    'pfcomb',
 ]
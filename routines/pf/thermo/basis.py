@@ -3,10 +3,7 @@
 """
 
 import sys
-import os
-import math
 import multiprocessing
-import random
 
 import automol.inchi
 import automol.geom
@@ -14,6 +11,7 @@ from routines.pf.models.ene import read_energy
 from routines.pf.thermo import heatform
 from phydat import phycon
 from lib import filesys
+from lib.submission import set_nprocs
 
 
 # FUNCTIONS TO PREPARE THE LIST OF REFERENCE SPECIES NEEDED FOR THERM CALCS #
@@ -47,175 +45,170 @@ IMPLEMENTED_CBH_TS_CLASSES = ['hydrogen abstraction high',
 #IMPLEMENTED_CBH_TS_CLASSES = []
                               # 'hydrogen migration', 'addition high', 'elimination high']
 
-def prepare_refs(ref_scheme, spc_dct, spc_queue, repeats=False, parallel=False, ts_geom=None):
-    """ add refs to species list as necessary
+def prepare_refs(ref_scheme, spc_dct, spc_queue, repeats=False, parallel=False,
+                 ts_geom=None, nprocs=None):
+    """ add refs to species list as necessary; with parallel, the bases of
+        the species are determined in a pool of up to nprocs processes, and
+        the unique references are then named in the order of the queue
     """
     spc_names = [spc[0] for spc in spc_queue]
 
-    if parallel:
-        nproc_avail = len(os.sched_getaffinity(0)) - 1
+    if parallel and len(spc_names) > 1:
+        nprocs = min(set_nprocs(nprocs), len(spc_names))
+        chunksize = max(1, len(spc_names) // (4 * nprocs))
+        print('Preparing references for {} species with {} processes'.format(
+            len(spc_names), nprocs))
+        with multiprocessing.Pool(processes=nprocs,
+                                  initializer=_set_pool_spc_dct,
+                                  initargs=(spc_dct,)) as pool:
+            bases = pool.starmap(
+                _pool_species_basis,
+                [(ref_scheme, spc_name, ts_geom) for spc_name in spc_names],
+                chunksize=chunksize)
+    else:
+        bases = [_species_basis(ref_scheme, spc_dct, spc_name, ts_geom)
+                 for spc_name in spc_names]
 
-        num_spc = len(spc_names)
-        spc_per_proc = math.floor(num_spc / nproc_avail)
+    return _unique_refs(spc_dct, spc_names, bases, repeats=repeats)
 
-        queue = multiprocessing.Queue()
-        procs = []
-        random.shuffle(spc_names)
-        for proc_n in range(nproc_avail):
-            spc_start = proc_n*spc_per_proc
-            if proc_n == nproc_avail - 1:
-                spc_end = num_spc
-            else:
-                spc_end = (proc_n+1)*spc_per_proc
-
-            spc_lst = spc_names[spc_start:spc_end]
-
-            proc = multiprocessing.Process(
-                target=_prepare_refs,
-                args=(queue, ref_scheme, spc_dct, spc_lst,
-                      repeats, parallel, ts_geom))
-            procs.append(proc)
-            proc.start()
-
-        basis_dct = {}
-        unique_refs_dct = {}
-        for _ in procs:
-            bas_dct, unq_dct = queue.get()
-            basis_dct.update(bas_dct)
-            bas_ichs = [unique_refs_dct[spc]['inchi'] if 'inchi' in unique_refs_dct[spc]
-                        else unique_refs_dct['reacs'] for spc in unique_refs_dct.keys()]
-            for spc in unq_dct:
-                new_ich = unq_dct[spc]['inchi'] if 'inchi' in unq_dct[spc] else unq_dct[spc]['reacs']
-                if new_ich not in bas_ichs:
-                    cnt = len(list(unique_refs_dct.keys())) + 1
-                    if isinstance(new_ich, str):
-                        ref_name = 'REF_{}'.format(cnt)
-                        unique_refs_dct[ref_name] = unq_dct[spc]
-                    else:
-                        ref_name = 'TS_REF_{}'.format(cnt)
-                        unique_refs_dct[ref_name] = unq_dct[spc]
-        for proc in procs:
-            proc.join()
-    else:
-        basis_dct, unique_refs_dct = _prepare_refs(
-            None, ref_scheme, spc_dct, spc_names, repeats=repeats, parallel=parallel,
-            ts_geom=ts_geom)
-    return basis_dct, unique_refs_dct
 
-def _prepare_refs(queue, ref_scheme, spc_dct, spc_names, repeats=False, parallel=False,
-                  ts_geom=None):
-    print('Processor {} will prepare species: {}'.format(os.getpid(), ', '.join(spc_names)))
-    spc_ichs = [spc_dct[spc]['inchi'] for spc in spc_names]
-    dct_ichs = [spc_dct[spc]['inchi'] for spc in spc_dct.keys()
-                if spc != 'global' and 'ts' not in spc]
+# Species dct of the processes in the pool of prepare_refs
+_POOL_SPC_DCT = {}
+
+
+def _set_pool_spc_dct(spc_dct):
+    """ set the species dct once for each process of the pool
+    """
+    _POOL_SPC_DCT.clear()
+    _POOL_SPC_DCT.update(spc_dct)
+
+
+def _pool_species_basis(ref_scheme, spc_name, ts_geom):
+    """ determine the basis of a species in a process of the pool
+    """
+    return _species_basis(ref_scheme, _POOL_SPC_DCT, spc_name, ts_geom)
+
+
+def _species_basis(ref_scheme, spc_dct, spc_name, ts_geom=None):
+    """ determine the basis species and coefficients for a species, and the
+        filesystem prefixes and class needed to build TS references
+    """
 
     # Determine the function to be used to get the thermochemistry ref species
     if ref_scheme in REF_CALLS:
         get_ref_fxn = getattr(heatform, REF_CALLS[ref_scheme])
     if ref_scheme in TS_REF_CALLS:
         get_ts_ref_fxn = getattr(heatform, TS_REF_CALLS[ref_scheme])
-    #else:
-    #    raise NotImplementedError
 
     # Print the message
     msg = '\nDetermining reference molecules for scheme: {}'.format(ref_scheme)
     msg += '\n'
-
-    basis_dct = {}
-    unique_refs_dct = {}
-    # print('spc dct: ', spc_dct.keys())
-    run_prefix = None
-    save_prefix = None
-    rxnclass = None
-    # Determine the reference species, list of inchis
-    for spc_name, spc_ich in zip(spc_names, spc_ichs):
-        msg += '\nDetermining basis for species: {}'.format(spc_name)
-        if 'class' in spc_dct[spc_name]:
-            print('TS info in basis: ', spc_dct[spc_name].keys())
-            _, _, rxn_run_path, rxn_save_path = spc_dct[spc_name]['rxn_fs']
-            run_prefix = rxn_run_path.split('/RXN')[0]
-            save_prefix = rxn_save_path.split('/RXN')[0]
-            rxnclass = spc_dct[spc_name]['class']
-            if spc_dct[spc_name]['class'] in IMPLEMENTED_CBH_TS_CLASSES and 'basic' not in ref_scheme:
-                if ts_geom and 'elimination' not in spc_dct[spc_name]['class']:
-                    geo, zma, brk_bnd_keys, frm_bnd_keys = ts_geom
-                    print('zma geo', automol.geom.string(automol.zmatrix.geometry(spc_dct[spc_name]['zma'])))
-                    print('geo geo', automol.geom.string(geo))
-                    print('keys1', frm_bnd_keys, brk_bnd_keys)
-                    print('keys2', spc_dct[spc_name]['frm_bnd_keys'], spc_dct[spc_name]['brk_bnd_keys'])
-                    spc_basis, coeff_basis = get_ts_ref_fxn(
-                        spc_dct[spc_name]['zma'], spc_dct[spc_name]['class'],
-                        frm_bnd_keys, brk_bnd_keys, 
-                        geo=geo, backup_zma=zma, backup_frm_key=spc_dct[spc_name]['frm_bnd_keys'],
-                        backup_brk_key=spc_dct[spc_name]['brk_bnd_keys'])
-                else:
-                    print('bond keys in basis', spc_dct[spc_name]['frm_bnd_keys'],
-                          spc_dct[spc_name]['brk_bnd_keys'])
-                    print(automol.geom.string(automol.zmatrix.geometry(
-                        spc_dct[spc_name]['zma'])))
-                    spc_basis, coeff_basis = get_ts_ref_fxn(
-                        spc_dct[spc_name]['zma'], spc_dct[spc_name]['class'],
-                        spc_dct[spc_name]['frm_bnd_keys'],
-                        spc_dct[spc_name]['brk_bnd_keys'])
+    msg += '\nDetermining basis for species: {}'.format(spc_name)
+
+    ts_inf = None
+    spc_dct_i = spc_dct[spc_name]
+    if 'class' in spc_dct_i:
+        print('TS info in basis: ', spc_dct_i.keys())
+        _, _, rxn_run_path, rxn_save_path = spc_dct_i['rxn_fs']
+        run_prefix = rxn_run_path.split('/RXN')[0]
+        save_prefix = rxn_save_path.split('/RXN')[0]
+        ts_inf = (run_prefix, save_prefix, spc_dct_i['class'])
+        if spc_dct_i['class'] in IMPLEMENTED_CBH_TS_CLASSES and 'basic' not in ref_scheme:
+            if ts_geom and 'elimination' not in spc_dct_i['class']:
+                geo, zma, brk_bnd_keys, frm_bnd_keys = ts_geom
+                print('zma geo', automol.geom.string(automol.zmatrix.geometry(spc_dct_i['zma'])))
+                print('geo geo', automol.geom.string(geo))
+                print('keys1', frm_bnd_keys, brk_bnd_keys)
+                print('keys2', spc_dct_i['frm_bnd_keys'], spc_dct_i['brk_bnd_keys'])
+                spc_basis, coeff_basis = get_ts_ref_fxn(
+                    spc_dct_i['zma'], spc_dct_i['class'],
+                    frm_bnd_keys, brk_bnd_keys,
+                    geo=geo, backup_zma=zma, backup_frm_key=spc_dct_i['frm_bnd_keys'],
+                    backup_brk_key=spc_dct_i['brk_bnd_keys'])
             else:
-                spc_basis = []
-                coeff_basis = []
-                ts_ref_scheme = ref_scheme
-                if '_' in ts_ref_scheme:
-                    ts_ref_scheme = 'cbh' + ref_scheme.split('_')[1]
-                for spc_i in spc_dct[spc_name]['reacs']:
-                    bas_dct_i, _ = prepare_refs(
-                        ts_ref_scheme, spc_dct, [[spc_i, None]])
-                    spc_bas_i, coeff_bas_i = bas_dct_i[spc_i]
-                    for bas_i, c_bas_i in zip(spc_bas_i, coeff_bas_i):
-                        if bas_i not in spc_basis:
-                            spc_basis.append(bas_i)
-                            coeff_basis.append(c_bas_i)
-                        else:
-                            for j, bas_j in enumerate(spc_basis):
-                                if bas_i == bas_j:
-                                    coeff_basis[j] += c_bas_i
+                print('bond keys in basis', spc_dct_i['frm_bnd_keys'],
+                      spc_dct_i['brk_bnd_keys'])
+                print(automol.geom.string(automol.zmatrix.geometry(
+                    spc_dct_i['zma'])))
+                spc_basis, coeff_basis = get_ts_ref_fxn(
+                    spc_dct_i['zma'], spc_dct_i['class'],
+                    spc_dct_i['frm_bnd_keys'],
+                    spc_dct_i['brk_bnd_keys'])
         else:
-            spc_basis, coeff_basis = get_ref_fxn(spc_ich)
-        for i in range(len(spc_basis)):
-            if isinstance(spc_basis[i], str):
-                spc_basis[i] = automol.inchi.add_stereo(spc_basis[i])[0]
+            spc_basis = []
+            coeff_basis = []
+            ts_ref_scheme = ref_scheme
+            if '_' in ts_ref_scheme:
+                ts_ref_scheme = 'cbh' + ref_scheme.split('_')[1]
+            for spc_i in spc_dct_i['reacs']:
+                bas_dct_i, _ = prepare_refs(
+                    ts_ref_scheme, spc_dct, [[spc_i, None]])
+                spc_bas_i, coeff_bas_i = bas_dct_i[spc_i]
+                for bas_i, c_bas_i in zip(spc_bas_i, coeff_bas_i):
+                    if bas_i not in spc_basis:
+                        spc_basis.append(bas_i)
+                        coeff_basis.append(c_bas_i)
+                    else:
+                        for j, bas_j in enumerate(spc_basis):
+                            if bas_i == bas_j:
+                                coeff_basis[j] += c_bas_i
+    else:
+        spc_basis, coeff_basis = get_ref_fxn(spc_dct_i['inchi'])
+    for i in range(len(spc_basis)):
+        if isinstance(spc_basis[i], str):
+            spc_basis[i] = automol.inchi.add_stereo(spc_basis[i])[0]
+
+    msg += '\nInCHIs for basis set:'
+    for base in spc_basis:
+        msg += '\n  {}'.format(base)
+    print(msg)
+
+    return spc_basis, coeff_basis, ts_inf
+
+
+def _unique_refs(spc_dct, spc_names, bases, repeats=False):
+    """ build the basis dct of the species and the dct of the reference
+        species that are not in the species dct, named REF_{n} or TS_REF_{n}
+        in the order they first appear in the bases of the species
+    """
 
-        msg += '\nInCHIs for basis set:'
-        for base in spc_basis:
-            msg += '\n  {}'.format(base)
+    spc_ichs = set(spc_dct[spc].get('inchi') for spc in spc_names)
+    dct_ichs = set(spc_dct[spc]['inchi'] for spc in spc_dct.keys()
+                   if spc != 'global' and 'ts' not in spc)
+
+    basis_dct = {}
+    unique_refs_dct = {}
+    ref_keys = set()
+    for spc_name, (spc_basis, coeff_basis, ts_inf) in zip(spc_names, bases):
 
         # Add to the dct containing info on the species basis
         basis_dct[spc_name] = (spc_basis, coeff_basis)
 
         # Add to the dct with reference dct if it is not in the spc dct
         for ref in spc_basis:
-            bas_ichs = [unique_refs_dct[spc]['inchi'] if 'inchi' in unique_refs_dct[spc]
-                        else unique_refs_dct[spc]['reacs'] for spc in unique_refs_dct.keys()]
-            cnt = len(list(unique_refs_dct.keys())) + 1
+            cnt = len(unique_refs_dct) + 1
             if isinstance(ref, str):
-                if ((ref not in spc_ichs and ref not in dct_ichs)
-                        or repeats) and ref not in bas_ichs:
+                if ref not in ref_keys and (
+                        (ref not in spc_ichs and ref not in dct_ichs)
+                        or repeats):
+                    ref_keys.add(ref)
                     ref_name = 'REF_{}'.format(cnt)
-                    msg += '\nAdding reference species {}, InChI string:{}'.format(
-                        ref, ref_name)
+                    print('Adding reference species {}, InChI string:{}'.format(
+                        ref, ref_name))
                     unique_refs_dct[ref_name] = create_spec(ref)
             else:
-                if (((((ref not in spc_ichs and ref not in dct_ichs) or repeats) and ref not in bas_ichs) or
-                      (ref[::-1] not in spc_ichs and ref[::-1] not in dct_ichs) or repeats) and ref not in bas_ichs[::-1]):
+                ref_key = tuple(tuple(side) for side in ref)
+                if ref_key not in ref_keys:
+                    ref_keys.add(ref_key)
                     ref_name = 'TS_REF_{}'.format(cnt)
-                    msg += '\nAdding reference species {}, InChI string:{}'.format(
-                        ref, ref_name)
+                    print('Adding reference species {}, InChI string:{}'.format(
+                        ref, ref_name))
                     unique_refs_dct[ref_name] = create_ts_spc(
-                        ref, spc_dct, spc_dct[spc_name]['mult'], run_prefix, save_prefix,
-                        rxnclass)
-    print(msg)
-    if parallel:
-        queue.put((basis_dct, unique_refs_dct))
-    else:
-        return basis_dct, unique_refs_dct
+                        ref, spc_dct, spc_dct[spc_name]['mult'], *ts_inf)
+
+    return basis_dct, unique_refs_dct
+
 
- #   return basis_dct, unique_refs_dct
 def create_ts_spc(ref, spc_dct, mult, run_prefix, save_prefix, rxnclass):
     """ add a ts species to the species dictionary
     """
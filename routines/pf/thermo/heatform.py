@@ -2,21 +2,71 @@
 Computes the Heat of Formation at 0 K for a given species
 """
 
-import os
-import csv
+import copy
+import functools
 import numpy as np
 from qcelemental import constants as qcc
 import automol.inchi
 import automol.graph
 from . import util
+from . import refdb
 
 
 # Conversion factors
 KJ2KCAL = qcc.conversion_factor('kJ/mol', 'kcal/mol')
 EH2KCAL = qcc.conversion_factor('hartree', 'kcal/mol')
 
-# Path  the database files (stored in the thermo src directory)
-SRC_PATH = os.path.dirname(os.path.realpath(__file__))
+# Fragmentations of each species by scheme, and the InChIs and graphs of
+# the species and fragments, computed by this process
+_FRAG_CACHE = {}
+_INCHI_CACHE = {}
+_GRAPH_CACHE = {}
+
+
+def _hashable(obj):
+    """ hashable form of a graph, zmatrix or other nested container
+    """
+    if isinstance(obj, dict):
+        ret = frozenset((key, _hashable(val)) for key, val in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        ret = tuple(_hashable(val) for val in obj)
+    elif isinstance(obj, (set, frozenset)):
+        ret = frozenset(_hashable(val) for val in obj)
+    elif isinstance(obj, np.ndarray):
+        ret = _hashable(obj.tolist())
+    else:
+        ret = obj
+    return ret
+
+
+def _memoize_frags(fxn):
+    """ memoize a fragmentation function by its arguments; a copy of the
+        fragments is returned so callers can modify them
+    """
+    @functools.wraps(fxn)
+    def _fxn(*args, **kwargs):
+        key = (fxn.__name__, _hashable(args), _hashable(kwargs))
+        if key not in _FRAG_CACHE:
+            _FRAG_CACHE[key] = fxn(*args, **kwargs)
+        return copy.deepcopy(_FRAG_CACHE[key])
+    return _fxn
+
+
+def _gra_inchi(gra):
+    """ InChI of a graph, computed once for each graph
+    """
+    key = _hashable(gra)
+    if key not in _INCHI_CACHE:
+        _INCHI_CACHE[key] = automol.graph.inchi(gra)
+    return _INCHI_CACHE[key]
+
+
+def _ich_graph(ich):
+    """ graph of an InChI, computed once for each InChI
+    """
+    if ich not in _GRAPH_CACHE:
+        _GRAPH_CACHE[ich] = automol.inchi.graph(ich)
+    return copy.deepcopy(_GRAPH_CACHE[ich])
 
 
 def calc_hform_0k(hzero_mol, hzero_basis, basis, coeff, ref_set):
@@ -25,13 +75,9 @@ def calc_hform_0k(hzero_mol, hzero_basis, basis, coeff, ref_set):
 
     dhzero = hzero_mol * EH2KCAL
     print('ABS of molecule in kcal: {:.5f}'.format(dhzero))
+    h_bases = get_ref_hs(basis, ref_set, 0)
     for i, spc in enumerate(basis):
-        ts = True
-        if isinstance(spc, str):
-            ts = False
-        h_basis = get_ref_h(spc, ref_set, 0, ts)
-        if h_basis is None:
-            h_basis = 0.0
+        h_basis = h_bases[i]
         dhzero += coeff[i] * h_basis * KJ2KCAL
         dhzero -= coeff[i] * hzero_basis[i] * EH2KCAL
         print('Contriubtion from:', spc)
@@ -44,33 +90,26 @@ def calc_hform_0k(hzero_mol, hzero_basis, basis, coeff, ref_set):
 def get_ref_h(species, ref, temp, ts=False):
     """ gets a reference value
     """
+    return get_ref_hs([species], ref, temp, ts_lst=[ts])[0]
+
+
+def get_ref_hs(species_lst, ref, temp, ts_lst=None):
+    """ gets the reference values for a list of species, where any species
+        that is not a string is taken to be a TS
+    """
+
+    if ts_lst is None:
+        ts_lst = [not isinstance(spc, str) for spc in species_lst]
+
+    # Look up all of the species in the indexed database at once
+    h_species = refdb.get_ref_hs(species_lst, ref, temp, ts_lst=ts_lst)
+    for species, ts_, h_spc in zip(species_lst, ts_lst, h_species):
+        assert not np.isnan(h_spc), (
+            'Could not find heat of formation for {} '.format(
+                refdb.species_key(species, ts=ts_))
+            )
 
-    # Set path and name to thermo database file
-    if ts:
-        thermodb_name = 'tsthermodb_{}K.csv'.format(str(int(temp)))
-    else:    
-        thermodb_name = 'thermodb_{}K.csv'.format(str(int(temp)))
-    thermodb_file = os.path.join(SRC_PATH, thermodb_name)
-    # Find the energy value for the given species and enery type
-    h_species = None
-    if ts:
-        rcts, prds = species
-        rct_str = '+'.join(rcts)
-        prd_str = '+'.join(prds)
-        species = '='.join([rct_str, prd_str])
-    with open(thermodb_file, 'r') as db_file:
-        reader = csv.DictReader(db_file)
-        for row in reader:
-            if row['inchi'] == species:
-                val = row[ref]
-                if val == '':
-                    val = None
-                h_species = float(val)
-    assert h_species is not None, (
-        'Could not find heat of formation for {} '.format(species)
-        )
-
-    return h_species
+    return h_species.tolist()
 
 
 def select_basis(atom_dct):
@@ -223,7 +262,7 @@ def stoich(ich):
     """
 
     stoich_dct = {'H': 0}
-    gra = automol.inchi.graph(ich)
+    gra = _ich_graph(ich)
     atms = automol.graph.atoms(gra)
     for atm in atms:
         stoich_dct['H'] += atms[atm][1]
@@ -253,6 +292,7 @@ def terminalmoity(adj_atms_i, adj_atms_j=[], adj_atms_k=[], endisterm=True):
          ret = 1     
      return ret
 
+@_memoize_frags
 def cbhzed(ich, bal=True):
     """
     Fragments molecule so that each heavy-atom is a seperate fragment
@@ -264,7 +304,7 @@ def cbhzed(ich, bal=True):
     """
 
     # Graphical info about molecule
-    gra = automol.inchi.graph(ich)
+    gra = _ich_graph(ich)
     rad_atms = list(automol.graph.sing_res_dom_radical_atom_keys(gra))
     atm_vals = automol.graph.atom_element_valences(gra)
     atms = automol.graph.atoms(gra)
@@ -280,7 +320,7 @@ def cbhzed(ich, bal=True):
             atm_vals[atm] -= 1
         atm_dic = {0: (atms[atm][0], int(atm_vals[atm]), None)}
         gra = (atm_dic, {})
-        frag = automol.graph.inchi(gra)
+        frag = _gra_inchi(gra)
         _add2dic(frags, frag, coeff)
     print('frags in cbhzed before bal test:', frags)
     if bal:
@@ -398,7 +438,7 @@ def split_beta_gras(gras):
     rct_gras = automol.graph.connected_components(rct_gra)
     for idx, rgra in enumerate(rct_gras):
         if rgra:
-           rct_ichs[idx] = automol.graph.inchi(rgra)
+           rct_ichs[idx] = _gra_inchi(rgra)
     rct_ichs = automol.inchi.sorted_(rct_ichs)
     atms, bnd_ords = gras
     for bnd_ord in bnd_ords:
@@ -424,7 +464,7 @@ def split_beta_gras(gras):
             atms, bnd_ords = prd_gra
     prd_gras = automol.graph.connected_components(prd_gra)
     for idx, pgra in enumerate(prd_gras):
-        prd_ichs[idx] = automol.graph.inchi(pgra)
+        prd_ichs[idx] = _gra_inchi(pgra)
     prd_ichs = automol.inchi.sorted_(prd_ichs)
     return (rct_ichs, prd_ichs)  
 
@@ -467,7 +507,7 @@ def split_radradabs_gras(gras):
             atms, bnd_ords = rct_gra
     rct_gras = automol.graph.connected_components(rct_gra)
     for rgra in rct_gras:
-        rct_ichs.append(automol.graph.inchi(rgra))
+        rct_ichs.append(_gra_inchi(rgra))
     if len(rct_ichs) > 1:            
         rct_ichs = automol.inchi.sorted_(rct_ichs)
     atms, bnd_ords = gras
@@ -505,7 +545,7 @@ def split_radradabs_gras(gras):
             atms, bnd_ords = prd_gra
     prd_gras = automol.graph.connected_components(prd_gra)
     for pgra in prd_gras:
-        prd_ichs.append(automol.graph.inchi(pgra))
+        prd_ichs.append(_gra_inchi(pgra))
     if len(prd_ichs) > 1:    
         prd_ichs = automol.inchi.sorted_(prd_ichs)
     return (rct_ichs, prd_ichs)   
@@ -542,7 +582,7 @@ def split_elim_gras(gras):
             atms, bnd_ords = rct_gra
     rct_gras = automol.graph.connected_components(rct_gra)
     for rgra in rct_gras:
-        rct_ichs.append(automol.graph.inchi(rgra))
+        rct_ichs.append(_gra_inchi(rgra))
     if len(rct_ichs) > 1:            
         rct_ichs = automol.inchi.sorted_(rct_ichs)
     atms, bnd_ords = gras
@@ -573,7 +613,7 @@ def split_elim_gras(gras):
             atms, bnd_ords = prd_gra
     prd_gras = automol.graph.connected_components(prd_gra)
     for pgra in prd_gras:
-        prd_ichs.append(automol.graph.inchi(pgra))
+        prd_ichs.append(_gra_inchi(pgra))
     if len(prd_ichs) > 1:    
         prd_ichs = automol.inchi.sorted_(prd_ichs)
     return (rct_ichs, prd_ichs)   
@@ -610,7 +650,7 @@ def split_gras(gras):
             atms, bnd_ords = rct_gra
     rct_gras = automol.graph.connected_components(rct_gra)
     for rgra in rct_gras:
-        rct_ichs.append(automol.graph.inchi(rgra))
+        rct_ichs.append(_gra_inchi(rgra))
     if len(rct_ichs) > 1:            
         rct_ichs = automol.inchi.sorted_(rct_ichs)
     atms, bnd_ords = gras
@@ -638,7 +678,7 @@ def split_gras(gras):
             atms, bnd_ords = rct_gra
     prd_gras = automol.graph.connected_components(prd_gra)
     for pgra in prd_gras:
-        prd_ichs.append(automol.graph.inchi(pgra))
+        prd_ichs.append(_gra_inchi(pgra))
     if len(prd_ichs) > 1:    
         prd_ichs = automol.inchi.sorted_(prd_ichs)
     return (rct_ichs, prd_ichs)   
@@ -1290,6 +1330,7 @@ def _simplify_gra_frags(frags):
     return new_frags
 
 
+@_memoize_frags
 def cbhone(ich, bal=True):
     """
     Fragments molecule in a way that conserves each heavy-atom/heavy-atom bond
@@ -1301,7 +1342,7 @@ def cbhone(ich, bal=True):
     """
 
     # Graphical info about molecule
-    gra = automol.inchi.graph(ich)
+    gra = _ich_graph(ich)
     atms = automol.graph.atoms(gra)
     bnd_ords = automol.graph.one_resonance_dominant_bond_orders(gra)
     rad_atms = list(automol.graph.sing_res_dom_radical_atom_keys(gra))
@@ -1327,7 +1368,7 @@ def cbhone(ich, bal=True):
                            1: (atms[adj][0], int(valj), None)}
                 bnd_dic = {frozenset({0, 1}): (1, None)}
                 gra = (atm_dic, bnd_dic)
-                frag = automol.graph.inchi(gra)
+                frag = _gra_inchi(gra)
                 _add2dic(frags, frag)
     frags = {k: v for k, v in frags.items() if v}
     if not frags:
@@ -1350,6 +1391,7 @@ def cbhone(ich, bal=True):
     return frags
 
 
+@_memoize_frags
 def cbhtwo(ich, bal=True):
     """
     Fragments molecule for each heavy-atom to stay bonded to its adjacent atoms
@@ -1361,7 +1403,7 @@ def cbhtwo(ich, bal=True):
     """
 
     # Graphical info about molecule
-    gra = automol.inchi.graph(ich)
+    gra = _ich_graph(ich)
     atms = automol.graph.atoms(gra)
     bnd_ords = automol.graph.one_resonance_dominant_bond_orders(gra)
     rad_atms = list(automol.graph.sing_res_dom_radical_atom_keys(gra))
@@ -1397,7 +1439,7 @@ def cbhtwo(ich, bal=True):
             atm_dic[j] = (atms[adj][0], int(valj), None)
             bnd_dic[frozenset({0, j})] = (1, None)
         gra = (atm_dic, bnd_dic)
-        frag = automol.graph.inchi(gra)
+        frag = _gra_inchi(gra)
         _add2dic(frags, frag, coeff)
 
     frags = {k: v for k, v in frags.items() if v}
@@ -1429,6 +1471,7 @@ def cbhtwo(ich, bal=True):
     return frags
 
 
+@_memoize_frags
 def cbhthree(ich, bal=True):
     ''' 
     Fragments molecule to retain each heavy-atom -- heavy-atom bond, and keep the bonds of each    atm1 b1 atm2 b2 atm3 b3 atm4 b4 atm5
@@ -1439,7 +1482,7 @@ def cbhthree(ich, bal=True):
     frags -- DIC dictionary with keys as STR inchi name for fragments and value as INT their coefficient
     '''
     #Graphical info about molecule
-    gra      = automol.inchi.graph(ich)
+    gra      = _ich_graph(ich)
     atms     = automol.graph.atoms(gra)
     bnd_ords = automol.graph.one_resonance_dominant_bond_orders(gra)
     rad_atms = list(automol.graph.sing_res_dom_radical_atom_keys(gra))
@@ -1473,7 +1516,7 @@ def cbhthree(ich, bal=True):
                     atm_dic[i*4+j+1] = (atms[adj][0], int(valj), None)
                     bnd_dic[frozenset({i,i*4+j+1})] =  (bnd_ord, None)
         gra     = (atm_dic, bnd_dic)
-        frag    = automol.graph.inchi(gra)
+        frag    = _gra_inchi(gra)
         _add2dic(frags, frag)
 
     if not frags:
@@ -1750,6 +1793,7 @@ def get_cbhone_ts(zma, rxnclass, frm_key, brk_key, geo=None, backup_zma=None, ba
 def get_basic_ts(zma, rxnclass, frm_key, brk_key, geo=None, backup_zma=None, backup_frm_key=None, backup_brk_key=None):
     return
 
+@_memoize_frags
 def get_cbh_ts(cbhlevel, zma, rxnclass, frm_key, brk_key, geo=None, backup_zma=None, backup_frm_key=None, backup_brk_key=None):
     """ get basis for CBH0 for a TS molecule
     """
@@ -1856,7 +1900,7 @@ def get_cbh_ts(cbhlevel, zma, rxnclass, frm_key, brk_key, geo=None, backup_zma=N
     clist = []
     for frag in frags:
         if 'exp_gra' in frags[frag]:
-            fraglist.append(automol.graph.inchi(frags[frag]['exp_gra']))
+            fraglist.append(_gra_inchi(frags[frag]['exp_gra']))
             clist.append(frags[frag]['coeff'])
         else:
             if 'beta' in rxnclass:
@@ -2040,10 +2084,10 @@ def _balance_frags_ts(gra, frags):
     water = automol.smiles.inchi('O')
     ammonm = automol.smiles.inchi('N')
     hydrgn = automol.smiles.inchi('[H][H]')
-    methane = automol.inchi.graph(methane)
-    water = automol.inchi.graph(water)
-    ammonm = automol.inchi.graph(ammonm)
-    hydrgn = automol.inchi.graph(hydrgn)
+    methane = _ich_graph(methane)
+    water = _ich_graph(water)
+    ammonm = _ich_graph(ammonm)
+    hydrgn = _ich_graph(hydrgn)
     idx_dct = []
     for spc in [methane, water, ammonm, hydrgn]:
         spc = automol.graph.explicit(spc)
@@ -0,0 +1,235 @@
+"""
+  Fit NASA-7 polynomials directly to MESSPF partition functions,
+  in place of running ThermP and PAC99
+
+  The heat capacity, enthalpy and entropy are computed from the log of the
+  partition function and its temperature derivatives, and the two ranges of
+  the NASA polynomial are fit to them together by linear least squares,
+  constrained so Cp, dCp/dT, H and S are continuous at the midpoint
+  temperature. Species sharing a temperature grid share the least-squares
+  matrix, so any number of them are fit with a single linear solve.
+"""
+
+import numpy
+from qcelemental import constants as qcc
+import automol.inchi
+
+
+# Conversion factors and constants
+KJ2KCAL = qcc.conversion_factor('kJ/mol', 'kcal/mol')
+RGAS = qcc.get('molar gas constant') * qcc.conversion_factor(
+    'J/mol', 'kcal/mol')
+# Boltzmann constant (erg/K) and standard pressure (dyn/cm^2, 1 atm),
+# to convert the translational part of the MESSPF partition functions,
+# given per cm^3, to the standard state
+KB_CGS = qcc.get('Boltzmann constant') * 1.0e7
+PREF_CGS = 1.01325e6
+
+# H(298) - H(0) of the elements in their reference states (kJ/mol per atom)
+ELEMENT_H298_H0 = {
+    'H': 8.468 / 2.0,
+    'C': 1.051,
+    'N': 8.670 / 2.0,
+    'O': 8.683 / 2.0,
+    'F': 8.825 / 2.0,
+    'S': 4.412,
+    'Cl': 9.181 / 2.0,
+    'He': 6.197,
+    'Ne': 6.197,
+    'Ar': 6.197
+}
+
+
+def build_polynomials(spc_names, spc_dct, pfs, tmid=1000.0):
+    """ fit the NASA polynomials of several species to their partition
+        functions and write them as CHEMKIN strings
+
+        :param spc_names: names of the species
+        :param spc_dct: species dct with the Hf(0 K), in kcal/mol, of each
+        :param pfs: (temps, logq, dq_dt, d2q_dt2) from mess.read_messpf
+        :rtype: list(tuple(str, float, float))
+        :returns: CHEMKIN string, Hf(0 K) and Hf(298 K) of each species
+    """
+
+    formula_dcts = [automol.inchi.formula(spc_dct[name]['inchi'])
+                    for name in spc_names]
+    hform0s = [spc_dct[name]['Hfs'][0] for name in spc_names]
+
+    # Fit the polynomials for each temperature grid at once
+    fits = [None for _ in spc_names]
+    grid_idxs = {}
+    for idx, pf_ in enumerate(pfs):
+        grid_idxs.setdefault(tuple(pf_[0]), []).append(idx)
+    for temps, idxs in grid_idxs.items():
+        temps = numpy.array(temps, dtype=float)
+        cps, hs, ss = [], [], []
+        for idx in idxs:
+            hshift = hform0s[idx] - element_enthalpy(formula_dcts[idx])
+            cp_r, h_rt, s_r = thermo_from_pf(*pfs[idx], hshift=hshift)
+            cps.append(cp_r)
+            hs.append(h_rt)
+            ss.append(s_r)
+        tlow, tmid_, thigh = fit_ranges(temps, tmid=tmid)
+        coeffs = fit_nasa7(temps, cps, hs, ss, tmid=tmid_)
+        for idx, coeff in zip(idxs, coeffs):
+            fits[idx] = (coeff, (tlow, tmid_, thigh))
+
+    # Write the CHEMKIN strings
+    ret = []
+    for name, formula_dct, hform0, (coeff, trange) in zip(
+            spc_names, formula_dcts, hform0s, fits):
+        hform298 = nasa7_enthalpy(coeff, trange[1], 298.15) * RGAS * 298.15
+        ret.append(
+            (nasa7_ckin_str(name, formula_dct, coeff, *trange),
+             hform0, hform298))
+
+    return ret
+
+
+def element_enthalpy(formula_dct):
+    """ sum of the H(298) - H(0) of the elements of a formula, kcal/mol
+    """
+    return sum(ELEMENT_H298_H0[atm] * cnt
+               for atm, cnt in formula_dct.items()) * KJ2KCAL
+
+
+def thermo_from_pf(temps, logq, dq_dt, d2q_dt2, hshift=0.0):
+    """ Cp/R, H/RT and S/R at each temperature from the log of the
+        partition function and its first and second derivatives in T;
+        hshift (kcal/mol) sets the zero of the enthalpy
+    """
+
+    temps = numpy.asarray(temps, dtype=float)
+    logq = numpy.asarray(logq, dtype=float)
+    dq_dt = numpy.asarray(dq_dt, dtype=float)
+    d2q_dt2 = numpy.asarray(d2q_dt2, dtype=float)
+
+    cp_r = 2.0 * temps * dq_dt + temps**2 * d2q_dt2 + 1.0
+    h_rt = temps * dq_dt + 1.0 + hshift / (RGAS * temps)
+    s_r = (logq + numpy.log(KB_CGS * temps / PREF_CGS) +
+           temps * dq_dt + 1.0)
+
+    return cp_r, h_rt, s_r
+
+
+def fit_ranges(temps, tmid=1000.0):
+    """ low, middle and high temperatures of the two fit ranges;
+        the middle is moved to the median temperature if it is not
+        inside the temperature grid
+    """
+    tlow, thigh = min(temps), max(temps)
+    if not tlow < tmid < thigh:
+        tmid = float(numpy.median(temps))
+
+    return tlow, tmid, thigh
+
+
+def fit_nasa7(temps, cps, hs, ss, tmid=1000.0):
+    """ fit the low and high temperature NASA-7 coefficients for a set of
+        species that share a temperature grid
+
+        :param temps: temperatures (K)
+        :param cps: Cp/R of each species at the temperatures
+        :param hs: H/RT of each species at the temperatures
+        :param ss: S/R of each species at the temperatures
+        :rtype: numpy.ndarray
+        :returns: coefficients, shape (nspc, 2, 7), low range first
+    """
+
+    temps = numpy.asarray(temps, dtype=float)
+    # Fit in the reduced temperature T/Tmid to keep the matrices well
+    # conditioned, then convert the coefficients back
+    taus = temps / tmid
+
+    # Build the least-squares matrix over both ranges (14 coefficients)
+    rows, yidxs = [], []
+    for rng, in_rng in enumerate((taus <= 1.0, taus >= 1.0)):
+        cols = slice(7*rng, 7*rng+7)
+        for blk, fxn in enumerate((_cp_row, _h_row, _s_row)):
+            for tidx in numpy.flatnonzero(in_rng):
+                row = numpy.zeros(14)
+                row[cols] = fxn(taus[tidx])
+                rows.append(row)
+                yidxs.append(blk*len(temps) + tidx)
+    amat = numpy.array(rows)
+
+    # Continuity of Cp, dCp/dT, H and S at the midpoint
+    cmat = numpy.zeros((4, 14))
+    for cidx, fxn in enumerate((_cp_row, _dcp_row, _h_row, _s_row)):
+        cmat[cidx, :7] = fxn(1.0)
+        cmat[cidx, 7:] = -fxn(1.0)
+
+    # Solve the constrained least squares for all species at once
+    yvals = numpy.concatenate(
+        (numpy.atleast_2d(cps), numpy.atleast_2d(hs), numpy.atleast_2d(ss)),
+        axis=1)[:, yidxs]
+    kkt = numpy.block([[2.0 * amat.T @ amat, cmat.T],
+                       [cmat, numpy.zeros((4, 4))]])
+    rhs = numpy.vstack((2.0 * amat.T @ yvals.T,
+                        numpy.zeros((4, len(yvals)))))
+    bcoeffs = numpy.linalg.solve(kkt, rhs)[:14].T.reshape(-1, 2, 7)
+
+    # Convert the reduced temperature coefficients
+    coeffs = bcoeffs.copy()
+    coeffs[:, :, :5] /= tmid ** numpy.arange(5)
+    coeffs[:, :, 5] *= tmid
+    coeffs[:, :, 6] -= bcoeffs[:, :, 0] * numpy.log(tmid)
+
+    return coeffs
+
+
+def nasa7_enthalpy(coeff, tmid, temp):
+    """ H/RT at a temperature from the NASA-7 coefficients
+    """
+    coef = coeff[0] if temp <= tmid else coeff[1]
+    return (coef[0] + coef[1]*temp/2.0 + coef[2]*temp**2/3.0 +
+            coef[3]*temp**3/4.0 + coef[4]*temp**4/5.0 + coef[5]/temp)
+
+
+def nasa7_ckin_str(spc_name, formula_dct, coeff, tlow, tmid, thigh):
+    """ CHEMKIN string for the NASA-7 polynomial of a species
+    """
+
+    elems = sorted(formula_dct.items())
+    if len(elems) > 5:
+        raise ValueError(
+            'CHEMKIN NASA entry supports at most five elements')
+    elem_str = ''.join('{:<2s}{:>3d}'.format(atm, cnt)
+                       for atm, cnt in elems[:4])
+    ext_str = ''.join('{:<2s}{:>3d}'.format(atm, cnt)
+                      for atm, cnt in elems[4:])
+
+    ckin_str = '{:<18s}{:6s}{:<20s}G{:10.3f}{:10.3f}{:8.2f}{:<6s}1\n'.format(
+        spc_name, '', elem_str, tlow, thigh, tmid, ext_str)
+    coefs = list(coeff[1]) + list(coeff[0])
+    for lidx, idx in enumerate(range(0, 14, 5)):
+        line = ''.join('{:15.8E}'.format(coef) for coef in coefs[idx:idx+5])
+        ckin_str += '{:<79s}{:d}\n'.format(line, lidx+2)
+
+    return ckin_str
+
+
+def _cp_row(tau):
+    """ coefficients of Cp/R at a reduced temperature
+    """
+    return numpy.array([1.0, tau, tau**2, tau**3, tau**4, 0.0, 0.0])
+
+
+def _dcp_row(tau):
+    """ coefficients of the derivative of Cp/R at a reduced temperature
+    """
+    return numpy.array([0.0, 1.0, 2.0*tau, 3.0*tau**2, 4.0*tau**3, 0.0, 0.0])
+
+
+def _h_row(tau):
+    """ coefficients of H/RT at a reduced temperature
+    """
+    return numpy.array([1.0, tau/2.0, tau**2/3.0, tau**3/4.0, tau**4/5.0,
+                        1.0/tau, 0.0])
+
+
+def _s_row(tau):
+    """ coefficients of S/R at a reduced temperature
+    """
+    return numpy.array([numpy.log(tau), tau, tau**2/2.0, tau**3/3.0,
+                        tau**4/4.0, 0.0, 1.0])
@@ -3,17 +3,97 @@
 """
 
 import os
+import sys
+import itertools
+import multiprocessing
 import automol
 import thermp_io
 import pac99_io
 from routines.pf import runner as pfrunner
+from routines.pf.thermo import nasafit
 from lib.amech_io import writer
 from lib import pathtools
+from lib.submission import cached_output
+from lib.submission import set_nprocs
+
+
+def build_polynomials(poly_args_lst, nprocs=1, fitter='pac99'):
+    """ Build the nasa polynomials for several species, concurrently in a
+        pool of processes for nprocs > 1, or all at once with the native
+        fitter; the polynomial strings are returned in the order of the args
+
+        :param poly_args_lst: (spc_name, spc_dct, temps, pf_path, nasa_path)
+            arguments of build_polynomial for each species; the nasa paths
+            must be distinct
+        :type poly_args_lst: list(tuple)
+        :param fitter: fit with ThermP and PAC99 ('pac99') or in process
+            ('native')
+        :type fitter: str
+    """
+
+    if fitter == 'native':
+        return _build_native_polynomials(poly_args_lst)
+
+    nasa_paths = [args[4] for args in poly_args_lst]
+    assert len(set(nasa_paths)) == len(nasa_paths), (
+        'NASA paths of the species are not distinct')
+
+    if nprocs is not None and nprocs > 1 and len(poly_args_lst) > 1:
+        print('\nGenerating NASA polynomials for {} species '
+              'with {} processes'.format(
+                  len(poly_args_lst), set_nprocs(nprocs)))
+        with multiprocessing.Pool(processes=set_nprocs(nprocs)) as pool:
+            ckin_strs = pool.starmap(_build_polynomial_proc, poly_args_lst)
+        if any(ckin_str is None for ckin_str in ckin_strs):
+            print('*ERROR: NASA polynomial generation failed')
+            sys.exit()
+    else:
+        ckin_strs = list(itertools.starmap(build_polynomial, poly_args_lst))
+
+    return ckin_strs
+
 
+def _build_native_polynomials(poly_args_lst):
+    """ Fit the nasa polynomials of all species to their MESSPF
+        partition functions in process
+    """
+
+    spc_names, spc_dct, pfs = [], {}, []
+    for spc_name, spc_dct_, _, pf_path, _ in poly_args_lst:
+        spc_names.append(spc_name)
+        spc_dct[spc_name] = spc_dct_[spc_name]
+        pfs.append(pfrunner.mess.read_messpf(pf_path))
+
+    print('\nFitting NASA polynomials for {} species in process'.format(
+        len(spc_names)))
+    ckin_strs = []
+    for ckin_poly_str, hform0, hform298 in nasafit.build_polynomials(
+            spc_names, spc_dct, pfs):
+        ckin_strs.append(
+            '\n' + writer.ckin.nasa_polynomial(hform0, hform298,
+                                               ckin_poly_str))
+        print('\nCHEMKIN Polynomial:')
+        print(ckin_strs[-1])
+
+    return ckin_strs
+
+
+def _build_polynomial_proc(spc_name, spc_dct, temps, pf_path, nasa_path):
+    """ Build a nasa polynomial in a pool worker, returning None
+        instead of exiting if the fit failed
+    """
+    try:
+        ckin_str = build_polynomial(
+            spc_name, spc_dct, temps, pf_path, nasa_path)
+    except SystemExit:
+        ckin_str = None
 
-def build_polynomial(spc_name, spc_dct, temps,
-                     pf_path, nasa_path, starting_path):
-    """ Build a nasa polynomial
+    return ckin_str
+
+
+def build_polynomial(spc_name, spc_dct, temps, pf_path, nasa_path):
+    """ Build a nasa polynomial, running ThermP and PAC99 in the NASA path
+        without changing the working directory of the process
     """
 
     print('Generating NASA polynomials at path: {}'.format(nasa_path))
@@ -24,40 +104,52 @@ def build_polynomial(spc_name, spc_dct, temps,
     formula_dct = automol.inchi.formula(spc_dct_i['inchi'])
     hform0 = spc_dct_i['Hfs'][0]
 
-    # Go to NASA path
-    if not os.path.exists(nasa_path):
-        os.makedirs(nasa_path)
-    pathtools.go_to(nasa_path)
-
-    # Write and run ThermP to get the Hf298K and coefficients
-    write_thermp_inp(formula, hform0, temps)
-    pfrunner.run_thermp(pf_path, nasa_path)
-    thermp_out_str = pathtools.read_file(nasa_path, 'thermp.out')
-    hform298 = thermp_io.reader.hf298k(thermp_out_str)
-
-    # Run PAC99 to get a NASA polynomial string in its format
-    pfrunner.run_pac(formula, nasa_path)
-    c97_file = pathtools.prepare_path(nasa_path, formula + '.c97')
-    with open(c97_file, 'r') as file_obj:
-        pac99_out_str = file_obj.read()
-    # pac99_out_str = pathtools.read_file(o97_file)
-    pac99_poly_str = pac99_io.reader.nasa_polynomial(pac99_out_str)
-
-    # Obtain CHEMKIN string using PAC99 polynomial
-    ckin_poly_str = pac99_io.pac2ckin_poly(
-        spc_name, formula_dct, pac99_poly_str)
-
-    # Write the full CHEMKIN strings
-    header_str = '\n'
-    nasa_str = writer.ckin.nasa_polynomial(hform0, hform298, ckin_poly_str)
-    full_ckin_str = header_str + nasa_str
+    def _run_thermp_pac99():
+        """ run ThermP and PAC99 in the NASA path and build the polynomial
+        """
+
+        # Set up the NASA path
+        if not os.path.exists(nasa_path):
+            os.makedirs(nasa_path)
+
+        # Write and run ThermP to get the Hf298K and coefficients
+        write_thermp_inp(formula, hform0, temps,
+                         thermp_file_name=os.path.join(
+                             nasa_path, 'thermp.dat'))
+        pfrunner.run_thermp(pf_path, nasa_path)
+        thermp_out_str = pathtools.read_file(nasa_path, 'thermp.out')
+        hform298 = thermp_io.reader.hf298k(thermp_out_str)
+
+        # Run PAC99 to get a NASA polynomial string in its format
+        pfrunner.run_pac(formula, nasa_path)
+        c97_file = pathtools.prepare_path(nasa_path, formula + '.c97')
+        with open(c97_file, 'r') as file_obj:
+            pac99_out_str = file_obj.read()
+        # pac99_out_str = pathtools.read_file(o97_file)
+        pac99_poly_str = pac99_io.reader.nasa_polynomial(pac99_out_str)
+
+        # Obtain CHEMKIN string using PAC99 polynomial
+        ckin_poly_str = pac99_io.pac2ckin_poly(
+            spc_name, formula_dct, pac99_poly_str)
+
+        # Write the full CHEMKIN strings
+        header_str = '\n'
+        nasa_str = writer.ckin.nasa_polynomial(
+            hform0, hform298, ckin_poly_str)
+
+        return header_str + nasa_str
+
+    # Run ThermP and PAC99, unless they were already run for the same input
+    inp_dct = {
+        'thermp.dat': _thermp_inp_str(formula, hform0, temps),
+        'pf.dat': pathtools.read_file(pf_path, 'pf.dat'),
+        'name': spc_name
+    }
+    full_ckin_str = cached_output('thermp_pac99', inp_dct, _run_thermp_pac99)
 
     print('\nCHEMKIN Polynomial:')
     print(full_ckin_str)
 
-    # Go back to starting path
-    pathtools.go_to(starting_path)
-
     return full_ckin_str
 
 
@@ -68,17 +160,25 @@ def write_thermp_inp(formula, hform0, temps,
     """
 
     # Write thermp input file
-    thermp_str = thermp_io.writer.input_file(
+    thermp_str = _thermp_inp_str(formula, hform0, temps,
+                                 enthalpyt=enthalpyt, breakt=breakt)
+
+    # Write the file
+    with open(thermp_file_name, 'w') as thermp_file:
+        thermp_file.write(thermp_str)
+
+
+def _thermp_inp_str(formula, hform0, temps,
+                    enthalpyt=0.0, breakt=1000.0):
+    """ build the thermp input string
+    """
+    return thermp_io.writer.input_file(
         ntemps=len(temps),
         formula=formula,
         delta_h=hform0,
         enthalpy_temp=enthalpyt,
         break_temp=breakt)
 
-    # Write the file
-    with open(thermp_file_name, 'w') as thermp_file:
-        thermp_file.write(thermp_str)
-
 
 def print_nasa_temps(temps):
     """ Print the polynomial fit temps
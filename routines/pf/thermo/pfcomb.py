@@ -0,0 +1,107 @@
+"""
+  Combine the partition functions of several models of a species,
+  e.g. 0.5*A*B/C, with NumPy arrays
+
+  A product or quotient of partition functions is a weighted sum of their
+  logs, so the log Q and its temperature derivatives of every species are
+  obtained from the stacked MESSPF results of all their models with a
+  single contraction against a matrix of weights (+1 for multiply, -1 for
+  divide); the coefficients only shift log Q. Models computed on other
+  temperature grids are first interpolated onto the grid of the first
+  model of the species.
+"""
+
+import sys
+import numpy
+
+
+def combine_pfs(pfs, coeffs, operators):
+    """ combine the partition functions of the models of one species
+
+        :param pfs: (temps, logq, dq_dt, d2q_dt2) for each model
+        :param coeffs: coefficient of each model
+        :param operators: 'multiply' or 'divide' between the models
+        :returns: (temps, logq, dq_dt, d2q_dt2) of the combination
+    """
+    return combine_all_pfs([pfs], [coeffs], [operators])[0]
+
+
+def combine_all_pfs(pfs_lst, coeffs_lst, operators_lst):
+    """ combine the partition functions of the models of many species,
+        evaluating all of the species on the same temperature grid at once
+
+        :param pfs_lst: partition functions of the models of each species
+        :param coeffs_lst: coefficients of the models of each species
+        :param operators_lst: operators between the models of each species
+        :returns: (temps, logq, dq_dt, d2q_dt2) for each species
+    """
+
+    # Group the species by the temperature grid of their first model
+    grp_dct = {}
+    for idx, pfs in enumerate(pfs_lst):
+        grp_dct.setdefault(tuple(pfs[0][0]), []).append(idx)
+
+    final_pfs = [None for _ in pfs_lst]
+    for temps, idxs in grp_dct.items():
+        temps = numpy.array(temps, dtype=float)
+
+        # Stack the log Q arrays of all models and set their weights
+        nmods = sum(len(pfs_lst[idx]) for idx in idxs)
+        arrs, shifts = [], []
+        wgts = numpy.zeros((len(idxs), nmods))
+        for sidx, idx in enumerate(idxs):
+            expnts, shift = pf_weights(coeffs_lst[idx], operators_lst[idx])
+            for pf_, expnt in zip(pfs_lst[idx], expnts):
+                wgts[sidx, len(arrs)] = expnt
+                arrs.append(pf_on_grid(pf_, temps))
+            shifts.append(shift)
+
+        # Contract the weights with all of the stacked arrays at once
+        comb = numpy.einsum('sm,mkt->skt', wgts, numpy.array(arrs))
+        comb[:, 0, :] += numpy.array(shifts)[:, None]
+
+        for idx, (logq, dq_dt, d2q_dt2) in zip(idxs, comb):
+            final_pfs[idx] = (
+                temps.tolist(), logq.tolist(), dq_dt.tolist(),
+                d2q_dt2.tolist())
+
+    return final_pfs
+
+
+def pf_weights(coeffs, operators):
+    """ exponents of the partition functions of each model and the shift
+        of log Q from the coefficients for a combination of models
+    """
+
+    expnts, shift = [1.0], numpy.log(coeffs[0])
+    for coeff, operator in zip(coeffs[1:], operators):
+        if coeff < 0:
+            coeff = abs(coeff)
+            if operator == 'multiply':
+                operator = 'divide'
+        if operator == 'multiply':
+            expnt = 1.0
+        elif operator == 'divide':
+            expnt = -1.0
+        else:
+            print('*ERROR: Only multiply and divide operators are supported',
+                  'to combine species models, not {}'.format(operator))
+            sys.exit()
+        expnts.append(expnt)
+        shift += expnt * numpy.log(coeff)
+
+    return expnts, shift
+
+
+def pf_on_grid(pf_, temps):
+    """ log Q and its derivatives of a partition function on a
+        temperature grid, interpolated if it was computed on another
+    """
+
+    pf_temps = numpy.asarray(pf_[0], dtype=float)
+    arr = numpy.array(pf_[1:], dtype=float)
+    if not numpy.array_equal(pf_temps, temps):
+        arr = numpy.array([numpy.interp(temps, pf_temps, vals)
+                           for vals in arr])
+
+    return arr
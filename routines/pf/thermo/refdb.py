@@ -0,0 +1,114 @@
+"""
+  Indexed store of the reference heats of formation in the thermo databases
+
+  Each thermodb_{T}K.csv (or tsthermodb_{T}K.csv) file is read once per
+  process into an index of the species (InChI or reaction string) and a
+  NumPy array of the values of each reference set, so that lookups, for a
+  single species or a whole basis at once, do not scan the file. The index
+  is also stored in the program-output cache, keyed by the contents of the
+  file, so later runs do not parse the CSV again.
+"""
+
+import os
+import csv
+import numpy
+from lib.submission import cached_output
+
+
+# Path  the database files (stored in the thermo src directory)
+SRC_PATH = os.path.dirname(os.path.realpath(__file__))
+
+# Databases read by this process, keyed by the file name
+_THERMODB = {}
+
+
+def thermodb_name(temp, ts=False):
+    """ name of the database file for a temperature
+    """
+    if ts:
+        name = 'tsthermodb_{}K.csv'.format(str(int(temp)))
+    else:
+        name = 'thermodb_{}K.csv'.format(str(int(temp)))
+    return name
+
+
+def species_key(species, ts=False):
+    """ key of a species or a reaction in the database
+    """
+    if ts:
+        rcts, prds = species
+        rct_str = '+'.join(rcts)
+        prd_str = '+'.join(prds)
+        species = '='.join([rct_str, prd_str])
+    return species
+
+
+def thermodb(temp, ts=False):
+    """ the index and reference value arrays of a database, read once
+    """
+
+    name = thermodb_name(temp, ts=ts)
+    if name not in _THERMODB:
+        thermodb_file = os.path.join(SRC_PATH, name)
+        with open(thermodb_file, 'r') as db_file:
+            db_str = db_file.read()
+        _THERMODB[name] = cached_output(
+            'thermodb', {name: db_str}, lambda: _build_index(db_str))
+
+    return _THERMODB[name]
+
+
+def get_ref_hs(species_lst, ref, temp, ts_lst=None):
+    """ reference values for a list of species, e.g. a whole basis,
+        with nan for species without a value
+
+        :param species_lst: InChIs, or reactant and product lists for TSs
+        :param ref: name of the reference set (column of the database)
+        :param temp: temperature of the database
+        :param ts_lst: if each species is a TS, default all False
+        :rtype: numpy.ndarray
+    """
+
+    if ts_lst is None:
+        ts_lst = [False for _ in species_lst]
+
+    vals = numpy.full(len(species_lst), numpy.nan)
+    for ts_ in (False, True):
+        idxs = [idx for idx, ts_i in enumerate(ts_lst) if ts_i == ts_]
+        if idxs:
+            keys, ref_dct = thermodb(temp, ts=ts_)
+            rows = [keys.get(species_key(species_lst[idx], ts=ts_), -1)
+                    for idx in idxs]
+            ref_vals = numpy.append(ref_dct[ref], numpy.nan)
+            vals[idxs] = ref_vals[rows]
+
+    return vals
+
+
+def _build_index(db_str):
+    """ index the rows of a database by species and store the values of
+        each reference set in an array; a species listed more than once
+        takes the values of its last row
+    """
+
+    reader = csv.DictReader(db_str.splitlines())
+    rows = list(reader)
+    keys = {row['inchi']: idx for idx, row in enumerate(rows)}
+    ref_dct = {}
+    for ref in reader.fieldnames:
+        if ref in ('formula', 'smiles', 'mult', 'inchi'):
+            continue
+        ref_dct[ref] = numpy.array(
+            [_to_float(row[ref]) for row in rows], dtype=float)
+
+    return keys, ref_dct
+
+
+def _to_float(val):
+    """ value of a database entry, nan if it is empty
+    """
+    try:
+        val = float(val)
+    except (TypeError, ValueError):
+        val = numpy.nan
+    return val
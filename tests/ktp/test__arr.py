@@ -0,0 +1,107 @@
+"""
+Tests fitting rate constants to single and double Arrhenius expressions
+"""
+
+import numpy
+from routines.pf.ktp.fit import _arr as arr
+
+
+RC = arr.RC
+TEMPS = numpy.arange(300.0, 2001.0, 100.0)
+
+
+def _arr_ks(params, temps):
+    """ rate constants of a single or double Arrhenius expression
+    """
+    temps = numpy.asarray(temps, dtype=float)
+    return sum(params[idx] * temps**params[idx+1] *
+               numpy.exp(-params[idx+2] / (RC * temps))
+               for idx in range(0, len(params), 3))
+
+
+def _ktp_dct(params_dct, temps_dct):
+    """ T, k arrays at each pressure
+    """
+    return {pressure: (temps_dct[pressure],
+                       _arr_ks(params, temps_dct[pressure]))
+            for pressure, params in params_dct.items()}
+
+
+def test__single_fit():
+    """ recovers A, n and Ea at pressures with different temperatures
+    """
+
+    params_dct = {
+        1.0: (2.5e-11, 1.5, 3.0),
+        10.0: (4.0e-14, 2.8, -1.2),
+        'high': (1.0e-10, 0.5, 12.0),
+        # Too few rate constants to fit n (three) or Ea (one)
+        100.0: (3.0e-12, 0.0, 5.0),
+        1000.0: (6.0e-12, 0.0, 0.0)
+    }
+    temps_dct = {
+        1.0: TEMPS, 10.0: TEMPS[:11], 'high': TEMPS[4:12],
+        100.0: TEMPS[:3], 1000.0: TEMPS[5:6]
+    }
+    ktp_dct = _ktp_dct(params_dct, temps_dct)
+
+    fit_params_dct, fit_temp_dct, fit_success, fit_err_dct = (
+        arr.batch_arr_fit(ktp_dct, fit_type='single', a_conv_factor=2.0))
+    assert fit_success
+    for pressure, params in params_dct.items():
+        ref = numpy.array(params) * (2.0, 1.0, 1.0)
+        assert numpy.allclose(fit_params_dct[pressure], ref,
+                              rtol=1.0e-6, atol=1.0e-8)
+        assert fit_temp_dct[pressure] == [min(temps_dct[pressure]),
+                                          max(temps_dct[pressure])]
+        assert max(fit_err_dct[pressure]) < 1.0e-6
+
+    # Only A is fit to a single rate constant with a T dependence
+    ktp_dct = {1.0: (TEMPS[:1], _arr_ks((1.0e-12, 1.0, 4.0), TEMPS[:1]))}
+    fit_params_dct, _, _, fit_err_dct = arr.batch_arr_fit(ktp_dct)
+    assert numpy.allclose(fit_params_dct[1.0][1:], (0.0, 0.0))
+    assert numpy.isclose(fit_params_dct[1.0][0], ktp_dct[1.0][1][0])
+    assert max(fit_err_dct[1.0]) < 1.0e-6
+
+
+def test__double_fit():
+    """ recovers the parameters of both terms from guesses near them,
+        including a negative A
+    """
+
+    params_dct = {
+        1.0: (1.0e-12, 0.5, 1.0, 3.0e-9, -0.8, 8.0),
+        10.0: (5.0e-11, 0.0, 2.0, -1.0e-11, 0.0, 6.0),
+    }
+    temps_dct = {1.0: TEMPS, 10.0: TEMPS[2:15]}
+    ktp_dct = _ktp_dct(params_dct, temps_dct)
+    guess_dct = {
+        pressure: tuple(val * 1.1 for val in params)
+        for pressure, params in params_dct.items()}
+
+    fit_params_dct, _, fit_success, fit_err_dct = arr.batch_arr_fit(
+        ktp_dct, fit_type='double', inp_param_dct=guess_dct)
+    assert fit_success
+    for pressure, params in params_dct.items():
+        assert numpy.allclose(fit_params_dct[pressure], params,
+                              rtol=1.0e-4, atol=1.0e-6)
+        assert max(fit_err_dct[pressure]) < 1.0e-4
+
+
+def test__double_fit_negative_guess():
+    """ skips the double fit when the guess gives negative rate constants
+    """
+
+    ktp_dct = _ktp_dct({1.0: (2.5e-11, 1.5, 3.0)}, {1.0: TEMPS})
+    guess_dct = {1.0: (-1.0e-11, 1.5, 3.0, -1.0e-11, 1.5, 3.0)}
+
+    fit_params_dct, _, fit_success, _ = arr.batch_arr_fit(
+        ktp_dct, fit_type='double', inp_param_dct=guess_dct)
+    assert not fit_success
+    assert fit_params_dct[1.0] == []
+
+
+if __name__ == '__main__':
+    test__single_fit()
+    test__double_fit()
+    test__double_fit_negative_guess()
@@ -0,0 +1,49 @@
+"""
+Tests reading the rate constants of all channels from the MESS output
+"""
+
+import os
+import numpy
+import mess_io
+from routines.pf.ktp.fit import _fit as fit
+
+
+# Path to the MESS rate output
+DATA_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+with open(os.path.join(DATA_PATH, 'rate.out'), 'r') as RATE_FILE:
+    RATE_OUT_STR = RATE_FILE.read()
+
+
+def test__read_rate_table():
+    """ matches the rate constants read for each channel by mess_io
+    """
+
+    rate_tab = fit.read_rate_table(DATA_PATH)
+    assert set(rate_tab['chn_idxs']) == {
+        ('W1', 'W1'), ('W1', 'P1'), ('P1', 'W1'), ('P1', 'P1')}
+    assert rate_tab['ks'].shape == (4, len(rate_tab['pressures']), 3)
+
+    for (rct, prd), chn_idx in rate_tab['chn_idxs'].items():
+        for pidx, pressure in enumerate(rate_tab['pressures']):
+            if pressure == 'high':
+                ref_ks = mess_io.reader.highp_ks(RATE_OUT_STR, rct, prd)
+            else:
+                ref_ks = mess_io.reader.pdep_ks(
+                    RATE_OUT_STR, rct, prd, pressure)
+            ref_ks = [fit._to_float(kval) for kval in ref_ks]
+            assert numpy.allclose(
+                rate_tab['ks'][chn_idx, pidx], ref_ks, equal_nan=True)
+
+    # Undefined (***) and high-pressure rate constants
+    chn_idx = rate_tab['chn_idxs'][('W1', 'P1')]
+    pidx = fit._close_idx(1.0, rate_tab['pressures'])
+    assert numpy.allclose(rate_tab['ks'][chn_idx, pidx],
+                          [1.21e-05, 0.00795, numpy.nan], equal_nan=True)
+    pidx = rate_tab['pressures'].index('high')
+    assert numpy.allclose(rate_tab['ks'][chn_idx, pidx],
+                          [1.22e-05, 0.0109, 0.523])
+    assert numpy.isnan(rate_tab['ks'][rate_tab['chn_idxs'][('W1', 'W1')]]).all()
+
+
+if __name__ == '__main__':
+    test__read_rate_table()
@@ -0,0 +1,126 @@
+"""
+Tests searching the scan grids for the maxima of reaction paths
+"""
+
+import numpy
+from lib.reaction import grid as rxngrid
+
+
+# Energies (hartree) along a 1D grid with a single maximum at index 9
+NPOINTS = 14
+ENES = [-0.01 * (idx - 9.3)**2 for idx in range(NPOINTS)]
+
+
+def _adaptive_search(enes, failed_idxs=()):
+    """ evaluate the coarse grid and refine it until the maximum is found
+    """
+    npoints = len(enes)
+    done = {}
+    idxs = rxngrid.coarse_grid_idxs(npoints)
+    while idxs:
+        for idx in idxs:
+            done[idx] = None if idx in failed_idxs else enes[idx]
+        idxs = rxngrid.refine_grid_idxs(done, npoints, ethresh=0.1)
+
+    max_idx = max((idx for idx, ene in done.items() if ene is not None),
+                  key=lambda idx: done[idx])
+
+    return max_idx, done
+
+
+def test__coarse_grid_idxs():
+    """ picks a coarse subset of the grid including both ends
+    """
+
+    assert rxngrid.coarse_grid_idxs(14) == (0, 4, 8, 12, 13)
+    assert rxngrid.coarse_grid_idxs(10, nstride=5) == (0, 5, 9)
+    assert rxngrid.coarse_grid_idxs(9, nstride=4) == (0, 4, 8)
+    assert rxngrid.coarse_grid_idxs(1) == (0,)
+    assert rxngrid.coarse_grid_idxs(0) == ()
+
+
+def test__refine_grid_idxs():
+    """ narrows the bracket around the maximum of the evaluated points
+    """
+
+    # The unresolved sides of the bracket are split at their middles
+    enes = {idx: ENES[idx] for idx in (0, 4, 8, 12, 13)}
+    assert rxngrid.refine_grid_idxs(enes, NPOINTS) == (6, 10)
+
+    # Nothing left once the neighbors are within the threshold
+    enes = {idx: ENES[idx] for idx in (7, 8, 9, 10, 11)}
+    assert rxngrid.refine_grid_idxs(enes, NPOINTS) == ()
+    enes = {8: -0.0001, 9: 0.0, 10: -0.0001}
+    assert rxngrid.refine_grid_idxs(enes, NPOINTS, ethresh=0.1) == ()
+    assert rxngrid.refine_grid_idxs(enes, NPOINTS, ethresh=0.01) == ()
+
+    # A failed end point still brackets a maximum at the last point
+    enes = {0: -1.0, 6: -0.5, 13: None}
+    assert rxngrid.refine_grid_idxs(enes, NPOINTS) == (3, 9)
+    assert rxngrid.refine_grid_idxs({}, NPOINTS) == ()
+
+
+def test__adaptive_search():
+    """ finds the maximum of the full grid with fewer points
+    """
+
+    max_idx, done = _adaptive_search(ENES)
+    assert max_idx == int(numpy.argmax(ENES))
+    assert len(done) < NPOINTS
+
+    # Points that fail are skipped and not tried again
+    enes = [-0.01 * (idx - 3)**2 for idx in range(NPOINTS)]
+    max_idx, done = _adaptive_search(enes, failed_idxs=(4,))
+    assert max_idx == 3
+    assert done[4] is None
+
+
+def test__minimax_2d():
+    """ finds the minimax path and saddle point candidates of a surface
+    """
+
+    # Forming coordinate along the rows, breaking along the columns;
+    # the last column has no energies
+    enes = numpy.ma.masked_invalid([
+        [1.0, 2.0, 3.0, 1.0, numpy.nan],
+        [4.0, 1.0, 5.0, 2.0, numpy.nan],
+        [2.0, 3.0, 1.0, numpy.nan, numpy.nan]])
+    path, sadpt_idxs, surf = rxngrid.minimax_2d(enes)
+    assert path == ((1, 0), (2, 1), (1, 2), (1, 3))
+    assert sadpt_idxs == ((1, 3), (2, 1))
+    assert surf is enes
+
+    # Smoothing keeps the masked points masked
+    _, _, surf = rxngrid.minimax_2d(enes, smooth=True)
+    assert numpy.array_equal(numpy.ma.getmaskarray(surf),
+                             numpy.ma.getmaskarray(enes))
+    assert numpy.isclose(surf[0, 0], (1.0 + 2.0 + 4.0) / 3.0)
+
+
+def test__extrema_triplets():
+    """ connects each local maximum to the minima on either side
+    """
+
+    assert rxngrid._extrema_triplets((2, 6), (4,), 9) == (
+        (0, 2, 4), (4, 6, 9))
+    assert rxngrid._extrema_triplets((3,), (7, 1), 9) == ((1, 3, 7),)
+    assert rxngrid._extrema_triplets((), (3,), 9) == ()
+
+
+def test__potential_sadpt():
+    """ finds the saddle point candidates on a partly failed 1D scan
+    """
+
+    enes = numpy.ma.masked_invalid([0.0, 1.0, numpy.nan, 0.2, 3.0, 0.0])
+    sadpt_idxs, sadpt_enes = rxngrid._potential_sadpt(enes, ethresh=0.3)
+    assert sadpt_idxs == ((0, 1, 3), (3, 4, 5))
+    assert sadpt_enes == (1.0, 3.0)
+
+
+if __name__ == '__main__':
+    test__coarse_grid_idxs()
+    test__refine_grid_idxs()
+    test__adaptive_search()
+    test__minimax_2d()
+    test__extrema_triplets()
+    test__potential_sadpt()
@@ -0,0 +1,105 @@
+"""
+Tests fitting NASA-7 polynomials to thermochemical data
+"""
+
+import numpy
+import pytest
+from routines.pf.thermo import nasafit
+
+
+# Temperature grid and midpoint of the two ranges
+TEMPS = numpy.arange(200.0, 3001.0, 100.0)
+TMID = 1000.0
+
+# Low range coefficients of a NASA-7 polynomial (CH4, GRI-Mech 3.0)
+LOW_COEFF = numpy.array([
+    5.14987613E+00, -1.36709788E-02, 4.91800599E-05, -4.84743026E-08,
+    1.66693956E-11, -1.02466476E+04, -4.64130376E+00])
+# High range which differs by c*(T - Tmid)^2 in Cp/R, with the a5 and a6
+# terms shifted so that Cp, dCp/dT, H and S are continuous at Tmid
+CQUAD = 1.0e-7
+HIGH_COEFF = LOW_COEFF + numpy.array([
+    CQUAD * TMID**2, -2.0 * CQUAD * TMID, CQUAD, 0.0, 0.0,
+    -CQUAD * TMID**3 / 3.0,
+    CQUAD * TMID**2 * (1.5 - numpy.log(TMID))])
+COEFF = numpy.array([LOW_COEFF, HIGH_COEFF])
+
+
+def _thermo(coeff, temps):
+    """ Cp/R, H/RT and S/R of NASA-7 coefficients at the temperatures
+    """
+    cps, hs, ss = [], [], []
+    for temp in temps:
+        coef = coeff[0] if temp <= TMID else coeff[1]
+        cps.append(sum(coef[i] * temp**i for i in range(5)))
+        hs.append(nasafit.nasa7_enthalpy(coeff, TMID, temp))
+        ss.append(coef[0] * numpy.log(temp) +
+                  sum(coef[i] * temp**i / i for i in range(1, 5)) + coef[6])
+
+    return numpy.array(cps), numpy.array(hs), numpy.array(ss)
+
+
+def test__fit_nasa7():
+    """ recovers the coefficients from their Cp, H and S
+    """
+
+    cps, hs, ss = _thermo(COEFF, TEMPS)
+    coeffs = nasafit.fit_nasa7(TEMPS, [cps], [hs], [ss], tmid=TMID)
+    assert coeffs.shape == (1, 2, 7)
+    assert numpy.allclose(coeffs[0], COEFF, rtol=1.0e-6, atol=1.0e-12)
+
+    # Several species are fit at once, in order
+    coeffs = nasafit.fit_nasa7(
+        TEMPS, [cps, 2.0*cps], [hs, 2.0*hs], [ss, 2.0*ss], tmid=TMID)
+    assert numpy.allclose(coeffs[1], 2.0*COEFF, rtol=1.0e-6, atol=1.0e-12)
+
+
+def test__fit_nasa7_continuity():
+    """ fits noisy data with Cp, H and S continuous at the midpoint
+    """
+
+    cps, hs, ss = _thermo(COEFF, TEMPS)
+    rand = numpy.random.RandomState(0)
+    cps += rand.normal(scale=1.0e-2, size=len(TEMPS))
+    hs += rand.normal(scale=1.0e-2, size=len(TEMPS))
+    ss += rand.normal(scale=1.0e-2, size=len(TEMPS))
+    coeff = nasafit.fit_nasa7(TEMPS, [cps], [hs], [ss], tmid=TMID)[0]
+
+    low = _thermo(coeff[:1], [TMID])
+    high = _thermo(coeff[1:], [TMID])
+    assert numpy.allclose(low, high)
+
+
+def test__nasa7_ckin_str():
+    """ writes the CHEMKIN entry in fixed 80 column records
+    """
+
+    ckin_str = nasafit.nasa7_ckin_str(
+        'CH4', {'C': 1, 'H': 4}, COEFF, 200.0, TMID, 3000.0)
+    lines = ckin_str.splitlines()
+    assert len(lines) == 4
+    assert all(len(line) == 80 for line in lines)
+    assert [line[79] for line in lines] == ['1', '2', '3', '4']
+    assert lines[0][:18].strip() == 'CH4'
+    assert lines[0][24:44] == 'C   1H   4'.ljust(20)
+    assert lines[0][44] == 'G'
+    assert float(lines[0][45:55]) == 200.0
+    assert float(lines[0][55:65]) == 3000.0
+    assert float(lines[0][65:73]) == TMID
+
+    # Coefficients in 15 column fields, high range first
+    fields = [line[idx:idx+15] for line in lines[1:]
+              for idx in range(0, 75, 15)]
+    coefs = [float(field) for field in fields if field.strip()]
+    assert numpy.allclose(coefs, list(COEFF[1]) + list(COEFF[0]))
+
+    with pytest.raises(ValueError):
+        nasafit.nasa7_ckin_str(
+            'X', {'C': 1, 'H': 1, 'N': 1, 'O': 1, 'S': 1, 'Cl': 1},
+            COEFF, 200.0, TMID, 3000.0)
+
+
+if __name__ == '__main__':
+    test__fit_nasa7()
+    test__fit_nasa7_continuity()
+    test__nasa7_ckin_str()
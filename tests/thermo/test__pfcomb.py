@@ -0,0 +1,64 @@
+"""
+Tests combining the partition functions of several species models
+"""
+
+import numpy
+from routines.pf.thermo import pfcomb
+
+
+# Partition functions (temps, logq, dq_dt, d2q_dt2) of three models
+TEMPS = [300.0, 400.0, 500.0]
+PF_A = (TEMPS, [1.0, 2.0, 3.0], [0.1, 0.2, 0.3], [0.01, 0.02, 0.03])
+PF_B = (TEMPS, [4.0, 5.0, 6.0], [0.4, 0.5, 0.6], [0.04, 0.05, 0.06])
+PF_C = (TEMPS, [0.5, 1.0, 1.5], [0.05, 0.1, 0.15], [0.005, 0.01, 0.015])
+# The third model on a coarser grid, interpolated onto the first
+PF_C_COARSE = ([300.0, 500.0], [0.5, 1.5], [0.05, 0.15], [0.005, 0.015])
+PF_D = ([200.0, 300.0], [7.0, 8.0], [0.7, 0.8], [0.07, 0.08])
+
+
+def test__combine_all_pfs():
+    """ combines 0.5*A*B/C and other species on their own grids at once
+    """
+
+    pfs = pfcomb.combine_all_pfs(
+        [[PF_A, PF_B, PF_C], [PF_A, PF_B, PF_C_COARSE], [PF_D]],
+        [[0.5, 1.0, 1.0], [0.5, 1.0, 1.0], [2.0]],
+        [['multiply', 'divide'], ['multiply', 'divide'], []])
+    assert len(pfs) == 3
+
+    # Logs of the products and quotients of the partition functions
+    ref = numpy.array(PF_A[1:]) + numpy.array(PF_B[1:]) - numpy.array(
+        PF_C[1:])
+    ref[0] += numpy.log(0.5)
+    for temps, logq, dq_dt, d2q_dt2 in pfs[:2]:
+        assert temps == TEMPS
+        assert numpy.allclose([logq, dq_dt, d2q_dt2], ref)
+
+    temps, logq, dq_dt, d2q_dt2 = pfs[2]
+    assert temps == PF_D[0]
+    assert numpy.allclose(logq, numpy.array(PF_D[1]) + numpy.log(2.0))
+    assert numpy.allclose([dq_dt, d2q_dt2], PF_D[2:])
+
+    # A single species gives the same as the batched combination
+    assert pfcomb.combine_pfs(
+        [PF_A, PF_B, PF_C], [0.5, 1.0, 1.0],
+        ['multiply', 'divide']) == pfs[0]
+
+
+def test__pf_weights():
+    """ sets the exponents and log shift of a combination
+    """
+
+    expnts, shift = pfcomb.pf_weights([0.5, 2.0, 4.0], ['multiply', 'divide'])
+    assert expnts == [1.0, 1.0, -1.0]
+    assert numpy.isclose(shift, numpy.log(0.5 * 2.0 / 4.0))
+
+    # A negative coefficient on a multiplied model divides by it
+    expnts, shift = pfcomb.pf_weights([1.0, -2.0], ['multiply'])
+    assert expnts == [1.0, -1.0]
+    assert numpy.isclose(shift, -numpy.log(2.0))
+
+
+if __name__ == '__main__':
+    test__combine_all_pfs()
+    test__pf_weights()
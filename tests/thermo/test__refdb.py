@@ -0,0 +1,69 @@
+"""
+Tests looking up reference heats of formation in the indexed databases
+"""
+
+import numpy
+from routines.pf.thermo import refdb
+
+
+# Small databases of species and of TSs
+DB_STR = """formula,smiles,mult,inchi,ATcT,ANL0
+H2,[H][H],1,InChI=1S/H2/h1H,0.0,0.1
+CH4,C,1,InChI=1S/CH4/h1H4,-15.9,
+CH3,[CH3],2,InChI=1S/CH3/h1H3,35.9,36.0
+CH3,[CH3],2,InChI=1S/CH3/h1H3,35.8,36.1
+"""
+TSDB_STR = """formula,smiles,mult,inchi,ATcT,ANL0
+H2+CH3=H+CH4,,2,InChI=1S/H2/h1H+InChI=1S/CH3/h1H3=InChI=1S/H+InChI=1S/CH4/h1H4,,10.5
+"""
+TEMP = 1.0
+
+H2 = 'InChI=1S/H2/h1H'
+CH4 = 'InChI=1S/CH4/h1H4'
+CH3 = 'InChI=1S/CH3/h1H3'
+TS = (['InChI=1S/H2/h1H', 'InChI=1S/CH3/h1H3'],
+      ['InChI=1S/H', 'InChI=1S/CH4/h1H4'])
+
+
+def _set_dbs(monkeypatch):
+    """ put the small databases in the place of the files
+    """
+    monkeypatch.setitem(
+        refdb._THERMODB, refdb.thermodb_name(TEMP),
+        refdb._build_index(DB_STR))
+    monkeypatch.setitem(
+        refdb._THERMODB, refdb.thermodb_name(TEMP, ts=True),
+        refdb._build_index(TSDB_STR))
+
+
+def test__get_ref_hs(monkeypatch):
+    """ looks up several species and TSs at once
+    """
+
+    _set_dbs(monkeypatch)
+
+    vals = refdb.get_ref_hs([CH4, H2, CH3], 'ATcT', TEMP)
+    assert numpy.allclose(vals, [-15.9, 0.0, 35.8])
+
+    # Empty entries and missing species are nan
+    vals = refdb.get_ref_hs([CH4, 'InChI=1S/He', H2], 'ANL0', TEMP)
+    assert numpy.isnan(vals[0]) and numpy.isnan(vals[1])
+    assert vals[2] == 0.1
+
+    # Species and TSs looked up together keep their order
+    vals = refdb.get_ref_hs(
+        [H2, TS, CH3], 'ANL0', TEMP, ts_lst=[False, True, False])
+    assert numpy.allclose(vals, [0.1, 10.5, 36.1])
+
+
+def test__get_ref_hs_file():
+    """ looks up a species in a database file
+    """
+
+    vals = refdb.get_ref_hs(
+        [TS], 'ANL0', 0, ts_lst=[True])
+    assert numpy.isclose(vals[0], 206.6765246)
+
+
+if __name__ == '__main__':
+    test__get_ref_hs_file()